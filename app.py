@@ -7,13 +7,14 @@ import cv2
 import numpy as np
 from ultralytics import YOLO
 from common import CV2ImageLuminanceSource
+from common import IntegerLumaExtractor
 from common import HybridBinarizer
 from qrcode import BinaryBitmap
 from qrcode import QRCodeReader, BitMatrix
 import random
 from typing import List
 import math
-from pyzbar.pyzbar import decode
+from exceptions import NotFoundException, FormatException, ChecksumException
 
 # Hàm load model YOLO với caching
 @st.cache_resource
@@ -157,35 +158,29 @@ def handle_img(img_crop, solution_type):
 
 def handle_img_solution_1(img_crop):
     result = {}
-    source = CV2ImageLuminanceSource(img_crop)
+    # Ảnh tải lên được đọc bằng PIL nên các vùng cắt có thứ tự kênh RGB
+    source = CV2ImageLuminanceSource(img_crop, extractor=IntegerLumaExtractor("RGB"))
     binarizer:HybridBinarizer = HybridBinarizer(source)
     bitmap = BinaryBitmap(binarizer)
-    binary_img = bitmap.get_black_matrix().bitmatrix_to_image()
-    binary_img = binary_img * 255
+    binary_img = bitmap.get_black_matrix().to_uint8_image()
     result["binary_image"] = binary_img 
     reader = QRCodeReader()
-    res = reader.decode(bitmap)
+    res = reader.detect(bitmap)
     if res is not None and res.get_bits() is not None:
-        img_result = res.bits.bitmatrix_to_image()
-        high_res_img = cv2.resize(img_result, None, fx=100, fy=100, interpolation=cv2.INTER_AREA)
-        high_res_img = high_res_img * 255
-        result["qr_code"] = high_res_img
-        decoded_objects = decode(high_res_img)
-
-        for obj in decoded_objects:
-            result["data"] = obj.data.decode("utf-8")
+        result["qr_code"] = scale_qr_grid(res.get_bits())
+        decode_qr_grid(reader, res, result)
     return result
 
 def handle_img_solution_2(img):
     result = {}
     from common import CV2ImageLuminanceSource
-    source = CV2ImageLuminanceSource(img)
+    source = CV2ImageLuminanceSource(img, extractor=IntegerLumaExtractor("RGB"))
     from common import HybridBinarizer
     binarizer = HybridBinarizer(source)
     from qrcode import BinaryBitmap
     bitmap = BinaryBitmap(binarizer)
-    binary_img = bitmap.get_black_matrix().bitmatrix_to_image()
-    result["binary_image"] = binary_img * 255
+    binary_img = bitmap.get_black_matrix().to_uint8_image()
+    result["binary_image"] = binary_img
 
     filtered_moments, filtered_centroids, bounding_box = connect_component(binary_img)
     moments_list, centroids_list, bounding_box_list = sort_connected_component(filtered_moments, filtered_centroids, bounding_box)
@@ -219,16 +214,22 @@ def handle_img_solution_2(img):
         res = reader.decode2(bitmap ,finder_pattern_info)
         if res is not None:
             if res.get_bits() is not None:
-                img_result = res.get_bits().bitmatrix_to_image()
-                high_res_img = cv2.resize(img_result, None, fx=100, fy=100, interpolation=cv2.INTER_AREA)
-                high_res_img = high_res_img * 255
-                result["qr_code"] = high_res_img
-                decoded_objects = decode(high_res_img)
-
-                for obj in decoded_objects:
-                    result["data"] = obj.data.decode("utf-8")
+                result["qr_code"] = scale_qr_grid(res.get_bits())
+                decode_qr_grid(reader, res, result)
     return result
 
+def scale_qr_grid(bits, module_pixels=10):
+    # Chỉ phóng to để hiển thị: mỗi module thành một ô module_pixels x module_pixels, không nội suy
+    img_result = bits.to_uint8_image()
+    return cv2.resize(img_result, None, fx=module_pixels, fy=module_pixels, interpolation=cv2.INTER_NEAREST)
+
+def decode_qr_grid(reader, detector_result, result):
+    # Giải mã trực tiếp lưới module đã lấy mẫu, không cần giải mã lại ảnh đã phóng to
+    try:
+        result["data"] = reader.decode_detector_result(detector_result).get_text()
+    except (NotFoundException, FormatException, ChecksumException):
+        pass
+
 
 def scale_image(image):
     width = image.shape[1]  
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
 import numpy as np
 from .LuminanceSource import LuminanceSource
-from qrcode import BitMatrix, BitArray
+from qrcode.BitMatrix import BitMatrix
+from qrcode.BitArray import BitArray
 
 class Binarizer(ABC):
     """ 
@@ -1,110 +1,46 @@
 import numpy as np
-import cv2
 from scipy.ndimage import rotate
-import math
-from .LuminanceSource import LuminanceSource
+from .NdarrayLuminanceSource import NdarrayLuminanceSource
+from .LuminanceExtractor import LuminanceExtractor, IntegerLumaExtractor
 
-class CV2ImageLuminanceSource(LuminanceSource):
+class CV2ImageLuminanceSource(NdarrayLuminanceSource):
     """
-    Lớp BufferedImageLuminanceSource này triển khai một nguồn ánh sáng cho hình ảnh dạng grayscale (mức xám),
-    sử dụng thư viện PIL để xử lý hình ảnh.
+    Nguồn độ chói cho ảnh OpenCV (mảng NumPy): ảnh màu được chuyển thành độ chói một lần qua một chiến lược
+    LuminanceExtractor, sau đó mọi thao tác get_row / get_matrix / crop / xoay 90 độ là view của mặt phẳng đó
+    (xem NdarrayLuminanceSource).
     """
 
-    MINUS_45_IN_RADIANS = -0.7853981633974483  # Math.toRadians(-45.0)
+    # scipy.ndimage.rotate nhận góc theo độ (ZXing dùng Math.toRadians(-45.0) cho AffineTransform)
+    MINUS_45_IN_DEGREES = -45.0
 
-    def __init__(self, image, left=0, top=0, width=None, height=None):
+    def __init__(self, image, left=0, top=0, width=None, height=None, extractor: LuminanceExtractor = None, out=None):
         """
         Khởi tạo lớp với hình ảnh đầu vào.
         
-        Nếu hình ảnh không phải là hình ảnh grayscale, nó sẽ được chuyển đổi thành grayscale.
-        Nếu có tọa độ crop (cắt hình), hình ảnh sẽ được cắt theo các tham số tương ứng.
+        Nếu có tọa độ crop (cắt hình), chỉ vùng cắt được chuyển thành độ chói.
         
-        :param image: Hình ảnh đầu vào (PIL Image object).
+        :param image: Hình ảnh đầu vào (numpy array), 2D (xám) hoặc 3D (màu).
         :param left: Tọa độ trái của vùng cần cắt.
         :param top: Tọa độ trên của vùng cần cắt.
         :param width: Chiều rộng của vùng cần cắt.
         :param height: Chiều cao của vùng cần cắt.
+        :param extractor: Chiến lược tạo độ chói, mặc định IntegerLumaExtractor (BGR, giống cv2.COLOR_BGR2GRAY).
+        :param out: Bộ đệm uint8 dùng lại giữa các khung hình (tùy chọn), xem LuminanceExtractor.extract.
         """
-        self.left = left
-        self.top = top
-        
-        # Giả sử image là một numpy array
-        if len(image.shape) == 3:  # Nếu hình ảnh có 3 kênh màu (RGB)
-            self.image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        else:
-            self._image = image  # Hình ảnh đã là grayscale
-                
-        # Nếu có thông số crop, cắt hình ảnh theo yêu cầu
-        if width is not None and height is not None:
-            self.image = self.image.crop((left, top, left + width, top + height))
-        
-        self.width, self.height = self.image.shape[1], self.image.shape[0]
-
-    def get_row(self, y, row=None):
-        """
-        Lấy một hàng pixel từ hình ảnh.
-        
-        :param y: Chỉ số hàng cần lấy.
-        :param row: Dữ liệu hàng nếu đã có, nếu không thì sẽ được khởi tạo mới.
-        :return: Mảng byte chứa dữ liệu hàng.
-        """
-        if y < 0 or y >= self.height:
-            raise ValueError(f"Requested row is outside the image: {y}")
-        
-        if row is None or len(row) < self.width:
-            row = bytearray(self.width)
-
-        # # Lấy dữ liệu pixel từ hình ảnh
-        # row[:] = np.array(self.image.getdata(self.width * y, self.width), dtype=np.uint8)
-        row[:] = self.image[y, :self.width].astype(np.uint8)
-        
-        return row
+        if extractor is None:
+            extractor = IntegerLumaExtractor()
+        self.extractor = extractor
 
-    def get_matrix(self):
-        """
-        Lấy toàn bộ ma trận luminance của hình ảnh.
-        
-        :return: Mảng byte chứa toàn bộ dữ liệu pixel (luminance) của hình ảnh.
-        """
-        matrix = np.array(self.image, dtype=np.uint8)
-        return matrix.flatten()
+        # Cắt trên ảnh gốc (view) trước để chỉ chuyển đổi vùng cần dùng
+        if width is None:
+            width = image.shape[1] - left
+        if height is None:
+            height = image.shape[0] - top
+        region = image[top:top + height, left:left + width]
 
-    def is_crop_supported(self):
-        """
-        Kiểm tra xem hình ảnh có hỗ trợ cắt không.
-        
-        :return: Trả về True nếu hỗ trợ cắt, ngược lại False.
-        """
-        return True
-
-    def crop(self, left, top, width, height):
-        """
-        Cắt hình ảnh theo vùng đã cho.
-        
-        :param left: Tọa độ trái của vùng cắt.
-        :param top: Tọa độ trên của vùng cắt.
-        :param width: Chiều rộng của vùng cắt.
-        :param height: Chiều cao của vùng cắt.
-        :return: Một đối tượng `BufferedImageLuminanceSource` mới đã cắt.
-        """
-        return CV2ImageLuminanceSource(self.image, self.left + left, self.top + top, width, height)
-
-    def is_rotate_supported(self):
-        """
-        Kiểm tra xem hình ảnh có hỗ trợ xoay không.
-        
-        :return: Trả về True vì hình ảnh hỗ trợ xoay.
-        """
-        return True
-
-    def rotate_counter_clockwise(self):
-        """
-        Xoay hình ảnh 90 độ ngược chiều kim đồng hồ.
-        
-        :return: Một đối tượng `BufferedImageLuminanceSource` mới đã xoay.
-        """
-        rotated_image = self.image.rotate(90, expand=True)
-        return CV2ImageLuminanceSource(rotated_image, self.top, self.image.width - (self.left + self.width), self.height, self.width)
+        super().__init__(extractor.extract(region, out))
+        self.left = left
+        self.top = top
 
     def rotate_counter_clockwise_45(self):
         """
@@ -116,7 +52,7 @@ class CV2ImageLuminanceSource(LuminanceSource):
         old_center_y = self.top + self.height // 2
 
         # Tạo ma trận xoay 45 độ
-        rotated_image = rotate(np.array(self.image), self.MINUS_45_IN_RADIANS, reshape=True)
+        rotated_image = rotate(np.array(self.image), self.MINUS_45_IN_DEGREES, reshape=True)
         
         # Tính toán kích thước mới sau khi xoay và vị trí crop
         new_left = max(0, old_center_x - rotated_image.shape[1] // 2)
@@ -1,6 +1,7 @@
 import sys 
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+import numpy as np
 from exceptions import NotFoundException
 from .PerspectiveTransform import PerspectiveTransform
 
@@ -8,11 +9,18 @@ class DefaultGridSampler:
     """
     Lớp DefaultGridSampler thực hiện việc lấy mẫu lưới điểm từ hình ảnh, hỗ trợ biến dạng phối cảnh.
     """
+    # Khoảng lệch (đơn vị module) của 4 điểm thăm dò quanh tâm module khi ước lượng độ tin cậy
+    CONFIDENCE_PROBE_OFFSET = 0.3
+
+    # Bề rộng (đơn vị module) của lưới con k x k quanh tâm module khi lấy mẫu nhiều điểm; giữ các điểm con
+    # cách cạnh module ít nhất 0.2 module, nơi ảnh mờ hoặc lệch nhẹ dễ làm đổi màu
+    SUPERSAMPLE_SPAN = 0.6
+
     def __init__(self):
         pass
 
     @staticmethod
-    def sample_grid(image, dimension_x, dimension_y, *args):
+    def sample_grid(image, dimension_x, dimension_y, *args, with_confidence=False, supersample=1, weighted=True):
         """
         Lấy mẫu lưới điểm từ hình ảnh, sử dụng các đối số truyền vào để áp dụng biến dạng phối cảnh hoặc điểm.
 
@@ -21,6 +29,9 @@ class DefaultGridSampler:
             dimension_x (int): Số lượng điểm theo chiều rộng của lưới.
             dimension_y (int): Số lượng điểm theo chiều cao của lưới.
             *args: Tọa độ của 4 điểm hoặc một đối tượng PerspectiveTransform.
+            with_confidence (bool): Trả về thêm độ tin cậy của từng module (xem sample_grid_with_transform).
+            supersample (int): Số điểm con k trên mỗi cạnh module (xem sample_grid_with_transform).
+            weighted (bool): Bỏ phiếu có trọng số khi supersample > 1.
 
         Returns:
             BitMatrix: Lưới điểm sau khi đã được biến dạng.
@@ -29,138 +40,223 @@ class DefaultGridSampler:
             NotFoundException: Nếu không tìm thấy lưới điểm hợp lệ.
         """
 
-        print("ARG",len(args))
-        print(*args)
         # Kiểm tra số lượng đối số để xác định xem là dùng 4 điểm hay PerspectiveTransform
         if len(args) == 16:  # Nếu có 8 đối số, tức là 4 điểm với tọa độ chuyển tiếp và từ
-            return DefaultGridSampler.sample_grid_from_coordinates(image, dimension_x, dimension_y, *args)
+            return DefaultGridSampler.sample_grid_from_coordinates(image, dimension_x, dimension_y, *args,
+                                                                   with_confidence=with_confidence,
+                                                                   supersample=supersample, weighted=weighted)
         elif len(args) == 1 and isinstance(args[0], PerspectiveTransform):  # Nếu có một đối số là PerspectiveTransform
-            return DefaultGridSampler.sample_grid_with_transform(image, dimension_x, dimension_y, args[0])
+            return DefaultGridSampler.sample_grid_with_transform(image, dimension_x, dimension_y, args[0], with_confidence,
+                                                                 supersample, weighted)
         else:
             raise NotFoundException()
 
     @staticmethod
     def sample_grid_from_coordinates(image, dimension_x, dimension_y, p1_to_x, p1_to_y, p2_to_x, p2_to_y,
                                      p3_to_x, p3_to_y, p4_to_x, p4_to_y, p1_from_x, p1_from_y, p2_from_x, p2_from_y,
-                                     p3_from_x, p3_from_y, p4_from_x, p4_from_y):
+                                     p3_from_x, p3_from_y, p4_from_x, p4_from_y, with_confidence=False,
+                                     supersample=1, weighted=True):
 
         transform = PerspectiveTransform.quadrilateral_to_quadrilateral(
             p1_to_x, p1_to_y, p2_to_x, p2_to_y, p3_to_x, p3_to_y, p4_to_x, p4_to_y,
             p1_from_x, p1_from_y, p2_from_x, p2_from_y, p3_from_x, p3_from_y, p4_from_x, p4_from_y
         )
-        return DefaultGridSampler.sample_grid_with_transform(image, dimension_x, dimension_y, transform)
+        return DefaultGridSampler.sample_grid_with_transform(image, dimension_x, dimension_y, transform, with_confidence,
+                                                             supersample, weighted)
 
     @staticmethod
-    def sample_grid_with_transform(image, dimension_x, dimension_y, transform):
-        from qrcode.BitMatrix import BitMatrix
+    def sample_grid_with_transform(image, dimension_x, dimension_y, transform, with_confidence=False,
+                                   supersample=1, weighted=True):
         """
         Lấy mẫu lưới điểm từ hình ảnh, sử dụng biến dạng phối cảnh đã cho.
 
+        Toàn bộ lưới tâm module (dimension_y, dimension_x) được chiếu qua phép biến đổi trong một lượt, kiểm tra
+        và đẩy vào trong ảnh bằng mặt nạ (check_and_nudge_points), rồi đọc mọi module bằng một lần fancy-index
+        vào mảng bool đã giải nén của ảnh và đóng gói hàng loạt thành BitMatrix.
+
+        Với supersample = k > 1, mỗi module được quyết định bằng bỏ phiếu trên lưới con k x k (xem vote_modules)
+        thay vì một pixel duy nhất tại tâm, giúp chống ảnh mờ và lệch nhẹ.
+
         Parameters:
             image (BitMatrix): Hình ảnh nguồn.
             dimension_x (int): Số lượng điểm theo chiều rộng của lưới.
             dimension_y (int): Số lượng điểm theo chiều cao của lưới.
             transform (PerspectiveTransform): Biến dạng phối cảnh cần áp dụng.
+            with_confidence (bool): Nếu True, trả về thêm độ tin cậy của từng module.
+            supersample (int): Số điểm con k trên mỗi cạnh module, 1 để lấy mẫu một điểm tại tâm.
+            weighted (bool): Khi supersample > 1, True để bỏ phiếu có trọng số Gauss (điểm gần tâm nặng hơn),
+                False để bỏ phiếu đa số.
         
         Returns:
             BitMatrix: Lưới điểm sau khi đã được biến dạng.
+            Nếu with_confidence, trả về (BitMatrix, ndarray float32 (dimension_y, dimension_x)) với độ tin cậy
+            tính bởi module_confidence, hoặc độ chênh phiếu của vote_modules khi supersample > 1.
         
         Throws:
             NotFoundException: Nếu không tìm thấy lưới điểm hợp lệ.
         """
-        print("Dimension", dimension_x, dimension_y)
-        if dimension_x <= 0 or dimension_y <= 0:
+        from qrcode.BitMatrix import BitMatrix
+        if dimension_x <= 0 or dimension_y <= 0 or supersample < 1:
             raise NotFoundException()
 
-        # Tạo một đối tượng BitMatrix mới để lưu trữ lưới điểm
-        bits = BitMatrix(dimension_x, dimension_y)
-        points = [0] * (2 * dimension_x)
-
-        for y in range(dimension_y):
-            max_points = len(points)
-            i_value = y + 0.5
-            for x in range(0, max_points, 2):
-                points[x] = (x / 2) + 0.5
-                points[x + 1] = i_value
-            # Áp dụng biến dạng cho các điểm
-            transform.transform_points(points)
-            
-            # Kiểm tra và điều chỉnh nếu các điểm nằm ngoài ảnh
-            DefaultGridSampler.check_and_nudge_points(image, points)
-
-            try:
-                for x in range(0, max_points, 2):
-                    if image.get(int(points[x]), int(points[x + 1])):
-                        # Nếu điểm là pixel màu đen (hoặc gần đen)
-                        bits.set(x // 2, y)
-            except IndexError:
-                # Nếu có lỗi chỉ số ngoài phạm vi, ném ra NotFoundException
-                raise NotFoundException()
+        points_x, points_y = DefaultGridSampler.project_module_centers(transform, dimension_x, dimension_y)
+        x, y = DefaultGridSampler.check_and_nudge_points(image, points_x, points_y)
 
+        # Bộ quét finder đã giải nén ảnh vào chỉ mục run-length, dùng lại mảng đó thay vì đọc từng bit
+        modules = image.get_run_index().array[y, x]
+        if supersample > 1:
+            modules, margin = DefaultGridSampler.vote_modules(image, modules, dimension_x, dimension_y, transform,
+                                                              supersample, weighted)
+            bits = BitMatrix.from_bool_array(modules)
+            return (bits, margin) if with_confidence else bits
+        bits = BitMatrix.from_bool_array(modules)
+
+        if with_confidence:
+            return bits, DefaultGridSampler.module_confidence(image, modules, dimension_x, dimension_y, transform)
         return bits
 
     @staticmethod
-    def check_and_nudge_points(image, points):
+    def project_module_centers(transform, dimension_x, dimension_y, offset_x=0.0, offset_y=0.0):
+        """
+        Chiếu tâm các module (lệch thêm offset_x, offset_y module, có thể là mảng để chiếu nhiều lưới một lúc)
+        lên ảnh.
+
+        Returns:
+            (x, y): hai ndarray float64 có kích thước broadcast của (offset, dimension_y, dimension_x),
+            phần tử [..., j, i] là ảnh của điểm (i + 0.5 + offset_x, j + 0.5 + offset_y).
+        """
+        offset_x = np.asarray(offset_x, dtype=np.float64)[..., None, None]
+        offset_y = np.asarray(offset_y, dtype=np.float64)[..., None, None]
+        xs = np.arange(dimension_x, dtype=np.float64)[None, :] + 0.5 + offset_x
+        ys = np.arange(dimension_y, dtype=np.float64)[:, None] + 0.5 + offset_y
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return transform.transform_arrays(xs, ys)
+
+    @staticmethod
+    def get_supersample_offsets(supersample, weighted):
+        """
+        Vị trí và trọng số của lưới con supersample x supersample quanh tâm module.
+
+        Returns:
+            (offset_x, offset_y, weights): ba ndarray (supersample * supersample,), độ lệch tính bằng module
+            trong [-SUPERSAMPLE_SPAN / 2, SUPERSAMPLE_SPAN / 2], trọng số có tổng bằng 1.
+        """
+        span = DefaultGridSampler.SUPERSAMPLE_SPAN
+        steps = ((np.arange(supersample) + 0.5) / supersample - 0.5) * span
+        offset_x, offset_y = np.meshgrid(steps, steps)
+        offset_x = offset_x.ravel()
+        offset_y = offset_y.ravel()
+        if weighted:
+            sigma = span / 2
+            weights = np.exp(-(offset_x ** 2 + offset_y ** 2) / (2 * sigma * sigma))
+        else:
+            weights = np.ones(len(offset_x))
+        return offset_x, offset_y, (weights / weights.sum()).astype(np.float32)
+
+    @staticmethod
+    def vote_modules(image, center_modules, dimension_x, dimension_y, transform, supersample, weighted=True):
+        """
+        Quyết định màu của từng module bằng bỏ phiếu trên lưới con supersample x supersample.
+
+        Mọi điểm con của mọi module được chiếu qua phép biến đổi trong một lượt (supersample^2, dimension_y,
+        dimension_x), đọc bằng một lần fancy-index rồi cộng phiếu theo trọng số. Điểm con lệch ra ngoài ảnh
+        được kẹp vào biên. Khi hai màu hòa phiếu, màu của pixel tại tâm được giữ.
+
+        Parameters:
+            image (BitMatrix): Hình ảnh nguồn.
+            center_modules (ndarray bool): Màu tại tâm các module (dùng để phá hòa).
+            dimension_x, dimension_y (int): Kích thước lưới.
+            transform (PerspectiveTransform): Biến dạng phối cảnh.
+            supersample (int): Số điểm con trên mỗi cạnh module.
+            weighted (bool): Bỏ phiếu có trọng số Gauss hay đa số.
+
+        Returns:
+            (modules, margin): ndarray bool (dimension_y, dimension_x) các module đã quyết định, và ndarray float32
+            cùng kích thước độ chênh phiếu |2p - 1| (p là tỉ lệ phiếu tối): 1.0 khi mọi điểm con cùng màu,
+            0.0 khi hòa.
+        """
+        offset_x, offset_y, weights = DefaultGridSampler.get_supersample_offsets(supersample, weighted)
+        probe_x, probe_y = DefaultGridSampler.project_module_centers(transform, dimension_x, dimension_y,
+                                                                     offset_x, offset_y)
+        pixels = image.get_run_index().array
+        probe_x = np.clip(np.nan_to_num(probe_x), 0, image.get_width() - 1).astype(np.intp)
+        probe_y = np.clip(np.nan_to_num(probe_y), 0, image.get_height() - 1).astype(np.intp)
+        samples = pixels[probe_y, probe_x].reshape(len(weights), -1)
+        dark = (weights @ samples).reshape(dimension_y, dimension_x)
+
+        tie = np.isclose(dark, 0.5)
+        modules = np.where(tie, center_modules, dark > 0.5)
+        margin = np.abs(2 * dark - 1).astype(np.float32)
+        margin[tie] = 0.0
+        return modules, margin
+
+    @staticmethod
+    def module_confidence(image, modules, dimension_x, dimension_y, transform):
+        """
+        Ước lượng độ tin cậy của từng module đã lấy mẫu.
+
+        Quanh tâm mỗi module, 4 điểm thăm dò lệch CONFIDENCE_PROBE_OFFSET module theo hai trục được chiếu lên ảnh.
+        Độ tin cậy là tỉ lệ điểm thăm dò cùng màu với giá trị đã lấy mẫu: module nằm gọn trong vùng cùng màu
+        cho 1.0, còn điểm lấy mẫu sát cạnh module hoặc rơi vào vùng nhiễu sau nhị phân hóa cho giá trị thấp.
+
+        Parameters:
+            image (BitMatrix): Hình ảnh nguồn.
+            modules (ndarray bool): Lưới đã lấy mẫu, phần tử [y, x].
+            dimension_x (int): Số module theo chiều rộng.
+            dimension_y (int): Số module theo chiều cao.
+            transform (PerspectiveTransform): Biến dạng phối cảnh đã dùng để lấy mẫu.
+
+        Returns:
+            ndarray float32 (dimension_y, dimension_x), giá trị trong [0, 1].
+        """
+        offset = DefaultGridSampler.CONFIDENCE_PROBE_OFFSET
+        probe_x, probe_y = DefaultGridSampler.project_module_centers(
+            transform, dimension_x, dimension_y, [-offset, offset, 0.0, 0.0], [0.0, 0.0, -offset, offset])
+
+        pixels = image.get_run_index().array
+        probe_x = np.clip(np.nan_to_num(probe_x), 0, image.get_width() - 1).astype(np.intp)
+        probe_y = np.clip(np.nan_to_num(probe_y), 0, image.get_height() - 1).astype(np.intp)
+        agree = (pixels[probe_y, probe_x] == modules[None, :, :]).sum(axis=0)
+        return (agree / 4.0).astype(np.float32)
+
+    @staticmethod
+    def check_and_nudge_points(image, points_x, points_y):
+        """
+        Kiểm tra các điểm đã chiếu và đẩy những điểm lệch ra ngoài ảnh đúng một pixel vào trong (xem nudge_points).
+
+        Parameters:
+            image (BitMatrix): Hình ảnh nguồn.
+            points_x, points_y (ndarray): Tọa độ các điểm trên ảnh.
+
+        Returns:
+            (x, y): hai ndarray chỉ số nguyên nằm trong ảnh.
+
+        Throws:
+            NotFoundException: Nếu có điểm nằm ngoài ảnh quá một pixel.
+        """
+        x, y, valid = DefaultGridSampler.nudge_points(image, points_x, points_y)
+        if not valid.all():
+            raise NotFoundException()
+        return x, y
+
+    @staticmethod
+    def nudge_points(image, points_x, points_y):
         """
-        Input:
-        - image: BitMatrix
-        - points: float []
+        Giống ZXing, tọa độ được cắt phần thập phân; điểm có tọa độ -1 hoặc width / height được đưa về
+        biên gần nhất, còn điểm xa hơn (hoặc không hữu hạn) nghĩa là phép biến đổi sai. Mọi điểm được xử lý
+        bằng mặt nạ trong một lượt, thay vì chỉ quét từ hai đầu mỗi hàng.
+
+        Parameters:
+            image (BitMatrix): Hình ảnh nguồn.
+            points_x, points_y (ndarray): Tọa độ các điểm trên ảnh.
+
+        Returns:
+            (x, y, valid): hai ndarray chỉ số nguyên đã kẹp vào trong ảnh và mặt nạ bool cùng kích thước,
+            False tại các điểm không hợp lệ.
         """
         width = image.get_width()
         height = image.get_height()
-
-        # Check and nudge points from start until we see some that are OK:
-        nudged = True
-        max_offset = len(points) - 1  # points length must be even
-        offset = 0
-        print("POINT", points)
-        while offset < max_offset and nudged:
-            x = int(points[offset])
-            y = int(points[offset + 1])
-            print(x,y)
-            if x < -1 or x > width or y < -1 or y > height:
-                raise Exception("NotFoundException")
-
-            nudged = False
-            if x == -1:
-                points[offset] = 0.0
-                nudged = True
-            elif x == width:
-                points[offset] = width - 1
-                nudged = True
-
-            if y == -1:
-                points[offset + 1] = 0.0
-                nudged = True
-            elif y == height:
-                points[offset + 1] = height - 1
-                nudged = True
-
-            offset += 2
-
-        # Check and nudge points from end:
-        nudged = True
-        offset = len(points) - 2
-
-        while offset >= 0 and nudged:
-            x = int(points[offset])
-            y = int(points[offset + 1])
-            if x < -1 or x > width or y < -1 or y > height:
-                raise Exception("NotFoundException")
-
-            nudged = False
-            if x == -1:
-                points[offset] = 0.0
-                nudged = True
-            elif x == width:
-                points[offset] = width - 1
-                nudged = True
-
-            if y == -1:
-                points[offset + 1] = 0.0
-                nudged = True
-            elif y == height:
-                points[offset + 1] = height - 1
-                nudged = True
-
-            offset -= 2
\ No newline at end of file
+        x = np.trunc(np.nan_to_num(points_x, nan=-2.0, posinf=-2.0, neginf=-2.0))
+        y = np.trunc(np.nan_to_num(points_y, nan=-2.0, posinf=-2.0, neginf=-2.0))
+        valid = (x >= -1) & (x <= width) & (y >= -1) & (y <= height)
+        return (np.clip(x, 0, width - 1).astype(np.intp), np.clip(y, 0, height - 1).astype(np.intp), valid)
@@ -1,6 +1,7 @@
 import numpy as np
 from .LuminanceSource import LuminanceSource
-from qrcode import BitMatrix, BitArray
+from qrcode.BitMatrix import BitMatrix
+from qrcode.BitArray import BitArray
 from exceptions import NotFoundException
 from .Binarizer import Binarizer
 
@@ -31,27 +32,22 @@ class GlobalHistogramBinarizer(Binarizer):
             row.clear()
 
         self.init_arrays(width)
-        local_luminances = source.get_row(y, self.luminances)
-        local_buckets = self.buckets
-
-        for x in range(width):
-            local_buckets[(local_luminances[x] & 0xFF) >> self.LUMINANCE_SHIFT] += 1
+        local_luminances = np.asarray(source.get_row(y, self.luminances), dtype=np.int64)[:width] & 0xFF
+        local_buckets = self.fill_buckets(local_luminances)
 
         black_point = self.estimate_black_point(local_buckets)
 
         if width < 3:
-            for x in range(width):
-                if (local_luminances[x] & 0xFF) < black_point:
-                    row.set(x)
+            row.set_bool_array(local_luminances < black_point)
         else:
-            left = local_luminances[0] & 0xFF
-            center = local_luminances[1] & 0xFF
-            for x in range(1, width - 1):
-                right = local_luminances[x + 1] & 0xFF
-                if ((center * 4) - left - right) // 2 < black_point:
-                    row.set(x)
-                left = center
-                center = right
+            # Làm sắc nét theo nhân (center * 4 - left - right) // 2 cho toàn bộ dòng cùng lúc,
+            # tính trên số nguyên có dấu nên phép // giữ đúng ngữ nghĩa làm tròn xuống của Python
+            black = np.zeros(width, dtype=bool)
+            left = local_luminances[:-2]
+            center = local_luminances[1:-1]
+            right = local_luminances[2:]
+            black[1:-1] = ((center * 4) - left - right) // 2 < black_point
+            row.set_bool_array(black)
 
         return row
     
@@ -74,28 +70,16 @@ class GlobalHistogramBinarizer(Binarizer):
         source = self.get_luminance_source()
         width = source.get_width()
         height = source.get_height()
-        matrix = BitMatrix(width, height)
 
         self.init_arrays(width)
-        local_buckets = self.buckets
+        local_luminances = source.get_matrix_2d()
 
-        for y in range(1, 5):
-            row = height * y // 5
-            local_luminances = source.get_row(row, self.luminances)
-            right = (width * 4) // 5
-            for x in range(width // 5, right):
-                pixel = local_luminances[x] & 0xFF
-                local_buckets[pixel >> self.LUMINANCE_SHIFT] += 1
+        # Histogram lấy mẫu từ 4 dòng, ở 3/5 giữa của mỗi dòng
+        rows = [height * y // 5 for y in range(1, 5)]
+        local_buckets = self.fill_buckets(local_luminances[rows, width // 5:(width * 4) // 5])
 
         black_point = self.estimate_black_point(local_buckets)
-        local_luminances = source.get_matrix()
-
-        for y in range(height):
-            offset = y * width
-            for x in range(width):
-                pixel = local_luminances[offset + x] & 0xFF
-                if pixel < black_point:
-                    matrix.set(x, y)
+        matrix = BitMatrix.from_bool_array(local_luminances < black_point)
 
         return matrix
 
@@ -107,6 +91,13 @@ class GlobalHistogramBinarizer(Binarizer):
             self.luminances = np.zeros(luminance_size, dtype=np.uint8)
         self.buckets.fill(0)
 
+    def fill_buckets(self, luminances):
+        """
+        Cộng histogram của các giá trị độ sáng (0..255) vào self.buckets bằng np.bincount.
+        """
+        self.buckets += np.bincount((luminances >> self.LUMINANCE_SHIFT).ravel(), minlength=self.LUMINANCE_BUCKETS)
+        return self.buckets
+
     @staticmethod
     def estimate_black_point(buckets):
         """
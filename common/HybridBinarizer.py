@@ -28,12 +28,18 @@ class HybridBinarizer(GlobalHistogramBinarizer):
     MINIMUM_DIMENSION = BLOCK_SIZE * 5
     MIN_DYNAMIC_RANGE = 24
 
-    def __init__(self, source):
+    def __init__(self, source, vectorized: bool = True):
         """
         Khởi tạo HybridBinarizer với nguồn luminance.
+
+        :param source: Nguồn luminance cần nhị phân hóa.
+        :param vectorized: True để dùng nhánh NumPy xử lý toàn bộ mặt phẳng luminance (height, width)
+            bằng các phép toán mảng; False để dùng các vòng lặp theo từng block như cũ.
+            Hai nhánh cho ra BitMatrix giống hệt nhau từng bit.
         """
         super().__init__(source)
         self.matrix = None
+        self.vectorized = vectorized
 
     def get_black_matrix(self):
         """
@@ -50,7 +56,7 @@ class HybridBinarizer(GlobalHistogramBinarizer):
         width: int = source.get_width()
         height: int  = source.get_height()
         if width >= self.MINIMUM_DIMENSION and height >= self.MINIMUM_DIMENSION:
-            luminances: List = source.get_matrix()
+            luminances: List = source.get_matrix_2d() if self.vectorized else source.get_matrix()
             sub_width: int = width >> HybridBinarizer.BLOCK_SIZE_POWER
             if (width & HybridBinarizer.BLOCK_SIZE_MASK) != 0:
                 sub_width += 1
@@ -58,10 +64,13 @@ class HybridBinarizer(GlobalHistogramBinarizer):
             if (height & HybridBinarizer.BLOCK_SIZE_MASK) != 0:
                 sub_height += 1
 
-            black_points: np.array = self.calculate_black_points(luminances, sub_width, sub_height, width, height)
-            new_matrix: BitMatrix = BitMatrix(width, height)
-            self.calculate_threshold_for_block(luminances, sub_width, sub_height, width, height, black_points, new_matrix)
-            self.matrix = new_matrix
+            if self.vectorized:
+                self.matrix = self.calculate_black_matrix_vectorized(luminances, sub_width, sub_height, width, height)
+            else:
+                black_points: np.array = self.calculate_black_points(luminances, sub_width, sub_height, width, height)
+                new_matrix: BitMatrix = BitMatrix(width, height)
+                self.calculate_threshold_for_block(luminances, sub_width, sub_height, width, height, black_points, new_matrix)
+                self.matrix = new_matrix
         else:
             # Nếu hình ảnh quá nhỏ, rơi về phương pháp histogram toàn cục.
             self.matrix = super().get_black_matrix()
@@ -72,7 +81,7 @@ class HybridBinarizer(GlobalHistogramBinarizer):
         """
         Tạo một binarizer mới từ nguồn luminance.
         """
-        return HybridBinarizer(source)
+        return HybridBinarizer(source, self.vectorized)
 
     @staticmethod
     def calculate_threshold_for_block(luminances, sub_width, sub_height, width, height, black_points, matrix):
@@ -202,4 +211,116 @@ class HybridBinarizer(GlobalHistogramBinarizer):
                             average = average_neighbor_black_point
 
                 black_points[y][x] = average
-        return black_points
\ No newline at end of file
+        return black_points
+
+    @staticmethod
+    def calculate_black_matrix_vectorized(luminances, sub_width, sub_height, width, height):
+        """
+        Nhánh NumPy của get_black_matrix: tính điểm đen, ngưỡng trung bình 5x5 và ghi kết quả
+        vào BitMatrix.bits theo từng word qua BitMatrix.from_bool_array, cho kết quả giống hệt nhánh dùng vòng lặp.
+
+        Parameters:
+        - luminances: mảng độ sáng (1D theo thứ tự dòng-chính hoặc 2D (height, width)).
+        - sub_width, sub_height: số lượng block theo chiều ngang và chiều dọc.
+        - width, height: kích thước ảnh (pixel).
+
+        Returns:
+        - BitMatrix đã được nhị phân hóa.
+        """
+        plane = np.asarray(luminances, dtype=np.uint8).reshape(height, width)
+        blocks = HybridBinarizer.gather_blocks(plane, sub_width, sub_height, width, height)
+        black_points = HybridBinarizer.calculate_black_points_vectorized(blocks)
+        black = HybridBinarizer.calculate_threshold_vectorized(blocks, black_points, width, height)
+        return BitMatrix.from_bool_array(black)
+
+    @staticmethod
+    def gather_blocks(plane, sub_width, sub_height, width, height):
+        """
+        Gom các block 8x8 của ảnh thành mảng 4 chiều (sub_height, 8, sub_width, 8).
+
+        Block cuối mỗi hàng/cột được dịch vào trong ảnh (giống max_x_offset/max_y_offset của
+        nhánh vòng lặp), nên có thể chồng lên block kế trước khi kích thước không chia hết cho 8.
+        """
+        block = HybridBinarizer.BLOCK_SIZE
+        steps = np.arange(block)
+        y_offsets = np.minimum(np.arange(sub_height) << HybridBinarizer.BLOCK_SIZE_POWER, height - block)
+        x_offsets = np.minimum(np.arange(sub_width) << HybridBinarizer.BLOCK_SIZE_POWER, width - block)
+        rows = (y_offsets[:, None] + steps).ravel()
+        cols = (x_offsets[:, None] + steps).ravel()
+        return plane[np.ix_(rows, cols)].reshape(sub_height, block, sub_width, block)
+
+    @staticmethod
+    def calculate_black_points_vectorized(blocks):
+        """
+        Tính điểm đen cho mọi block cùng lúc từ mảng block 4 chiều.
+
+        Tổng, min và max của block được tính bằng phép rút gọn mảng. Các block có dải động nhỏ
+        (<= MIN_DYNAMIC_RANGE) dùng min / 2 hoặc trung bình điểm đen của các block lân cận; vì giá trị
+        lân cận phụ thuộc các block trên/trái, các block này được xử lý theo từng đường chéo
+        (y + x không đổi), mỗi đường chéo là một phép toán mảng.
+
+        Returns:
+        - black_points: mảng 2D (sub_height, sub_width) kiểu int64.
+        """
+        total_sum = blocks.sum(axis=(1, 3), dtype=np.int64)
+        min_pixel = blocks.min(axis=(1, 3)).astype(np.int64)
+        max_pixel = blocks.max(axis=(1, 3)).astype(np.int64)
+
+        black_points = total_sum >> (HybridBinarizer.BLOCK_SIZE_POWER * 2)
+        low_contrast = (max_pixel - min_pixel) <= HybridBinarizer.MIN_DYNAMIC_RANGE
+        black_points[low_contrast] = min_pixel[low_contrast] // 2
+
+        ys, xs = np.nonzero(low_contrast[1:, 1:])
+        if ys.size == 0:
+            return black_points
+        ys += 1
+        xs += 1
+        diagonals = ys + xs
+        order = np.argsort(diagonals, kind="stable")
+        ys, xs, diagonals = ys[order], xs[order], diagonals[order]
+        bounds = np.flatnonzero(np.diff(diagonals)) + 1
+        for y, x in zip(np.split(ys, bounds), np.split(xs, bounds)):
+            average_neighbor_black_point = (
+                black_points[y - 1, x]
+                + (2 * black_points[y, x - 1])
+                + black_points[y - 1, x - 1]
+            ) // 4
+            use_neighbor = min_pixel[y, x] < average_neighbor_black_point
+            black_points[y[use_neighbor], x[use_neighbor]] = average_neighbor_black_point[use_neighbor]
+        return black_points
+
+    @staticmethod
+    def calculate_threshold_vectorized(blocks, black_points, width, height):
+        """
+        Áp dụng ngưỡng trung bình 5x5 block cho mọi pixel cùng lúc.
+
+        Tổng 5x5 được lấy từ bảng tổng tích lũy (summed-area table) của black_points. Vùng chồng nhau
+        của block cuối được gộp bằng phép OR, tương đương với việc gọi BitMatrix.set nhiều lần.
+
+        Returns:
+        - Mảng bool (height, width), True là pixel đen.
+        """
+        sub_height, block, sub_width, _ = blocks.shape
+        integral = np.zeros((sub_height + 1, sub_width + 1), dtype=np.int64)
+        integral[1:, 1:] = black_points.cumsum(axis=0).cumsum(axis=1)
+        top = np.clip(np.arange(sub_height), 2, sub_height - 3)
+        left = np.clip(np.arange(sub_width), 2, sub_width - 3)
+        sum_black_points = (integral[np.ix_(top + 3, left + 3)]
+                            - integral[np.ix_(top - 2, left + 3)]
+                            - integral[np.ix_(top + 3, left - 2)]
+                            + integral[np.ix_(top - 2, left - 2)])
+        thresholds = sum_black_points // 25
+
+        # So sánh dùng <= để pixel có độ sáng 0 vẫn là màu đen kể cả khi ngưỡng bằng 0.
+        mask = (blocks <= thresholds[:, None, :, None]).reshape(sub_height * block, sub_width * block)
+
+        full_height = (sub_height - 1) * block
+        rows = np.zeros((height, sub_width * block), dtype=bool)
+        rows[:full_height] = mask[:full_height]
+        rows[height - block:] |= mask[full_height:]
+
+        full_width = (sub_width - 1) * block
+        black = np.zeros((height, width), dtype=bool)
+        black[:, :full_width] = rows[:, :full_width]
+        black[:, width - block:] |= rows[:, full_width:]
+        return black
@@ -1,3 +1,4 @@
+import numpy as np
 from .LuminanceSource import LuminanceSource
 class InvertedLuminanceSource(LuminanceSource):
     """
@@ -24,10 +25,9 @@ class InvertedLuminanceSource(LuminanceSource):
         :param row: Dữ liệu dòng (row) sẽ được trả về, nếu không sẽ tạo mới.
         :return: Một mảng byte chứa giá trị độ sáng đảo ngược của dòng.
         """
-        row = self.delegate.get_row(y, row)
-        for i in range(self.width):
-            row[i] = 255 - (row[i] & 0xFF)  # Đảo ngược giá trị độ sáng
-        return row
+        # Không ghi ngược vào dòng của delegate: dòng đó có thể là view của ảnh gốc
+        row = np.asarray(self.delegate.get_row(y, row), dtype=np.uint8)[:self.width]
+        return 255 - row
 
     def get_matrix(self):
         """
@@ -35,12 +35,15 @@ class InvertedLuminanceSource(LuminanceSource):
         
         :return: Một mảng byte chứa toàn bộ ma trận độ sáng đảo ngược.
         """
-        matrix = self.delegate.get_matrix()
-        length = self.width * self.height
-        inverted_matrix = bytearray(length)
-        for i in range(length):
-            inverted_matrix[i] = 255 - (matrix[i] & 0xFF)  # Đảo ngược giá trị độ sáng
-        return inverted_matrix
+        return self.get_matrix_2d().ravel()
+
+    def get_matrix_2d(self):
+        """
+        Lấy ma trận độ sáng 2D của delegate và đảo ngược tất cả các giá trị trong một phép toán mảng.
+
+        :return: Mảng 2D (height, width) kiểu uint8 chứa độ sáng đảo ngược.
+        """
+        return 255 - self.delegate.get_matrix_2d()
 
     def is_crop_supported(self):
         """
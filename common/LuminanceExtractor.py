@@ -0,0 +1,156 @@
+from abc import ABC, abstractmethod
+import numpy as np
+import cv2
+
+
+class LuminanceExtractor(ABC):
+    """
+    Chiến lược chuyển ảnh màu (height, width, channels) hoặc ảnh xám (height, width) thành mặt phẳng độ chói uint8.
+
+    Mỗi chiến lược chạy một lượt vector hóa và ghi kết quả vào bộ đệm `out` do người gọi truyền vào
+    (nếu đúng kích thước), nhờ đó một luồng camera có thể dùng lại cùng một bộ đệm cho mọi khung hình / vùng cắt
+    thay vì cấp phát mới mỗi lần.
+    """
+
+    def __init__(self, channel_order="BGR"):
+        """
+        :param channel_order: Thứ tự kênh của ảnh màu đầu vào, "BGR" (OpenCV) hoặc "RGB" (PIL).
+            Kênh thứ tư (alpha) nếu có sẽ bị bỏ qua.
+        """
+        channel_order = channel_order.upper()
+        if channel_order not in ("BGR", "RGB"):
+            raise ValueError("channel_order phải là 'BGR' hoặc 'RGB'")
+        self.channel_order = channel_order
+
+    def output_shape(self, image):
+        """
+        Kích thước (height, width) của mặt phẳng độ chói được tạo từ `image`.
+        """
+        return image.shape[0], image.shape[1]
+
+    def extract(self, image, out=None):
+        """
+        Chuyển `image` thành mặt phẳng độ chói.
+
+        :param image: Ảnh 2D (đã là độ chói) hoặc 3D với 3 hoặc 4 kênh, kiểu uint8.
+        :param out: Bộ đệm uint8 dùng lại (tùy chọn). Nếu kích thước không khớp, một bộ đệm mới được cấp phát.
+        :return: Mảng 2D uint8. Với ảnh xám và không có `out`, kết quả có thể là chính `image` (không sao chép).
+        """
+        image = np.asarray(image, dtype=np.uint8)
+        if image.ndim == 3 and image.shape[2] == 1:
+            image = image[:, :, 0]
+        if image.ndim not in (2, 3):
+            raise ValueError("Ảnh đầu vào phải có 2 hoặc 3 chiều")
+
+        shape = self.output_shape(image)
+        if out is not None and (out.shape != shape or out.dtype != np.uint8):
+            out = None
+
+        if image.ndim == 2 and shape == image.shape:
+            # Ảnh đã là độ chói: chỉ sao chép khi người gọi muốn kết quả nằm trong bộ đệm của họ
+            if out is None:
+                return image
+            np.copyto(out, image)
+            return out
+
+        if out is None:
+            out = np.empty(shape, dtype=np.uint8)
+        self.extract_into(image, out)
+        return out
+
+    @abstractmethod
+    def extract_into(self, image, out):
+        """
+        Ghi độ chói của `image` vào `out` (đã đúng kích thước output_shape(image)).
+        """
+        pass
+
+    def channel_index(self, channel):
+        """
+        Vị trí của kênh "R", "G" hoặc "B" trong ảnh theo channel_order.
+        """
+        return self.channel_order.index(channel.upper())
+
+
+class IntegerLumaExtractor(LuminanceExtractor):
+    """
+    Độ chói theo công thức luma số nguyên của OpenCV (0.299 R + 0.587 G + 0.114 B, tính bằng số học dấu phẩy tĩnh).
+    Đây là chiến lược mặc định, cho kết quả giống `cv2.cvtColor(..., COLOR_BGR2GRAY)` trước đây.
+    """
+
+    def extract_into(self, image, out):
+        if image.ndim == 2:
+            np.copyto(out, image)
+            return
+        if image.shape[2] == 4:
+            code = cv2.COLOR_BGRA2GRAY if self.channel_order == "BGR" else cv2.COLOR_RGBA2GRAY
+        else:
+            code = cv2.COLOR_BGR2GRAY if self.channel_order == "BGR" else cv2.COLOR_RGB2GRAY
+        cv2.cvtColor(image, code, dst=out)
+
+
+class SingleChannelExtractor(LuminanceExtractor):
+    """
+    Lấy trực tiếp một kênh màu làm độ chói, ví dụ kênh có độ tương phản tốt nhất dưới một nguồn sáng màu.
+    """
+
+    def __init__(self, channel="G", channel_order="BGR"):
+        """
+        :param channel: Kênh được dùng, "R", "G" hoặc "B".
+        """
+        super().__init__(channel_order)
+        self.channel = channel.upper()
+        self.index = self.channel_index(self.channel)
+
+    def extract_into(self, image, out):
+        if image.ndim == 2:
+            np.copyto(out, image)
+            return
+        np.copyto(out, image[:, :, self.index])
+
+
+class MinChannelExtractor(LuminanceExtractor):
+    """
+    Độ chói là giá trị nhỏ nhất trong ba kênh màu: module in màu (đỏ, xanh...) trên nền trắng vẫn tối
+    ở ít nhất một kênh, nên mã QR có màu vẫn tách được khỏi nền.
+    """
+
+    def extract_into(self, image, out):
+        if image.ndim == 2:
+            np.copyto(out, image)
+            return
+        np.min(image[:, :, :3], axis=2, out=out)
+
+
+class PyramidLuminanceExtractor(LuminanceExtractor):
+    """
+    Tạo độ chói ở một tầng kim tự tháp đã thu nhỏ: ảnh được chuyển thành độ chói bằng chiến lược `base`
+    (vào một bộ đệm tạm được giữ lại giữa các lần gọi), rồi thu nhỏ 2^level lần bằng trung bình khối (INTER_AREA).
+
+    Tọa độ tìm được trên tầng này phải nhân với `scale` để đưa về ảnh gốc.
+    """
+
+    def __init__(self, level=1, base=None, channel_order="BGR"):
+        """
+        :param level: Tầng kim tự tháp (>= 0), ảnh ra nhỏ hơn 2^level lần theo mỗi chiều.
+        :param base: Chiến lược tạo độ chói ở độ phân giải gốc, mặc định IntegerLumaExtractor.
+        """
+        if level < 0:
+            raise ValueError("level phải lớn hơn hoặc bằng 0")
+        super().__init__(channel_order)
+        self.level = level
+        self.scale = 1 << level
+        self.base = base if base is not None else IntegerLumaExtractor(channel_order)
+        self.scratch = None
+
+    def output_shape(self, image):
+        return max(1, image.shape[0] >> self.level), max(1, image.shape[1] >> self.level)
+
+    def extract_into(self, image, out):
+        if image.ndim == 2:
+            plane = image
+        else:
+            self.scratch = self.base.extract(image, self.scratch)
+            plane = self.scratch
+        height, width = out.shape
+        cv2.resize(plane, (width, height), dst=out, interpolation=cv2.INTER_AREA)
@@ -0,0 +1,62 @@
+import numpy as np
+from .LuminanceSource import LuminanceSource
+from .NdarrayLuminanceSource import NdarrayLuminanceSource
+
+
+class LuminancePyramid:
+    """
+    Kim tự tháp ảnh được dựng lười từ một LuminanceSource.
+
+    Tầng 0 là nguồn gốc; tầng k được tạo từ tầng k - 1 bằng trung bình khối 2x2 (làm tròn), chỉ khi được yêu cầu,
+    nên nếu giải mã thành công ở tầng thô thì các tầng mịn hơn không bao giờ phải tính.
+    Pixel (x, y) của tầng k phủ vùng [x * 2^k, (x + 1) * 2^k) x [y * 2^k, (y + 1) * 2^k) của ảnh gốc,
+    vì vậy tọa độ trên tầng k chỉ cần nhân với get_scale(k) để đưa về ảnh gốc.
+    """
+
+    # Cạnh ngắn nhất tối thiểu của một tầng (pixel), dưới mức này mã QR nhỏ nhất không còn đủ pixel mỗi module
+    MIN_DIMENSION = 80
+
+    def __init__(self, source: LuminanceSource, max_level: int = 2, min_dimension: int = MIN_DIMENSION):
+        """
+        :param source: Nguồn độ chói gốc (tầng 0).
+        :param max_level: Tầng thô nhất được phép tạo.
+        :param min_dimension: Cạnh ngắn nhất tối thiểu của mỗi tầng.
+        """
+        self.levels = [source]
+        shortest = min(source.get_width(), source.get_height())
+        self.level_count = 1
+        while self.level_count <= max_level and (shortest >> self.level_count) >= min_dimension:
+            self.level_count += 1
+
+    def get_level_count(self):
+        """
+        Số tầng khả dụng (luôn >= 1).
+        """
+        return self.level_count
+
+    @staticmethod
+    def get_scale(level):
+        """
+        Hệ số nhân để đưa tọa độ ở tầng `level` về ảnh gốc.
+        """
+        return 1 << level
+
+    def get_level(self, level):
+        """
+        Trả về LuminanceSource của tầng `level`, dựng các tầng còn thiếu nếu cần.
+        """
+        if level < 0 or level >= self.level_count:
+            raise ValueError(f"Tầng kim tự tháp không hợp lệ: {level}")
+        while len(self.levels) <= level:
+            self.levels.append(NdarrayLuminanceSource(LuminancePyramid.downsample(self.levels[-1].get_matrix_2d())))
+        return self.levels[level]
+
+    @staticmethod
+    def downsample(plane):
+        """
+        Thu nhỏ mặt phẳng độ chói 2 lần theo mỗi chiều bằng trung bình khối 2x2 (bỏ hàng/cột lẻ cuối cùng).
+        """
+        height = plane.shape[0] // 2
+        width = plane.shape[1] // 2
+        blocks = plane[:height * 2, :width * 2].reshape(height, 2, width, 2)
+        return ((blocks.sum(axis=(1, 3), dtype=np.uint16) + 2) >> 2).astype(np.uint8)
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+import numpy as np
 
 class LuminanceSource(ABC):
     """
@@ -39,6 +40,15 @@ class LuminanceSource(ABC):
         """
         pass
 
+    def get_matrix_2d(self):
+        """
+        Lấy dữ liệu độ chói dưới dạng mảng NumPy 2D (height, width) kiểu uint8.
+        Mặc định được dựng lại từ `get_matrix()`; các lớp con đã giữ sẵn mảng 2D có thể trả về view không sao chép.
+
+        :return: Mảng 2D chứa dữ liệu độ chói.
+        """
+        return np.asarray(self.get_matrix(), dtype=np.uint8).reshape(self.height, self.width)
+
     def get_width(self):
         """
         Trả về chiều rộng của bitmap.
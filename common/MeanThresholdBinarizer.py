@@ -0,0 +1,97 @@
+import numpy as np
+from .LuminanceSource import LuminanceSource
+from .Binarizer import Binarizer
+from qrcode.BitMatrix import BitMatrix
+from qrcode.BitArray import BitArray
+
+
+class MeanThresholdBinarizer(Binarizer):
+    """
+    Thuật toán nhị phân hóa theo ngưỡng trung bình cục bộ: một pixel được coi là đen khi độ sáng của nó
+    không lớn hơn (trung bình cửa sổ window_size x window_size quanh nó) - offset.
+
+    Đây là cùng phép ngưỡng mà `app.binarizer_img` thực hiện bằng `cv2.boxFilter`, nhưng được tính bằng
+    bảng tổng tích lũy (summed-area table) nên chi phí mỗi pixel là O(1) với mọi kích thước cửa sổ,
+    và kết quả là một BitMatrix dùng được với BinaryBitmap / QRCodeReader.
+    Ở mép ảnh, cửa sổ được cắt theo biên và trung bình chỉ tính trên các pixel nằm trong ảnh.
+    """
+    DEFAULT_WINDOW_SIZE = 50
+    DEFAULT_OFFSET = 15
+
+    def __init__(self, source: LuminanceSource, window_size: int = DEFAULT_WINDOW_SIZE, offset: int = DEFAULT_OFFSET):
+        """
+        Khởi tạo MeanThresholdBinarizer.
+
+        :param source: Nguồn luminance cần nhị phân hóa.
+        :param window_size: Kích thước cạnh cửa sổ tính trung bình (pixel), phải >= 1.
+        :param offset: Hằng số C trừ vào trung bình cục bộ trước khi so sánh.
+        """
+        if window_size < 1:
+            raise ValueError("window_size phải lớn hơn hoặc bằng 1")
+        super().__init__(source)
+        self.window_size = window_size
+        self.offset = offset
+        self.matrix = None
+
+    def get_black_row(self, y: int, row: BitArray):
+        """
+        Lấy một dòng của ma trận đã nhị phân hóa.
+        """
+        return self.get_black_matrix().get_row(y, row)
+
+    def get_black_matrix(self):
+        """
+        Tính BitMatrix một lần cho tất cả các yêu cầu (lazy, giống HybridBinarizer).
+        """
+        if self.matrix is not None:
+            return self.matrix
+
+        luminances = self.get_luminance_source().get_matrix_2d()
+        black = self.calculate_black_mask(luminances, self.window_size, self.offset)
+        self.matrix = BitMatrix.from_bool_array(black)
+        return self.matrix
+
+    def create_binarizer(self, source):
+        """
+        Tạo một MeanThresholdBinarizer mới với cùng cấu hình cửa sổ và offset.
+        """
+        return MeanThresholdBinarizer(source, self.window_size, self.offset)
+
+    @staticmethod
+    def summed_area_table(plane):
+        """
+        Tính bảng tổng tích lũy kích thước (height + 1, width + 1), hàng và cột đầu bằng 0,
+        table[y, x] là tổng của plane[:y, :x].
+        """
+        height, width = plane.shape
+        table = np.zeros((height + 1, width + 1), dtype=np.int64)
+        np.cumsum(plane, axis=0, dtype=np.int64, out=table[1:, 1:])
+        np.cumsum(table[1:, 1:], axis=1, out=table[1:, 1:])
+        return table
+
+    @staticmethod
+    def calculate_black_mask(luminances, window_size, offset):
+        """
+        Tính mặt nạ pixel đen cho mặt phẳng luminance (height, width).
+
+        Cửa sổ của pixel (x, y) là [x - window_size // 2, x - window_size // 2 + window_size) theo mỗi trục
+        (cùng vị trí neo với cv2.boxFilter), được cắt theo biên ảnh. Phép so sánh
+        luminance <= sum / area - offset được thực hiện bằng số nguyên: luminance * area <= sum - offset * area.
+
+        :return: ndarray bool (height, width), True là pixel đen.
+        """
+        height, width = luminances.shape
+        table = MeanThresholdBinarizer.summed_area_table(luminances)
+        half = window_size // 2
+
+        ys = np.arange(height)
+        top = np.clip(ys - half, 0, height)
+        bottom = np.clip(ys - half + window_size, 0, height)
+        xs = np.arange(width)
+        left = np.clip(xs - half, 0, width)
+        right = np.clip(xs - half + window_size, 0, width)
+
+        sums = (table[np.ix_(bottom, right)] - table[np.ix_(top, right)]
+                - table[np.ix_(bottom, left)] + table[np.ix_(top, left)])
+        area = (bottom - top)[:, None] * (right - left)[None, :]
+        return luminances * area <= sums - offset * area
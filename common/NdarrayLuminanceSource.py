@@ -0,0 +1,96 @@
+import numpy as np
+from .LuminanceSource import LuminanceSource
+
+
+class NdarrayLuminanceSource(LuminanceSource):
+    """
+    Nguồn độ chói giữ một view (có stride) của mảng NumPy 2D kiểu uint8 do người gọi cung cấp.
+
+    `get_matrix_2d`, `get_row`, `crop` và `rotate_counter_clockwise` đều trả về view của cùng một bộ đệm,
+    nên nhiều binarizer và các lần thử lại có thể dùng chung dữ liệu mà không sao chép toàn khung hình.
+    Các view được đánh dấu chỉ đọc để không ai vô tình ghi đè ảnh gốc của người gọi.
+    """
+
+    def __init__(self, array, left=0, top=0, width=None, height=None):
+        """
+        Khởi tạo nguồn độ chói từ một mảng 2D.
+
+        :param array: Mảng 2D (height, width) kiểu uint8 hoặc đối tượng hỗ trợ buffer protocol có 2 chiều.
+            Mảng kiểu khác uint8 sẽ được chuyển đổi (có sao chép).
+        :param left: Tọa độ trái của vùng sử dụng.
+        :param top: Tọa độ trên của vùng sử dụng.
+        :param width: Chiều rộng vùng sử dụng, mặc định tới hết mảng.
+        :param height: Chiều cao vùng sử dụng, mặc định tới hết mảng.
+        """
+        array = np.asarray(array, dtype=np.uint8)
+        if array.ndim != 2:
+            raise ValueError("Mảng độ chói phải có 2 chiều")
+        if width is None:
+            width = array.shape[1] - left
+        if height is None:
+            height = array.shape[0] - top
+        if left < 0 or top < 0 or width < 1 or height < 1 or left + width > array.shape[1] or top + height > array.shape[0]:
+            raise ValueError("Vùng cắt phải nằm trong ảnh")
+
+        super().__init__(width, height)
+        self.image = array[top:top + height, left:left + width].view()
+        self.image.flags.writeable = False
+
+    @staticmethod
+    def from_buffer(buffer, width, height, row_stride=None):
+        """
+        Tạo nguồn độ chói trực tiếp trên một bộ đệm byte (bytes, bytearray, memoryview...) mà không sao chép.
+
+        :param buffer: Bộ đệm chứa các byte độ chói theo thứ tự dòng-chính.
+        :param width: Chiều rộng ảnh.
+        :param height: Chiều cao ảnh.
+        :param row_stride: Số byte giữa đầu hai dòng liên tiếp, mặc định bằng width.
+        """
+        if row_stride is None:
+            row_stride = width
+        flat = np.frombuffer(buffer, dtype=np.uint8)
+        if len(flat) < (height - 1) * row_stride + width:
+            raise ValueError("Bộ đệm nhỏ hơn kích thước ảnh")
+        plane = np.lib.stride_tricks.as_strided(flat, shape=(height, width), strides=(row_stride, 1), writeable=False)
+        return NdarrayLuminanceSource(plane)
+
+    def get_row(self, y, row=None):
+        """
+        Trả về view (chỉ đọc) của dòng y; tham số `row` được bỏ qua vì không cần cấp phát.
+        """
+        if y < 0 or y >= self.height:
+            raise ValueError(f"Requested row is outside the image: {y}")
+        return self.image[y]
+
+    def get_matrix(self):
+        """
+        Trả về dữ liệu độ chói dạng 1D theo thứ tự dòng-chính.
+        Đây là view nếu vùng ảnh liên tục trong bộ nhớ, ngược lại `ravel` sẽ phải sao chép;
+        nên dùng `get_matrix_2d` khi có thể.
+        """
+        return self.image.ravel()
+
+    def get_matrix_2d(self):
+        """
+        Trả về view 2D (height, width) của dữ liệu độ chói, không sao chép.
+        """
+        return self.image
+
+    def is_crop_supported(self):
+        return True
+
+    def crop(self, left, top, width, height):
+        """
+        Trả về nguồn độ chói mới là view của vùng đã cắt.
+        """
+        return NdarrayLuminanceSource(self.image, left, top, width, height)
+
+    def is_rotate_supported(self):
+        return True
+
+    def rotate_counter_clockwise(self):
+        """
+        Trả về nguồn độ chói mới là view `np.rot90` của ảnh (xoay 90 độ ngược chiều kim đồng hồ).
+        Chỉ hỗ trợ xoay 90 độ; xoay 45 độ vẫn dùng cài đặt mặc định của LuminanceSource.
+        """
+        return NdarrayLuminanceSource(np.rot90(self.image))
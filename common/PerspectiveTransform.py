@@ -1,93 +1,180 @@
-import sys 
+import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+import numpy as np
+
 
 class PerspectiveTransform:
+    """
+    Phép biến đổi phối cảnh (homography) giữa hai mặt phẳng, lưu dưới dạng ma trận 3x3 `matrix`:
+    [x', y', w] = matrix @ [x, y, 1] và điểm ảnh là (x' / w, y' / w).
+
+    Theo quy ước của ZXing, hệ số aIJ nằm ở matrix[J - 1, I - 1]: a11, a21, a31 là hàng đầu tiên.
+
+    Ngoài đối tượng đơn lẻ, các hàm tĩnh làm việc trên chồng ma trận (K, 3, 3) để dựng và áp dụng
+    K phép biến đổi ứng viên (ví dụ nhiều bộ ba finder pattern hoặc nhiều giả thuyết alignment pattern)
+    trong một lượt.
+    """
+
     def __init__(self, a11, a21, a31, a12, a22, a32, a13, a23, a33):
-        self.a11 = a11
-        self.a12 = a12
-        self.a13 = a13
-        self.a21 = a21
-        self.a22 = a22
-        self.a23 = a23
-        self.a31 = a31
-        self.a32 = a32
-        self.a33 = a33
+        self.matrix = np.array([[a11, a21, a31],
+                                [a12, a22, a32],
+                                [a13, a23, a33]], dtype=np.float64)
+
+    @staticmethod
+    def from_matrix(matrix):
+        """
+        Tạo PerspectiveTransform từ một ma trận 3x3 (ví dụ một phần tử của chồng ma trận).
+        """
+        transform = PerspectiveTransform.__new__(PerspectiveTransform)
+        transform.matrix = np.array(matrix, dtype=np.float64).reshape(3, 3)
+        return transform
+
+    def get_matrix(self):
+        return self.matrix
 
     @staticmethod
     def quadrilateral_to_quadrilateral(x0, y0, x1, y1, x2, y2, x3, y3, x0p, y0p, x1p, y1p, x2p, y2p, x3p, y3p):
-        q_to_s = PerspectiveTransform.quadrilateral_to_square(x0, y0, x1, y1, x2, y2, x3, y3)
-        s_to_q = PerspectiveTransform.square_to_quadrilateral(x0p, y0p, x1p, y1p, x2p, y2p, x3p, y3p)
-        return s_to_q.times(q_to_s)
+        sources = np.array([[[x0, y0], [x1, y1], [x2, y2], [x3, y3]]], dtype=np.float64)
+        targets = np.array([[[x0p, y0p], [x1p, y1p], [x2p, y2p], [x3p, y3p]]], dtype=np.float64)
+        return PerspectiveTransform.from_matrix(PerspectiveTransform.quadrilaterals_to_quadrilaterals(sources, targets)[0])
+
+    @staticmethod
+    def quadrilaterals_to_quadrilaterals(sources, targets):
+        """
+        Dựng K phép biến đổi, phép thứ k đưa tứ giác sources[k] về tứ giác targets[k].
+
+        Input:
+        - sources, targets: mảng (K, 4, 2) tọa độ bốn đỉnh của mỗi tứ giác.
+
+        Output:
+        - ndarray (K, 3, 3).
+        """
+        return PerspectiveTransform.squares_to_quadrilaterals(targets) @ PerspectiveTransform.quadrilaterals_to_squares(sources)
+
+    @staticmethod
+    def squares_to_quadrilaterals(quadrilaterals):
+        """
+        Dựng K phép biến đổi đưa hình vuông đơn vị (0, 0), (1, 0), (1, 1), (0, 1) về các tứ giác cho trước.
+
+        Input:
+        - quadrilaterals: mảng (K, 4, 2).
+
+        Output:
+        - ndarray (K, 3, 3). Với hình bình hành, phép biến đổi là affine (a13 = a23 = 0).
+        """
+        quadrilaterals = np.asarray(quadrilaterals, dtype=np.float64)
+        x0, x1, x2, x3 = np.moveaxis(quadrilaterals[..., 0], -1, 0)
+        y0, y1, y2, y3 = np.moveaxis(quadrilaterals[..., 1], -1, 0)
+        dx3 = x0 - x1 + x2 - x3
+        dy3 = y0 - y1 + y2 - y3
+        dx1 = x1 - x2
+        dx2 = x3 - x2
+        dy1 = y1 - y2
+        dy2 = y3 - y2
+        denominator = dx1 * dy2 - dx2 * dy1
+        affine = (dx3 == 0.0) & (dy3 == 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            a13 = np.where(affine, 0.0, (dx3 * dy2 - dx2 * dy3) / denominator)
+            a23 = np.where(affine, 0.0, (dx1 * dy3 - dx3 * dy1) / denominator)
+
+        matrices = np.empty(quadrilaterals.shape[:-2] + (3, 3), dtype=np.float64)
+        # Với hình bình hành x3 - x0 = x2 - x1, nên công thức chung cũng cho đúng trường hợp affine
+        matrices[..., 0, 0] = x1 - x0 + a13 * x1
+        matrices[..., 0, 1] = x3 - x0 + a23 * x3
+        matrices[..., 0, 2] = x0
+        matrices[..., 1, 0] = y1 - y0 + a13 * y1
+        matrices[..., 1, 1] = y3 - y0 + a23 * y3
+        matrices[..., 1, 2] = y0
+        matrices[..., 2, 0] = a13
+        matrices[..., 2, 1] = a23
+        matrices[..., 2, 2] = 1.0
+        return matrices
+
+    @staticmethod
+    def quadrilaterals_to_squares(quadrilaterals):
+        """
+        Phép biến đổi ngược của squares_to_quadrilaterals, (K, 4, 2) -> (K, 3, 3).
+        """
+        return PerspectiveTransform.adjugate(PerspectiveTransform.squares_to_quadrilaterals(quadrilaterals))
+
+    @staticmethod
+    def adjugate(matrices):
+        """
+        Ma trận phụ hợp của một chồng ma trận (..., 3, 3). Nó bằng det * nghịch đảo, nên biểu diễn cùng
+        phép biến đổi ngược (tọa độ thuần nhất) mà không cần phép chia.
+        """
+        rows = np.asarray(matrices, dtype=np.float64)
+        r0 = rows[..., 0, :]
+        r1 = rows[..., 1, :]
+        r2 = rows[..., 2, :]
+        return np.stack([np.cross(r1, r2), np.cross(r2, r0), np.cross(r0, r1)], axis=-1)
+
+    @staticmethod
+    def apply_stacked(matrices, points):
+        """
+        Áp dụng một hoặc nhiều phép biến đổi cho cùng một tập điểm.
+
+        Input:
+        - matrices: mảng (3, 3) hoặc (K, 3, 3).
+        - points: mảng (N, 2) các điểm (x, y).
+
+        Output:
+        - ndarray (N, 2) hoặc (K, N, 2). Điểm bị chiếu ra vô cực cho giá trị inf / nan.
+        """
+        matrices = np.asarray(matrices, dtype=np.float64)
+        points = np.asarray(points, dtype=np.float64)
+        # [x', y', w] = M @ [x, y, 1] cho mọi điểm: (.., N, 3)
+        homogeneous = points @ np.swapaxes(matrices[..., :, :2], -1, -2) + matrices[..., None, :, 2]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return homogeneous[..., :2] / homogeneous[..., 2:]
+
+    def apply(self, points):
+        """
+        Áp dụng phép biến đổi cho mảng điểm (N, 2), trả về mảng (N, 2) mới.
+        """
+        return PerspectiveTransform.apply_stacked(self.matrix, points)
+
+    def transform_arrays(self, x_values, y_values):
+        """
+        Áp dụng phép biến đổi cho các mảng tọa độ NumPy trong một lượt (x_values, y_values được broadcast với nhau).
+        Trả về (x, y) mới, không sửa đầu vào.
+        """
+        (a11, a21, a31), (a12, a22, a32), (a13, a23, a33) = self.matrix
+        denominator = a13 * x_values + a23 * y_values + a33
+        return ((a11 * x_values + a21 * y_values + a31) / denominator,
+                (a12 * x_values + a22 * y_values + a32) / denominator)
 
     def transform_points(self, points):
-        max_i = len(points) - 1  # points must have an even length
-        for i in range(0, max_i, 2):
-            x = points[i]
-            y = points[i + 1]
-            denominator = self.a13 * x + self.a23 * y + self.a33
-            points[i] = (self.a11 * x + self.a21 * y + self.a31) / denominator
-            points[i + 1] = (self.a12 * x + self.a22 * y + self.a32) / denominator
+        """
+        Biến đổi tại chỗ danh sách phẳng [x0, y0, x1, y1, ...].
+        """
+        count = len(points) // 2
+        transformed = self.apply(np.asarray(points[:2 * count], dtype=np.float64).reshape(count, 2))
+        points[:2 * count] = transformed.ravel().tolist()
 
     def transform_points_separate(self, x_values, y_values):
-        n = len(x_values)
-        for i in range(n):
-            x = x_values[i]
-            y = y_values[i]
-            denominator = self.a13 * x + self.a23 * y + self.a33
-            x_values[i] = (self.a11 * x + self.a21 * y + self.a31) / denominator
-            y_values[i] = (self.a12 * x + self.a22 * y + self.a32) / denominator
+        """
+        Biến đổi tại chỗ hai danh sách tọa độ x và y.
+        """
+        x, y = self.transform_arrays(np.asarray(x_values, dtype=np.float64), np.asarray(y_values, dtype=np.float64))
+        x_values[:] = x.tolist()
+        y_values[:] = y.tolist()
 
     @staticmethod
     def square_to_quadrilateral(x0, y0, x1, y1, x2, y2, x3, y3):
-        dx3 = x0 - x1 + x2 - x3
-        dy3 = y0 - y1 + y2 - y3
-        if dx3 == 0.0 and dy3 == 0.0:
-            return PerspectiveTransform(
-                x1 - x0, x2 - x1, x0,
-                y1 - y0, y2 - y1, y0,
-                0.0, 0.0, 1.0
-            )
-        else:
-            dx1 = x1 - x2
-            dx2 = x3 - x2
-            dy1 = y1 - y2
-            dy2 = y3 - y2
-            denominator = dx1 * dy2 - dx2 * dy1
-            a13 = (dx3 * dy2 - dx2 * dy3) / denominator
-            a23 = (dx1 * dy3 - dx3 * dy1) / denominator 
-            return PerspectiveTransform(
-                x1 - x0 + a13 * x1, x3 - x0 + a23 * x3, x0,
-                y1 - y0 + a13 * y1, y3 - y0 + a23 * y3, y0,
-                a13, a23, 1.0
-            )
+        quadrilateral = np.array([[x0, y0], [x1, y1], [x2, y2], [x3, y3]], dtype=np.float64)
+        return PerspectiveTransform.from_matrix(PerspectiveTransform.squares_to_quadrilaterals(quadrilateral))
 
     @staticmethod
     def quadrilateral_to_square(x0, y0, x1, y1, x2, y2, x3, y3):
         return PerspectiveTransform.square_to_quadrilateral(x0, y0, x1, y1, x2, y2, x3, y3).build_adjoint()
 
     def build_adjoint(self):
-        return PerspectiveTransform(
-            self.a22 * self.a33 - self.a23 * self.a32,
-            self.a23 * self.a31 - self.a21 * self.a33,
-            self.a21 * self.a32 - self.a22 * self.a31,
-            self.a13 * self.a32 - self.a12 * self.a33,
-            self.a11 * self.a33 - self.a13 * self.a31,
-            self.a12 * self.a31 - self.a11 * self.a32,
-            self.a12 * self.a23 - self.a13 * self.a22,
-            self.a13 * self.a21 - self.a11 * self.a23,
-            self.a11 * self.a22 - self.a12 * self.a21
-        )
+        return PerspectiveTransform.from_matrix(PerspectiveTransform.adjugate(self.matrix))
 
     def times(self, other):
-        return PerspectiveTransform(
-            self.a11 * other.a11 + self.a21 * other.a12 + self.a31 * other.a13,
-            self.a11 * other.a21 + self.a21 * other.a22 + self.a31 * other.a23,
-            self.a11 * other.a31 + self.a21 * other.a32 + self.a31 * other.a33,
-            self.a12 * other.a11 + self.a22 * other.a12 + self.a32 * other.a13,
-            self.a12 * other.a21 + self.a22 * other.a22 + self.a32 * other.a23,
-            self.a12 * other.a31 + self.a22 * other.a32 + self.a32 * other.a33,
-            self.a13 * other.a11 + self.a23 * other.a12 + self.a33 * other.a13,
-            self.a13 * other.a21 + self.a23 * other.a22 + self.a33 * other.a23,
-            self.a13 * other.a31 + self.a23 * other.a32 + self.a33 * other.a33
-        )
+        """
+        Ghép hai phép biến đổi: kết quả áp dụng `other` trước rồi tới `self`.
+        """
+        return PerspectiveTransform.from_matrix(self.matrix @ other.matrix)
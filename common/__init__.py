@@ -2,8 +2,12 @@ from .GridSampler import GridSampler
 from .DefaultGridSampler import DefaultGridSampler
 from .PerspectiveTransform import PerspectiveTransform
 from .LuminanceSource import LuminanceSource
+from .NdarrayLuminanceSource import NdarrayLuminanceSource
+from .LuminanceExtractor import LuminanceExtractor, IntegerLumaExtractor, SingleChannelExtractor, MinChannelExtractor, PyramidLuminanceExtractor
 from .CV2ImageLuminanceSource import CV2ImageLuminanceSource
+from .LuminancePyramid import LuminancePyramid
 from .HybridBinarizer import HybridBinarizer
+from .MeanThresholdBinarizer import MeanThresholdBinarizer
 from .GlobalHistogramBinarizer import GlobalHistogramBinarizer
 from .Binarizer import Binarizer
 from .InvertedLuminanceSource import InvertedLuminanceSource
\ No newline at end of file
@@ -0,0 +1,79 @@
+import sys 
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+
+
+class BitSource:
+    """
+    Đọc lần lượt các nhóm bit (tối đa 32 bit mỗi lần) từ một mảng byte, bit cao nhất của mỗi byte được đọc trước.
+    """
+
+    def __init__(self, data):
+        """
+        Input:
+        - data: bytes / bytearray / danh sách số nguyên 0-255, dữ liệu cần đọc.
+        """
+        self.bytes = data
+        self.byte_offset = 0
+        self.bit_offset = 0
+
+    def get_bit_offset(self):
+        """
+        Vị trí bit trong byte hiện tại (0-7).
+        """
+        return self.bit_offset
+
+    def get_byte_offset(self):
+        """
+        Chỉ số của byte hiện tại.
+        """
+        return self.byte_offset
+
+    def read_bits(self, num_bits):
+        """
+        Đọc `num_bits` bit tiếp theo và trả về dưới dạng số nguyên (bit đọc trước là bit cao).
+
+        Input:
+        - num_bits: int, số bit cần đọc, từ 1 tới 32 và không vượt quá available().
+
+        Output:
+        - int
+        """
+        if num_bits < 1 or num_bits > 32 or num_bits > self.available():
+            raise ValueError(f"Số bit cần đọc không hợp lệ: {num_bits}")
+
+        result = 0
+        # Phần còn lại của byte đang đọc dở
+        if self.bit_offset > 0:
+            bits_left = 8 - self.bit_offset
+            to_read = min(num_bits, bits_left)
+            bits_to_not_read = bits_left - to_read
+            mask = (0xFF >> (8 - to_read)) << bits_to_not_read
+            result = (self.bytes[self.byte_offset] & mask) >> bits_to_not_read
+            num_bits -= to_read
+            self.bit_offset += to_read
+            if self.bit_offset == 8:
+                self.bit_offset = 0
+                self.byte_offset += 1
+
+        if num_bits > 0:
+            # Các byte đầy đủ
+            while num_bits >= 8:
+                result = (result << 8) | (self.bytes[self.byte_offset] & 0xFF)
+                self.byte_offset += 1
+                num_bits -= 8
+
+            # Phần đầu của byte cuối
+            if num_bits > 0:
+                bits_to_not_read = 8 - num_bits
+                mask = (0xFF >> bits_to_not_read) << bits_to_not_read
+                result = (result << num_bits) | ((self.bytes[self.byte_offset] & mask) >> bits_to_not_read)
+                self.bit_offset += num_bits
+
+        return result
+
+    def available(self):
+        """
+        Số bit còn lại có thể đọc.
+        """
+        return 8 * (len(self.bytes) - self.byte_offset) - self.bit_offset
@@ -0,0 +1,112 @@
+import sys 
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+from typing import List, Optional
+
+
+class DataBlock:
+    """
+    Một khối dữ liệu của QR Code: các codeword dữ liệu cùng các codeword sửa lỗi của chúng.
+    Các khối được đan xen (interleave) khi đặt vào ký hiệu, nên cần tách lại trước khi sửa lỗi.
+    """
+
+    def __init__(self, num_data_codewords: int, codewords: List[int], erasures: Optional[List[int]] = None):
+        """
+        Input:
+        - num_data_codewords: int, số codeword dữ liệu của khối.
+        - codewords: danh sách số nguyên, toàn bộ codeword (dữ liệu rồi sửa lỗi) của khối.
+        - erasures: danh sách vị trí (trong khối) của các codeword có độ tin cậy thấp.
+        """
+        self.num_data_codewords = num_data_codewords
+        self.codewords = codewords
+        self.erasures = erasures if erasures is not None else []
+
+    @staticmethod
+    def get_codeword_placements(version, ec_level):
+        """
+        Tính vị trí của từng codeword đọc được trong các khối.
+
+        Input:
+        - version: Version của mã.
+        - ec_level: ErrorCorrectionLevel của mã.
+
+        Output:
+        - (block_lengths, num_data_codewords, placements):
+          + block_lengths: danh sách độ dài (tổng số codeword) của từng khối.
+          + num_data_codewords: danh sách số codeword dữ liệu của từng khối.
+          + placements: danh sách (khối, vị trí trong khối) cho codeword thứ k theo thứ tự đọc.
+
+        Công việc:
+        Các codeword dữ liệu được đan xen theo từng vị trí qua mọi khối; các khối dài hơn (xếp sau cùng)
+        có thêm một codeword dữ liệu ở cuối phần dữ liệu, sau đó là các codeword sửa lỗi, cũng đan xen.
+        Bố cục chỉ phụ thuộc (version, ec_level) nên được lưu trong cache của Version và dùng chung (dạng tuple).
+        """
+        return version.get_cached(("codeword_placements", ec_level),
+                                  lambda: DataBlock.build_codeword_placements(version, ec_level))
+
+    @staticmethod
+    def build_codeword_placements(version, ec_level):
+        """
+        Tính bố cục khối cho get_codeword_placements (không dùng cache).
+        """
+        ec_blocks = version.get_ec_blocks_for_level(ec_level)
+        ec_codewords = ec_blocks.get_ec_codewords_per_block()
+        num_data_codewords = []
+        for ec_block in ec_blocks.get_ec_blocks():
+            num_data_codewords.extend([ec_block.get_data_codewords()] * ec_block.get_count())
+        block_lengths = [count + ec_codewords for count in num_data_codewords]
+        num_blocks = len(block_lengths)
+
+        # Các khối ngắn đứng trước, các khối dài hơn một codeword đứng sau
+        shorter_length = block_lengths[0]
+        longer_blocks_start_at = num_blocks
+        while longer_blocks_start_at > 0 and block_lengths[longer_blocks_start_at - 1] != shorter_length:
+            longer_blocks_start_at -= 1
+        shorter_num_data_codewords = shorter_length - ec_codewords
+
+        placements = []
+        for i in range(shorter_num_data_codewords):
+            for j in range(num_blocks):
+                placements.append((j, i))
+        for j in range(longer_blocks_start_at, num_blocks):
+            placements.append((j, shorter_num_data_codewords))
+        for i in range(shorter_num_data_codewords, shorter_length):
+            for j in range(num_blocks):
+                placements.append((j, i if j < longer_blocks_start_at else i + 1))
+        return tuple(block_lengths), tuple(num_data_codewords), tuple(placements)
+
+    @staticmethod
+    def get_data_blocks(raw_codewords, version, ec_level, erasures: Optional[List[int]] = None) -> List['DataBlock']:
+        """
+        Tách các codeword đọc được từ ký hiệu thành các khối dữ liệu.
+
+        Input:
+        - raw_codewords: bytes / danh sách số nguyên, các codeword theo thứ tự đọc (BitMatrixParser.read_codewords).
+        - version: Version của mã.
+        - ec_level: ErrorCorrectionLevel của mã.
+        - erasures: chỉ số (theo thứ tự đọc) của các codeword có độ tin cậy thấp, tùy chọn.
+
+        Output:
+        - Danh sách DataBlock theo thứ tự khối.
+        """
+        if len(raw_codewords) != version.get_total_codewords():
+            raise ValueError("Số codeword không khớp với phiên bản")
+
+        block_lengths, num_data_codewords, placements = DataBlock.get_codeword_placements(version, ec_level)
+        blocks = [DataBlock(count, [0] * length) for count, length in zip(num_data_codewords, block_lengths)]
+        for codeword, (block, position) in zip(raw_codewords, placements):
+            blocks[block].codewords[position] = codeword
+        if erasures:
+            for index in erasures:
+                block, position = placements[index]
+                blocks[block].erasures.append(position)
+        return blocks
+
+    def get_num_data_codewords(self) -> int:
+        return self.num_data_codewords
+
+    def get_codewords(self) -> List[int]:
+        return self.codewords
+
+    def get_erasures(self) -> List[int]:
+        return self.erasures
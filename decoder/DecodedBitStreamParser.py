@@ -0,0 +1,249 @@
+import sys 
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+from enums import Mode, DecodeHintType
+from exceptions import FormatException
+from .BitSource import BitSource
+from .DecoderResult import DecoderResult
+
+
+class DecodedBitStreamParser:
+    """
+    Chuyển các byte dữ liệu (đã sửa lỗi) của QR Code thành văn bản, theo ISO 18004:2006, 6.4.3 - 6.4.7.
+
+    Luồng bit được đọc một lượt: mỗi đoạn gồm 4 bit chỉ thị chế độ, độ dài và dữ liệu, và được giải mã ngay
+    thành chuỗi (hỗ trợ numeric, alphanumeric, byte, kanji, hanzi, ECI, structured append và FNC1).
+    """
+
+    # Bảng ký tự của chế độ alphanumeric (ISO 18004:2006, 6.4.4, Bảng 5)
+    ALPHANUMERIC_CHARS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:"
+    GB2312_SUBSET = 1
+
+    # Giá trị ECI -> tên bảng mã của Python (tương ứng CharacterSetECI của ZXing)
+    CHARACTER_SET_ECI = {
+        0: "cp437", 1: "iso-8859-1", 2: "cp437", 3: "iso-8859-1",
+        4: "iso-8859-2", 5: "iso-8859-3", 6: "iso-8859-4", 7: "iso-8859-5",
+        8: "iso-8859-6", 9: "iso-8859-7", 10: "iso-8859-8", 11: "iso-8859-9",
+        12: "iso-8859-10", 13: "iso-8859-11", 15: "iso-8859-13", 16: "iso-8859-14",
+        17: "iso-8859-15", 18: "iso-8859-16", 20: "shift_jis", 21: "cp1250",
+        22: "cp1251", 23: "cp1252", 24: "cp1256", 25: "utf-16-be",
+        26: "utf-8", 27: "ascii", 28: "big5", 29: "gb18030", 30: "euc-kr", 170: "ascii",
+    }
+
+    # Bảng mã mặc định của chế độ byte khi không có ECI và dữ liệu không phải UTF-8 hợp lệ
+    DEFAULT_BYTE_MODE_ENCODING = "iso-8859-1"
+
+    @staticmethod
+    def decode(data, version, ec_level, hints=None) -> DecoderResult:
+        """
+        Giải mã các byte dữ liệu của một ký hiệu.
+
+        Input:
+        - data: bytes / danh sách số nguyên, các codeword dữ liệu đã sửa lỗi, theo thứ tự khối.
+        - version: Version của mã (quyết định số bit độ dài của mỗi chế độ).
+        - ec_level: ErrorCorrectionLevel của mã.
+        - hints: từ điển gợi ý giải mã; DecodeHintType.CHARACTER_SET chọn bảng mã mặc định cho chế độ byte.
+
+        Output:
+        - DecoderResult chứa văn bản, các đoạn byte thô và thông tin structured append.
+
+        Ném FormatException nếu luồng bit không hợp lệ.
+        """
+        bits = BitSource(data)
+        result = []
+        byte_segments = []
+        symbol_sequence = -1
+        parity_data = -1
+        current_encoding = None
+        fc1_in_effect = False
+        has_fnc1_first = False
+        has_fnc1_second = False
+        default_encoding = None
+        if hints and DecodeHintType.CHARACTER_SET in hints:
+            default_encoding = hints[DecodeHintType.CHARACTER_SET]
+
+        try:
+            while True:
+                if bits.available() < 4:
+                    # Dữ liệu kết thúc mà không có TERMINATOR, vẫn coi là hợp lệ
+                    mode = Mode.TERMINATOR
+                else:
+                    mode = Mode.for_bits(bits.read_bits(4))
+
+                if mode == Mode.TERMINATOR:
+                    break
+                elif mode == Mode.FNC1_FIRST_POSITION:
+                    has_fnc1_first = True
+                    fc1_in_effect = True
+                elif mode == Mode.FNC1_SECOND_POSITION:
+                    has_fnc1_second = True
+                    fc1_in_effect = True
+                elif mode == Mode.STRUCTURED_APPEND:
+                    if bits.available() < 16:
+                        raise FormatException.get_format_instance()
+                    symbol_sequence = bits.read_bits(8)
+                    parity_data = bits.read_bits(8)
+                elif mode == Mode.ECI:
+                    value = DecodedBitStreamParser.parse_eci_value(bits)
+                    current_encoding = DecodedBitStreamParser.CHARACTER_SET_ECI.get(value)
+                    if current_encoding is None:
+                        raise FormatException.get_format_instance()
+                elif mode == Mode.HANZI:
+                    subset = bits.read_bits(4)
+                    count = bits.read_bits(mode.get_character_count_bits(version))
+                    if subset == DecodedBitStreamParser.GB2312_SUBSET:
+                        result.append(DecodedBitStreamParser.decode_hanzi_segment(bits, count))
+                else:
+                    count = bits.read_bits(mode.get_character_count_bits(version))
+                    if mode == Mode.NUMERIC:
+                        result.append(DecodedBitStreamParser.decode_numeric_segment(bits, count))
+                    elif mode == Mode.ALPHANUMERIC:
+                        result.append(DecodedBitStreamParser.decode_alphanumeric_segment(bits, count, fc1_in_effect))
+                    elif mode == Mode.BYTE:
+                        segment = DecodedBitStreamParser.read_byte_segment(bits, count)
+                        byte_segments.append(segment)
+                        encoding = current_encoding or default_encoding or DecodedBitStreamParser.guess_encoding(segment)
+                        result.append(segment.decode(encoding, errors="replace"))
+                    elif mode == Mode.KANJI:
+                        result.append(DecodedBitStreamParser.decode_kanji_segment(bits, count))
+                    else:
+                        raise FormatException.get_format_instance()
+        except ValueError:
+            # Chỉ thị chế độ không hợp lệ hoặc đọc quá cuối luồng bit
+            raise FormatException.get_format_instance()
+
+        if current_encoding is not None:
+            symbology_modifier = 4 if has_fnc1_first else 6 if has_fnc1_second else 2
+        else:
+            symbology_modifier = 3 if has_fnc1_first else 5 if has_fnc1_second else 1
+
+        return DecoderResult(bytes(data), "".join(result), byte_segments if byte_segments else None,
+                             None if ec_level is None else ec_level.name,
+                             symbol_sequence, parity_data, symbology_modifier)
+
+    @staticmethod
+    def decode_numeric_segment(bits: BitSource, count: int) -> str:
+        """
+        Chế độ numeric: mỗi nhóm 3 chữ số dùng 10 bit, 2 chữ số cuối dùng 7 bit, 1 chữ số cuối dùng 4 bit.
+        """
+        digits = []
+        while count >= 3:
+            if bits.available() < 10:
+                raise FormatException.get_format_instance()
+            three_digits = bits.read_bits(10)
+            if three_digits >= 1000:
+                raise FormatException.get_format_instance()
+            digits.append(f"{three_digits:03d}")
+            count -= 3
+        if count == 2:
+            if bits.available() < 7:
+                raise FormatException.get_format_instance()
+            two_digits = bits.read_bits(7)
+            if two_digits >= 100:
+                raise FormatException.get_format_instance()
+            digits.append(f"{two_digits:02d}")
+        elif count == 1:
+            if bits.available() < 4:
+                raise FormatException.get_format_instance()
+            digit = bits.read_bits(4)
+            if digit >= 10:
+                raise FormatException.get_format_instance()
+            digits.append(str(digit))
+        return "".join(digits)
+
+    @staticmethod
+    def decode_alphanumeric_segment(bits: BitSource, count: int, fc1_in_effect: bool) -> str:
+        """
+        Chế độ alphanumeric: mỗi cặp ký tự dùng 11 bit (45 * a + b), ký tự lẻ cuối dùng 6 bit.
+        Khi FNC1 có hiệu lực, "%" là ký tự phân cách GS (0x1D) và "%%" là một ký tự "%".
+        """
+        chars = DecodedBitStreamParser.ALPHANUMERIC_CHARS
+        segment = []
+        while count > 1:
+            if bits.available() < 11:
+                raise FormatException.get_format_instance()
+            next_two = bits.read_bits(11)
+            segment.append(DecodedBitStreamParser.to_alphanumeric_char(next_two // 45))
+            segment.append(DecodedBitStreamParser.to_alphanumeric_char(next_two % 45))
+            count -= 2
+        if count == 1:
+            if bits.available() < 6:
+                raise FormatException.get_format_instance()
+            segment.append(DecodedBitStreamParser.to_alphanumeric_char(bits.read_bits(6)))
+        text = "".join(segment)
+        if fc1_in_effect:
+            text = "%".join(part.replace("%", "\x1d") for part in text.split("%%"))
+        return text
+
+    @staticmethod
+    def to_alphanumeric_char(value: int) -> str:
+        if value >= len(DecodedBitStreamParser.ALPHANUMERIC_CHARS):
+            raise FormatException.get_format_instance()
+        return DecodedBitStreamParser.ALPHANUMERIC_CHARS[value]
+
+    @staticmethod
+    def read_byte_segment(bits: BitSource, count: int) -> bytes:
+        """
+        Chế độ byte: `count` byte 8 bit liên tiếp.
+        """
+        if 8 * count > bits.available():
+            raise FormatException.get_format_instance()
+        return bytes(bits.read_bits(8) for _ in range(count))
+
+    @staticmethod
+    def guess_encoding(segment: bytes) -> str:
+        """
+        Đoán bảng mã của một đoạn byte không có ECI: UTF-8 nếu hợp lệ (bao gồm ASCII), ngược lại ISO-8859-1
+        (bảng mã mặc định theo tiêu chuẩn).
+        """
+        try:
+            segment.decode("utf-8")
+            return "utf-8"
+        except UnicodeDecodeError:
+            return DecodedBitStreamParser.DEFAULT_BYTE_MODE_ENCODING
+
+    @staticmethod
+    def decode_kanji_segment(bits: BitSource, count: int) -> str:
+        """
+        Chế độ kanji: mỗi ký tự Shift_JIS 2 byte được nén thành 13 bit.
+        """
+        if count * 13 > bits.available():
+            raise FormatException.get_format_instance()
+        buffer = bytearray()
+        for _ in range(count):
+            two_bytes = bits.read_bits(13)
+            assembled = ((two_bytes // 0x0C0) << 8) | (two_bytes % 0x0C0)
+            assembled += 0x08140 if assembled < 0x01F00 else 0x0C140
+            buffer.append((assembled >> 8) & 0xFF)
+            buffer.append(assembled & 0xFF)
+        return buffer.decode("shift_jis", errors="replace")
+
+    @staticmethod
+    def decode_hanzi_segment(bits: BitSource, count: int) -> str:
+        """
+        Chế độ hanzi (GB2312): mỗi ký tự 2 byte được nén thành 13 bit.
+        """
+        if count * 13 > bits.available():
+            raise FormatException.get_format_instance()
+        buffer = bytearray()
+        for _ in range(count):
+            two_bytes = bits.read_bits(13)
+            assembled = ((two_bytes // 0x060) << 8) | (two_bytes % 0x060)
+            assembled += 0x0A1A1 if assembled < 0x00A00 else 0x0A6A1
+            buffer.append((assembled >> 8) & 0xFF)
+            buffer.append(assembled & 0xFF)
+        return buffer.decode("gb2312", errors="replace")
+
+    @staticmethod
+    def parse_eci_value(bits: BitSource) -> int:
+        """
+        Đọc giá trị ECI được mã hóa bằng 1, 2 hoặc 3 byte (ISO 18004:2006, 6.4.2.1).
+        """
+        first_byte = bits.read_bits(8)
+        if (first_byte & 0x80) == 0:
+            return first_byte & 0x7F
+        if (first_byte & 0xC0) == 0x80:
+            return ((first_byte & 0x3F) << 8) | bits.read_bits(8)
+        if (first_byte & 0xE0) == 0xC0:
+            return ((first_byte & 0x1F) << 16) | bits.read_bits(16)
+        raise FormatException.get_format_instance()
@@ -2,88 +2,49 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
 
-from typing import List, Optional, Dict, Any
+from typing import List
 from .GenericGF import GenericGF
 from qrcode import BitMatrix
-from .ReedSolomonDecoder import ReedSolomonDecoder
-from enums import ErrorCorrectionLevel, DecodeHintType
+from .ReedSolomonDecoder import ReedSolomonDecoder, ReedSolomonException
 from .DecoderResult import DecoderResult
-from qrcode import QRCodeDecoderMetaData, BitMatrixParser
+from .DataBlock import DataBlock
+from .DecodedBitStreamParser import DecodedBitStreamParser
+from exceptions import ChecksumException, FormatException
+from qrcode.QRCodeDecoderMetaData import QRCodeDecoderMetaData
+from qrcode import BitMatrixParser
 import qrcode
-class ChecksumException(Exception):
-    pass
 
-class FormatException(Exception):
-    pass
-
-
-
-
-
-    def remask(self):
-        # Placeholder for remasking logic
-        pass
-
-    def set_mirror(self, mirror: bool):
-        self.mirrored = mirror
-
-    def read_version(self):
-        # Placeholder for reading version
-        pass
-
-    def read_format_information(self):
-        return ErrorCorrectionLevel("L")  # Placeholder
-
-    def mirror(self):
-        # Placeholder for mirroring logic
-        pass
-
-    def read_codewords(self) -> List[int]:
-        return [0] * 100  # Placeholder
-
-
-class DataBlock:
-    @staticmethod
-    def get_data_blocks(codewords: List[int], version, ec_level) -> List['DataBlock']:
-        # Simulate dividing codewords into blocks
-        return [DataBlock(codewords, len(codewords))]
-
-    def __init__(self, codewords: List[int], num_data_codewords: int):
-        self.codewords = codewords
-        self.num_data_codewords = num_data_codewords
-
-    def get_codewords(self) -> List[int]:
-        return self.codewords
-
-    def get_num_data_codewords(self) -> int:
-        return self.num_data_codewords
-
-class DecodedBitStreamParser:
-    @staticmethod
-    def decode(bytes_data: List[int], version, ec_level, hints):
-        # Simulate decoding
-        return DecoderResult("Decoded Text")
 
 class Decoder:
+    # Codeword có module với độ tin cậy lấy mẫu nhỏ hơn ngưỡng này được đưa vào bộ giải mã RS như vị trí xóa
+    ERASURE_CONFIDENCE = 0.5
+
     def __init__(self):
-        from qrcode.BitMatrixParser import BitMatrixParser
-        self.rs_decoder = ReedSolomonDecoder(GenericGF.QR_CODE_FIELD_256)
+        self.rs_decoder = ReedSolomonDecoder(GenericGF.QR_CODE_FIELD_256, ReedSolomonDecoder.BERLEKAMP_MASSEY)
 
-    def decode(self, image: List[List[bool]], hints) -> DecoderResult:
+    def decode(self, image: List[List[bool]], hints=None) -> DecoderResult:
         bit_matrix = BitMatrix.parse(image)
         return self._decode(bit_matrix, hints)
 
-    def _decode(self, bits: BitMatrix, hints) -> DecoderResult:
-        parser = qrcode.BitMatrixParser(bits)
+    def decode_bit_matrix(self, bits: BitMatrix, hints=None, confidence=None) -> DecoderResult:
+        """
+        Giải mã một BitMatrix đã lấy mẫu. `confidence` (tùy chọn) là độ tin cậy của từng module
+        (DetectorResult.get_confidence()); các codeword có độ tin cậy thấp được giải mã như vị trí xóa.
+        """
+        return self._decode(bits, hints, confidence)
+
+    def _decode(self, bits: BitMatrix, hints, confidence=None) -> DecoderResult:
+        parser = qrcode.BitMatrixParser(bits, confidence)
         try:
             return self._decode_with_parser(parser, hints)
         except (FormatException, ChecksumException) as e1:
+            # Thử lại với ma trận lật gương (mã được in hoặc chụp ngược)
             try:
-                parser.remask()
+                # Ma trận không bị sửa khi đọc nên không cần khôi phục hay chuyển vị:
+                # parser chỉ đọc lại format / version và codeword theo tọa độ chuyển vị
                 parser.set_mirror(True)
                 parser.read_version()
                 parser.read_format_information()
-                parser.mirror()
                 result = self._decode_with_parser(parser, hints)
                 result.set_other(QRCodeDecoderMetaData(True))
                 return result
@@ -92,31 +53,52 @@ class Decoder:
 
     def _decode_with_parser(self, parser: BitMatrixParser, hints) -> DecoderResult:
         version = parser.read_version()
-        ec_level = parser.read_format_information()
+        ec_level = parser.read_format_information().get_error_correction_level()
         codewords = parser.read_codewords()
-        data_blocks = DataBlock.get_data_blocks(codewords, version, ec_level)
+        erasures = parser.get_low_confidence_codewords(Decoder.ERASURE_CONFIDENCE)
+        data_blocks = DataBlock.get_data_blocks(codewords, version, ec_level, erasures)
 
+        errors_corrected, erasures_used = self._correct_blocks(data_blocks)
         result_bytes = []
-        errors_corrected = 0
-
         for data_block in data_blocks:
-            codeword_bytes = data_block.get_codewords()
-            num_data_codewords = data_block.get_num_data_codewords()
-            errors_corrected += self._correct_errors(codeword_bytes, num_data_codewords)
-            result_bytes.extend(codeword_bytes[:num_data_codewords])
+            result_bytes.extend(data_block.get_codewords()[:data_block.get_num_data_codewords()])
 
         result = DecodedBitStreamParser.decode(result_bytes, version, ec_level, hints)
         result.set_errors_corrected(errors_corrected)
+        result.set_erasures(erasures_used)
         return result
 
-    def _correct_errors(self, codeword_bytes: List[int], num_data_codewords: int) -> int:
-        codewords_ints = [byte & 0xFF for byte in codeword_bytes]
-        try:
-            errors_corrected = self.rs_decoder.decode_with_ec_count(codewords_ints, len(codeword_bytes) - num_data_codewords)
-        except Exception:
-            raise ChecksumException("Error correction failed")
-
-        for i in range(num_data_codewords):
-            codeword_bytes[i] = codewords_ints[i] & 0xFF
-
-        return errors_corrected
+    def _correct_blocks(self, data_blocks: List[DataBlock]):
+        """
+        Sửa lỗi cho mọi khối của ký hiệu: hội chứng của tất cả các khối được tính trong một lượt,
+        chỉ các khối có lỗi mới chạy bước tìm và sửa lỗi. Các khối được sửa tại chỗ.
+
+        Các codeword có độ tin cậy thấp của mỗi khối được dùng làm vị trí xóa (bỏ qua nếu nhiều hơn số mã sửa lỗi);
+        nếu giải mã với vị trí xóa thất bại, thử lại chỉ sửa lỗi vì một vị trí xóa sai vẫn tốn dung lượng sửa lỗi.
+        Trả về (số codeword đã sửa, số vị trí xóa đã dùng).
+        """
+        # Trong một ký hiệu QR mọi khối có cùng số mã sửa lỗi
+        two_s = len(data_blocks[0].get_codewords()) - data_blocks[0].get_num_data_codewords()
+        erasures = [data_block.get_erasures() if len(data_block.get_erasures()) <= two_s else []
+                    for data_block in data_blocks]
+        erasures_used = sum(len(block_erasures) for block_erasures in erasures)
+
+        blocks = None
+        errors_corrected = None
+        for attempt_erasures in ([erasures, None] if erasures_used else [None]):
+            blocks = [[byte & 0xFF for byte in data_block.get_codewords()] for data_block in data_blocks]
+            try:
+                errors_corrected = self.rs_decoder.decode_blocks(blocks, two_s, attempt_erasures)
+                if attempt_erasures is None:
+                    erasures_used = 0
+                break
+            except ReedSolomonException:
+                continue
+        if errors_corrected is None:
+            raise ChecksumException.get_checksum_instance()
+
+        for data_block, block in zip(data_blocks, blocks):
+            codeword_bytes = data_block.get_codewords()
+            for i in range(data_block.get_num_data_codewords()):
+                codeword_bytes[i] = block[i]
+        return sum(errors_corrected), erasures_used
@@ -1,6 +1,7 @@
 import sys 
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+import numpy as np
 from enums import ErrorCorrectionLevel
 
 class FormatInformation:
@@ -41,6 +42,15 @@ class FormatInformation:
         [0x2BED, 0x1F],
     ]
 
+    # Khoảng cách Hamming tối đa để coi một giá trị 15 bit đọc được là khớp với một mã trong bảng
+    MAX_CORRECTABLE_BITS = 3
+
+    # Bảng tra trực tiếp cho mọi giá trị 15 bit (32768 phần tử), được dựng ở cuối module bằng build_decode_table:
+    # BEST_FORMAT_INFO[v] là vị trí trong FORMAT_INFO_DECODE_LOOKUP của mã gần v nhất (vị trí nhỏ nhất nếu hòa),
+    # BEST_DIFFERENCE[v] là khoảng cách Hamming tương ứng
+    BEST_FORMAT_INFO = None
+    BEST_DIFFERENCE = None
+
     def __init__(self, format_info):
         """
         Hàm khởi tạo đối tượng FormatInformation với mã format_info.
@@ -68,6 +78,38 @@ class FormatInformation:
         """
         return bin(a ^ b).count('1')
 
+    @staticmethod
+    def build_decode_table():
+        """
+        Dựng bảng tra cho mọi giá trị 15 bit bằng một phép XOR vector hóa (32768 x 32)
+        và bảng đếm bit của mọi giá trị 15 bit.
+
+        Output:
+            (list, list): BEST_FORMAT_INFO và BEST_DIFFERENCE, dạng list để tra từng phần tử nhanh.
+        """
+        targets = np.array([decode_info[0] for decode_info in FormatInformation.FORMAT_INFO_DECODE_LOOKUP],
+                           dtype=np.uint16)
+        values = np.arange(1 << 15, dtype=np.uint16)
+        value_bytes = values.astype(">u2").view(np.uint8).reshape(-1, 2)
+        bit_counts = np.unpackbits(value_bytes, axis=1).sum(axis=1, dtype=np.uint8)
+        differences = bit_counts[values[:, None] ^ targets[None, :]]
+        best = differences.argmin(axis=1)
+        return best.tolist(), differences[values, best].tolist()
+
+    @staticmethod
+    def lookup(masked_format_info):
+        """
+        Tra mã gần nhất với một giá trị thông tin định dạng 15 bit.
+
+        Input:
+            masked_format_info (int): Giá trị 15 bit đọc được.
+        Output:
+            (int, int): (vị trí mã gần nhất trong FORMAT_INFO_DECODE_LOOKUP, số bit khác nhau).
+        """
+        masked_format_info &= 0x7FFF
+        return (FormatInformation.BEST_FORMAT_INFO[masked_format_info],
+                FormatInformation.BEST_DIFFERENCE[masked_format_info])
+
     @staticmethod
     def decode_format_information(masked_format_info1, masked_format_info2):
         """
@@ -99,23 +141,15 @@ class FormatInformation:
             FormatInformation hoặc None: Trả về đối tượng FormatInformation nếu tìm thấy sự tương đồng
             trong bảng mã, ngược lại trả về None.
         """
-        best_difference = float('inf')
-        best_format_info = 0
-        for decode_info in FormatInformation.FORMAT_INFO_DECODE_LOOKUP:
-            target_info = decode_info[0]
-            if target_info == masked_format_info1 or target_info == masked_format_info2:
-                return FormatInformation(decode_info[1])
-            bits_difference = FormatInformation.num_bits_differring(masked_format_info1, target_info)
-            if bits_difference < best_difference:
-                best_format_info = decode_info[1]
-                best_difference = bits_difference
-            if masked_format_info1 != masked_format_info2:
-                bits_difference = FormatInformation.num_bits_differring(masked_format_info2, target_info)
-                if bits_difference < best_difference:
-                    best_format_info = decode_info[1]
-                    best_difference = bits_difference
-        if best_difference <= 3:
-            return FormatInformation(best_format_info)
+        # Hai lần tra bảng thay cho việc so sánh với cả 32 mã; khi hòa, mã đứng trước trong bảng được chọn
+        # và bản sao thứ nhất được ưu tiên, giống thứ tự duyệt của cách so sánh tuần tự
+        best_index, best_difference = FormatInformation.lookup(masked_format_info1)
+        if masked_format_info2 != masked_format_info1:
+            index2, difference2 = FormatInformation.lookup(masked_format_info2)
+            if difference2 < best_difference or (difference2 == best_difference and index2 < best_index):
+                best_index, best_difference = index2, difference2
+        if best_difference <= FormatInformation.MAX_CORRECTABLE_BITS:
+            return FormatInformation(FormatInformation.FORMAT_INFO_DECODE_LOOKUP[best_index][1])
         return None
 
     def get_error_correction_level(self):
@@ -157,3 +191,6 @@ class FormatInformation:
             int: Giá trị hash của đối tượng FormatInformation.
         """
         return (self.errorCorrectionLevel << 3) | self.dataMask
+
+
+FormatInformation.BEST_FORMAT_INFO, FormatInformation.BEST_DIFFERENCE = FormatInformation.build_decode_table()
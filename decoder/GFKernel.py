@@ -0,0 +1,129 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+import numpy as np
+
+
+class GFKernel:
+    """
+    Các phép toán vector hóa trên phần tử và đa thức của một trường Galois (GenericGF).
+
+    Phần tử được lưu trong mảng NumPy uint8 (uint16 với trường lớn hơn 256 phần tử), mọi phép nhân là tra bảng:
+    a * b = exp[log(a) + log(b)]. Bảng exp được nhân đôi (exp_table[i] = alpha^(i mod (size - 1)), độ dài 2 * size)
+    nên tổng hai logarit tra trực tiếp, không cần phép modulo. Phần tử 0 không có logarit, các kết quả có thừa số 0
+    được che thành 0 sau khi tra bảng.
+
+    Mỗi trường có một kernel dùng chung (GenericGF.get_kernel), được ReedSolomonDecoder, GenericGFPoly và bộ mã hóa
+    sử dụng. Các đa thức là mảng hệ số; trừ khi ghi rõ, thứ tự hệ số (bậc cao hay bậc thấp đứng đầu) được giữ nguyên
+    từ đầu vào tới đầu ra.
+    """
+
+    def __init__(self, field):
+        """
+        Input:
+        - field: GenericGF, trường cần tạo kernel.
+        """
+        self.field = field
+        self.size = field.get_size()
+        self.order = self.size - 1
+        self.dtype = np.uint8 if self.size <= 256 else np.uint16
+        # exp_table được kéo dài tới 2 * size phần tử (exp_table[i] = alpha^(i mod (size - 1))) để log(a) + log(b)
+        # tra trực tiếp; log_table[0] không có nghĩa (đặt bằng 0), nơi dùng phải tự che các phần tử bằng 0
+        self.exp_table = np.array(field.expTable[:self.order] * 2 + field.expTable[:2], dtype=self.dtype)
+        self.log_table = np.array(field.logTable, dtype=np.intp)
+
+    def as_elements(self, values):
+        """
+        Chuyển `values` (số nguyên, danh sách hoặc mảng) thành mảng phần tử của trường.
+        """
+        return np.asarray(values, dtype=self.dtype)
+
+    def multiply(self, a, b):
+        """
+        Nhân từng phần tử (theo quy tắc broadcast của NumPy) hai mảng phần tử.
+
+        Output:
+        - Mảng phần tử cùng kích thước với kết quả broadcast.
+        """
+        a = self.as_elements(a)
+        b = self.as_elements(b)
+        product = self.exp_table[self.log_table[a] + self.log_table[b]]
+        return np.where((a == 0) | (b == 0), self.dtype(0), product)
+
+    def divide(self, a, b):
+        """
+        Chia từng phần tử a / b. Ném ArithmeticError nếu có phần tử b bằng 0.
+        """
+        a = self.as_elements(a)
+        b = self.as_elements(b)
+        if not np.all(b):
+            raise ArithmeticError("Không thể chia cho 0.")
+        quotient = self.exp_table[self.log_table[a] - self.log_table[b] + self.order]
+        return np.where(a == 0, self.dtype(0), quotient)
+
+    def scale(self, coefficients, scalar):
+        """
+        Nhân mọi hệ số của một đa thức với cùng một phần tử `scalar`.
+        """
+        coefficients = self.as_elements(coefficients)
+        if scalar == 0:
+            return np.zeros_like(coefficients)
+        product = self.exp_table[self.log_table[coefficients] + self.log_table[scalar]]
+        return np.where(coefficients == 0, self.dtype(0), product)
+
+    def poly_multiply(self, a, b):
+        """
+        Nhân hai đa thức (cùng thứ tự hệ số).
+
+        Công việc:
+        - Mọi tích a_i * b_j được tính trong một lần tra bảng trên ma trận (len(a), len(b)).
+        - Các tích có cùng bậc i + j được cộng (XOR) bằng cách dồn từng hàng của ma trận vào kết quả,
+          mỗi hàng là một phép XOR vector; số hàng là độ dài của đa thức ngắn hơn.
+
+        Output:
+        - Mảng len(a) + len(b) - 1 hệ số.
+        """
+        a = self.as_elements(a)
+        b = self.as_elements(b)
+        if len(a) > len(b):
+            a, b = b, a
+        product = np.zeros(len(a) + len(b) - 1, dtype=self.dtype)
+        if len(a) == 0:
+            return product
+        terms = self.multiply(a[:, None], b[None, :])
+        for i in np.flatnonzero(a):
+            product[i:i + len(b)] ^= terms[i]
+        return product
+
+    def evaluate_many(self, coefficients, points):
+        """
+        Tính giá trị một đa thức (hệ số bậc cao nhất đứng đầu, giống GenericGFPoly) tại nhiều điểm.
+
+        Công việc:
+        - Với mọi hệ số c_d khác 0 và mọi điểm x khác 0: c_d * x^d = exp[log(c_d) + (d * log(x) mod (size - 1))],
+          tính trong một lượt trên ma trận (số hệ số khác 0, số điểm) rồi cộng (XOR) theo cột.
+        - Tại x = 0, giá trị là hệ số tự do.
+
+        Output:
+        - Mảng phần tử cùng kích thước với `points`.
+        """
+        coefficients = self.as_elements(coefficients)
+        points = self.as_elements(points)
+        nonzero = np.flatnonzero(coefficients)
+        if len(nonzero) == 0:
+            return np.zeros(points.shape, dtype=self.dtype)
+        degrees = len(coefficients) - 1 - nonzero
+        flat_points = points.ravel()
+        power_logs = np.outer(degrees, self.log_table[flat_points]) % self.order
+        terms = self.exp_table[self.log_table[coefficients[nonzero]][:, None] + power_logs]
+        result = np.bitwise_xor.reduce(terms, axis=0)
+        result[flat_points == 0] = coefficients[-1]
+        return result.reshape(points.shape)
+
+    def evaluate_at_powers(self, coefficients, exponents):
+        """
+        Tính giá trị một đa thức (hệ số bậc cao nhất đứng đầu) tại các điểm alpha^e với e trong `exponents`
+        (số nguyên bất kỳ, có thể âm).
+        """
+        exponents = np.mod(np.asarray(exponents, dtype=np.int64), self.order)
+        return self.evaluate_many(coefficients, self.exp_table[exponents])
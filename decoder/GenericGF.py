@@ -2,6 +2,7 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
 from .GenericGFPoly import GenericGFPoly
+from .GFKernel import GFKernel
 
 class GenericGF:
     AZTEC_DATA_12 = None  # Được định nghĩa sau
@@ -39,9 +40,21 @@ class GenericGF:
                 x &= size - 1
         for i in range(size - 1):
             self.logTable[self.expTable[i]] = i
+
+        # Kernel vector hóa dùng chung cho mọi nơi làm việc với trường này; nó giữ bản NumPy duy nhất
+        # của hai bảng trên (xem GFKernel)
+        self.kernel = GFKernel(self)
         self.zero = GenericGFPoly(self, [0])
         self.one = GenericGFPoly(self, [1])
 
+    def get_kernel(self):
+        """Trả về kernel số học vector hóa (GFKernel) dùng chung của trường.
+
+        Input: Không có.
+        Output: Đối tượng GFKernel.
+        """
+        return self.kernel
+
     def get_zero(self):
         """Trả về đa thức zero (0).
         
@@ -168,3 +181,13 @@ class GenericGF:
         Output: Chuỗi mô tả trường Galois.
         """
         return f"GF(0x{self.primitive:x},{self.size})"
+
+
+GenericGF.AZTEC_DATA_12 = GenericGF(0x1069, 4096, 1)  # x^12 + x^6 + x^5 + x^3 + 1
+GenericGF.AZTEC_DATA_10 = GenericGF(0x409, 1024, 1)  # x^10 + x^3 + 1
+GenericGF.AZTEC_DATA_6 = GenericGF(0x43, 64, 1)  # x^6 + x + 1
+GenericGF.AZTEC_PARAM = GenericGF(0x13, 16, 1)  # x^4 + x + 1
+GenericGF.QR_CODE_FIELD_256 = GenericGF(0x011D, 256, 0)  # x^8 + x^4 + x^3 + x^2 + 1
+GenericGF.DATA_MATRIX_FIELD_256 = GenericGF(0x012D, 256, 1)  # x^8 + x^5 + x^3 + x^2 + 1
+GenericGF.AZTEC_DATA_8 = GenericGF.DATA_MATRIX_FIELD_256
+GenericGF.MAXICODE_FIELD_64 = GenericGF.AZTEC_DATA_6
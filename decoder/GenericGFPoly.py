@@ -76,7 +76,11 @@ class GenericGFPoly:
         if a == 0:
             return self.get_coefficient(0)
         if a == 1:
-            return sum(self.field.add_or_subtract(c, 0) for c in self.coefficients)
+            # Tổng các hệ số trong GF(2^m) là phép XOR
+            result = 0
+            for coeff in self.coefficients:
+                result = self.field.add_or_subtract(result, coeff)
+            return result
 
         result = self.coefficients[0]
         for coeff in self.coefficients[1:]:
@@ -129,17 +133,8 @@ class GenericGFPoly:
         if self.is_zero() or other.is_zero():
             return self.field.get_zero()
 
-        a_coeffs = self.coefficients
-        b_coeffs = other.coefficients
-        product = [0] * (len(a_coeffs) + len(b_coeffs) - 1)
-
-        for i, a in enumerate(a_coeffs):
-            for j, b in enumerate(b_coeffs):
-                product[i + j] = self.field.add_or_subtract(
-                    product[i + j], self.field.multiply(a, b)
-                )
-
-        return GenericGFPoly(self.field, product)
+        product = self.field.get_kernel().poly_multiply(self.coefficients, other.coefficients)
+        return GenericGFPoly(self.field, product.tolist())
 
     def multiply_by_monomial(self, degree, coefficient):
         """
@@ -157,10 +152,7 @@ class GenericGFPoly:
         if coefficient == 0:
             return self.field.get_zero()
 
-        product = [0] * (len(self.coefficients) + degree)
-        for i, c in enumerate(self.coefficients):
-            product[i] = self.field.multiply(c, coefficient)
-
+        product = self.field.get_kernel().scale(self.coefficients, coefficient).tolist() + [0] * degree
         return GenericGFPoly(self.field, product)
 
     def divide(self, other):
@@ -1,6 +1,7 @@
 import sys 
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+import numpy as np
 from .GenericGFPoly import GenericGFPoly
 from .GenericGF import GenericGF
 
@@ -14,18 +15,31 @@ class ReedSolomonException(Exception):
 class ReedSolomonDecoder:
     """
     Lớp ReedSolomonDecoder thực hiện giải mã Reed-Solomon, giúp phát hiện và sửa lỗi trong dữ liệu.
+
+    Có hai thuật toán tìm đa thức locator:
+    - EUCLIDEAN: thuật toán Euclid trên các đối tượng GenericGFPoly (cài đặt gốc, giống ZXing).
+    - BERLEKAMP_MASSEY: Berlekamp-Massey trên danh sách số nguyên, tìm kiếm Chien và công thức Forney
+      được tính bằng một lượt NumPy cho tất cả các điểm, nhanh hơn nhiều khi khối có nhiều lỗi.
     """
+    EUCLIDEAN = "euclidean"
+    BERLEKAMP_MASSEY = "berlekamp_massey"
 
-    def __init__(self, field):
+    def __init__(self, field, algorithm=EUCLIDEAN):
         """
         Khởi tạo đối tượng ReedSolomonDecoder.
 
         Input:
         - field: GenericGF, trường Galois được sử dụng cho các phép toán.
+        - algorithm: EUCLIDEAN hoặc BERLEKAMP_MASSEY, thuật toán dùng để sửa lỗi.
 
         Hàm này thiết lập trường Galois cần thiết để thực hiện các phép toán giải mã.
         """
+        if algorithm not in (ReedSolomonDecoder.EUCLIDEAN, ReedSolomonDecoder.BERLEKAMP_MASSEY):
+            raise ValueError(f"Thuật toán không được hỗ trợ: {algorithm}")
         self.field = field
+        self.algorithm = algorithm
+        # Bảng số mũ (i + generator_base) * (n - 1 - j) mod (size - 1) theo (n, two_s), xem syndrome_powers
+        self._syndrome_powers = {}
 
     def decode(self, received, two_s):
         """
@@ -40,36 +54,122 @@ class ReedSolomonDecoder:
         """
         self.decode_with_ec_count(received, two_s)
 
-    def decode_with_ec_count(self, received, two_s):
+    def decode_with_ec_count(self, received, two_s, erasures=None):
         """
         Giải mã dữ liệu, phát hiện và sửa lỗi trong danh sách mã nhận được.
 
         Input:
         - received: danh sách số nguyên, dữ liệu nhận được (gồm cả dữ liệu và mã sửa lỗi).
         - two_s: số nguyên, số lượng mã sửa lỗi có sẵn.
+        - erasures: danh sách chỉ số (trong `received`) của các mã bị nghi ngờ (tùy chọn).
+          Mỗi vị trí xóa chỉ tốn một mã sửa lỗi thay vì hai, nên có thể sửa e lỗi và f vị trí xóa khi 2e + f <= two_s.
+          Khi có vị trí xóa, việc sửa lỗi luôn đi qua Berlekamp-Massey.
 
         Output:
         - Trả về số lượng lỗi đã được sửa.
 
         Công việc:
-        - Xây dựng đa thức từ dữ liệu nhận được.
-        - Tính toán các hội chứng để phát hiện lỗi.
+        - Tính toàn bộ các hội chứng trong một lượt tra bảng (compute_syndromes).
         - Nếu không có lỗi, kết thúc sớm.
-        - Nếu có lỗi, sử dụng thuật toán Euclid để tìm các vị trí và độ lớn của lỗi.
+        - Nếu có lỗi, tìm vị trí và độ lớn của lỗi bằng thuật toán đã chọn (xem correct_with_syndromes).
         - Sửa lỗi trong dữ liệu nhận được.
         """
-        poly = GenericGFPoly(self.field, received)
-        syndrome_coefficients = [0] * two_s
-        no_error = True
-        for i in range(two_s):
-            eval = poly.evaluate_at(self.field.exp(i + self.field.get_generator_base()))
-            syndrome_coefficients[two_s - 1 - i] = eval
-            if eval != 0:
-                no_error = False
-
-        if no_error:
+        syndromes = self.compute_syndromes(received, two_s)[0]
+        if not syndromes.any():
             return 0
+        return self.correct_with_syndromes(received, two_s, syndromes, erasures)
+
+    def decode_blocks(self, blocks, two_s, erasures=None):
+        """
+        Giải mã cùng lúc nhiều khối mã của một ký hiệu (các khối có cùng số mã sửa lỗi, độ dài có thể khác nhau).
+
+        Input:
+        - blocks: danh sách các danh sách số nguyên, mỗi khối được sửa tại chỗ.
+        - two_s: số nguyên, số lượng mã sửa lỗi của mỗi khối.
+        - erasures: danh sách (mỗi khối một danh sách) các vị trí xóa trong khối, tùy chọn.
+
+        Output:
+        - Trả về danh sách số lỗi đã sửa của từng khối.
+
+        Công việc:
+        - Các khối ngắn hơn được thêm số 0 vào đầu (không đổi giá trị đa thức) để xếp thành một mảng 2D,
+          hội chứng của mọi khối được tính trong một lượt.
+        - Chỉ các khối có hội chứng khác 0 mới phải chạy bước tìm và sửa lỗi.
+        """
+        if len(blocks) == 0:
+            return []
+        length = max(len(block) for block in blocks)
+        matrix = np.zeros((len(blocks), length), dtype=np.int64)
+        for row, block in zip(matrix, blocks):
+            row[length - len(block):] = block
+
+        all_syndromes = self.compute_syndromes(matrix, two_s)
+        corrected = [0] * len(blocks)
+        for index in np.flatnonzero(all_syndromes.any(axis=1)):
+            block_erasures = erasures[index] if erasures is not None else None
+            corrected[index] = self.correct_with_syndromes(blocks[index], two_s, all_syndromes[index], block_erasures)
+        return corrected
+
+    def compute_syndromes(self, received, two_s):
+        """
+        Tính các hội chứng bằng tra bảng, vector hóa trên toàn bộ khối.
+
+        Input:
+        - received: danh sách số nguyên (một khối) hoặc mảng 2D (số khối, n), hệ số bậc cao nhất đứng đầu.
+        - two_s: số nguyên, số lượng mã sửa lỗi.
+
+        Output:
+        - ndarray phần tử của trường (số khối, two_s), cột i là giá trị đa thức tại alpha^(i + generator_base).
 
+        Công việc:
+        - Với hệ số c_j khác 0: c_j * alpha^(e * (n - 1 - j)) = exp[log(c_j) + (e * (n - 1 - j) mod (size - 1))].
+          Tổng hai số mũ luôn nhỏ hơn 2 * size nên bảng exp kéo dài của kernel (GFKernel.exp_table) tra trực tiếp,
+          không cần modulo.
+        - Các hệ số bằng 0 được che bỏ, sau đó cộng (XOR) theo từng hàng.
+        """
+        blocks = np.atleast_2d(np.asarray(received, dtype=np.int64))
+        powers = self.syndrome_powers(blocks.shape[1], two_s)
+        kernel = self.field.get_kernel()
+        logs = kernel.log_table[blocks]
+        terms = kernel.exp_table[logs[:, None, :] + powers[None, :, :]]
+        terms[np.broadcast_to((blocks == 0)[:, None, :], terms.shape)] = 0
+        return np.bitwise_xor.reduce(terms, axis=2)
+
+    def syndrome_powers(self, length, two_s):
+        """
+        Trả về (và lưu lại) mảng (two_s, length) các số mũ (i + generator_base) * (length - 1 - j) mod (size - 1).
+        """
+        key = (length, two_s)
+        powers = self._syndrome_powers.get(key)
+        if powers is None:
+            exponents = np.arange(two_s, dtype=np.int64) + self.field.get_generator_base()
+            degrees = np.arange(length - 1, -1, -1, dtype=np.int64)
+            powers = np.outer(exponents, degrees) % (self.field.get_size() - 1)
+            self._syndrome_powers[key] = powers
+        return powers
+
+    def correct_with_syndromes(self, received, two_s, syndromes, erasures=None):
+        """
+        Tìm và sửa lỗi trong `received` (tại chỗ) khi đã biết các hội chứng khác 0.
+
+        Input:
+        - received: danh sách số nguyên, dữ liệu nhận được.
+        - two_s: số nguyên, số lượng mã sửa lỗi.
+        - syndromes: dãy two_s hội chứng, phần tử i là giá trị tại alpha^(i + generator_base).
+        - erasures: danh sách vị trí xóa (tùy chọn).
+
+        Output:
+        - Trả về số lượng lỗi đã được sửa.
+        """
+        if erasures or self.algorithm == ReedSolomonDecoder.BERLEKAMP_MASSEY:
+            return self.correct_with_berlekamp_massey(received, two_s, syndromes, erasures)
+        return self.correct_with_euclidean(received, two_s, syndromes)
+
+    def correct_with_euclidean(self, received, two_s, syndromes):
+        """
+        Sửa lỗi bằng thuật toán Euclid, tìm kiếm Chien và công thức Forney trên GenericGFPoly.
+        """
+        syndrome_coefficients = [int(value) for value in syndromes[::-1]]
         syndrome = GenericGFPoly(self.field, syndrome_coefficients)
         sigma_omega = self.run_euclidean_algorithm(self.field.build_monomial(two_s, 1), syndrome, two_s)
         sigma = sigma_omega[0]
@@ -86,6 +186,145 @@ class ReedSolomonDecoder:
 
         return len(error_locations)
 
+    def correct_with_berlekamp_massey(self, received, two_s, syndromes, erasures=None):
+        """
+        Sửa lỗi bằng Berlekamp-Massey, tìm kiếm Chien vector hóa và công thức Forney.
+
+        Input:
+        - received: danh sách số nguyên, dữ liệu nhận được (được sửa tại chỗ).
+        - two_s: số nguyên, số lượng mã sửa lỗi.
+        - syndromes: dãy two_s hội chứng, phần tử i là giá trị tại alpha^(i + generator_base).
+        - erasures: danh sách vị trí xóa (tùy chọn).
+
+        Output:
+        - Trả về số lượng mã đã bị thay đổi (lỗi cộng với các vị trí xóa thực sự sai).
+
+        Công việc:
+        - Tìm đa thức locator Lambda(x) = prod(1 - X_k x) (hệ số bậc thấp đứng đầu) của cả lỗi lẫn vị trí xóa:
+          Berlekamp-Massey được khởi tạo bằng đa thức locator của các vị trí xóa.
+        - Tìm kiếm Chien: tính Lambda tại alpha^(-i) cho mọi vị trí i của khối trong một lượt NumPy;
+          nghiệm tại i nghĩa là lỗi ở received[n - 1 - i].
+        - Forney: e_k = X_k^(1 - b) * Omega(X_k^-1) / Lambda'(X_k^-1), với Omega = S(x) * Lambda(x) mod x^two_s.
+        """
+        syndromes = [int(value) for value in syndromes]
+        length = len(received)
+        erasure_powers = sorted(set(length - 1 - position for position in erasures)) if erasures else []
+        if any(power < 0 or power >= length for power in erasure_powers):
+            raise ReedSolomonException("Vị trí xóa không hợp lệ")
+        if len(erasure_powers) > two_s:
+            raise ReedSolomonException("Số vị trí xóa vượt quá số mã sửa lỗi")
+
+        locator = self.run_berlekamp_massey(syndromes, self.build_erasure_locator(erasure_powers))
+        num_errors = len(locator) - 1
+        if 2 * num_errors - len(erasure_powers) > two_s:
+            raise ReedSolomonException("Số lỗi vượt quá khả năng sửa")
+
+        order = self.field.get_size() - 1
+        # Chỉ các vị trí nằm trong khối mới có thể là nghiệm hợp lệ
+        positions = np.arange(min(length, order), dtype=np.int64)
+        values = self.evaluate_at_powers(locator, -positions)
+        error_positions = positions[values == 0]
+        if len(error_positions) != num_errors:
+            raise ReedSolomonException("Bậc của locator không khớp với số lượng lỗi")
+
+        evaluator = self.multiply_truncated(syndromes, locator, two_s)
+        # Đạo hàm hình thức trong GF(2^m): chỉ giữ các hạng tử bậc lẻ, Lambda'(x) = sum Lambda_j x^(j - 1) với j lẻ
+        derivative = [locator[j] if j % 2 == 1 else 0 for j in range(1, len(locator))]
+        numerators = self.evaluate_at_powers(evaluator, -error_positions)
+        denominators = self.evaluate_at_powers(derivative, -error_positions)
+        if not denominators.all():
+            raise ReedSolomonException("Lambda'(X^-1) bằng 0")
+
+        kernel = self.field.get_kernel()
+        correction = kernel.evaluate_at_powers([1, 0], error_positions * (1 - self.field.get_generator_base()))
+        magnitudes = kernel.multiply(kernel.divide(numerators, denominators), correction)
+
+        for position, magnitude in zip(error_positions.tolist(), magnitudes.tolist()):
+            received[length - 1 - position] ^= magnitude
+        return int(np.count_nonzero(magnitudes))
+
+    def build_erasure_locator(self, powers):
+        """
+        Tạo đa thức locator của các vị trí xóa Gamma(x) = prod(1 - alpha^p x) (bậc thấp đứng đầu),
+        với p = n - 1 - vị trí là bậc của hạng tử tương ứng trong đa thức nhận được.
+        """
+        field = self.field
+        locator = [1]
+        for power in powers:
+            root = field.exp(power)
+            locator = locator + [0]
+            for i in range(len(locator) - 1, 0, -1):
+                locator[i] ^= field.multiply(root, locator[i - 1])
+        return locator
+
+    def run_berlekamp_massey(self, syndromes, erasure_locator=None):
+        """
+        Thuật toán Berlekamp-Massey trên danh sách số nguyên.
+
+        Input:
+        - syndromes: danh sách số nguyên S_0..S_(two_s - 1).
+        - erasure_locator: đa thức locator của các vị trí xóa (tùy chọn, xem build_erasure_locator).
+          Khi có f vị trí xóa, thuật toán bắt đầu từ Gamma(x) ở bước thứ f (errors-and-erasures).
+
+        Output:
+        - Danh sách hệ số của đa thức locator Lambda(x), bậc thấp đứng đầu, Lambda_0 = 1
+          và độ dài bằng số lỗi + số vị trí xóa + 1.
+        """
+        field = self.field
+        if erasure_locator is None:
+            erasure_locator = [1]
+        num_erasures = len(erasure_locator) - 1
+        current = list(erasure_locator)
+        previous = list(erasure_locator)
+        errors = num_erasures
+        shift = 1
+        previous_discrepancy = 1
+
+        for n in range(num_erasures, len(syndromes)):
+            discrepancy = 0
+            for i in range(min(n, len(current) - 1) + 1):
+                discrepancy ^= field.multiply(current[i], syndromes[n - i])
+
+            if discrepancy == 0:
+                shift += 1
+                continue
+
+            scale = field.multiply(discrepancy, field.inverse(previous_discrepancy))
+            updated = current + [0] * max(0, len(previous) + shift - len(current))
+            for i, coefficient in enumerate(previous):
+                updated[i + shift] ^= field.multiply(scale, coefficient)
+
+            if 2 * errors <= n + num_erasures:
+                previous = current
+                previous_discrepancy = discrepancy
+                errors = n + 1 - errors + num_erasures
+                shift = 1
+            else:
+                shift += 1
+            current = updated
+
+        if len(current) <= errors or any(current[errors + 1:]):
+            raise ReedSolomonException("Đa thức locator không hợp lệ")
+        if current[errors] == 0:
+            raise ReedSolomonException("Bậc của locator không khớp với số lượng lỗi")
+        return current[:errors + 1]
+
+    def multiply_truncated(self, a, b, length):
+        """
+        Nhân hai đa thức (danh sách hệ số bậc thấp đứng đầu) và chỉ giữ `length` hệ số bậc thấp nhất.
+        """
+        product = self.field.get_kernel().poly_multiply(a[:length], b[:length])[:length].tolist()
+        return product + [0] * (length - len(product))
+
+    def evaluate_at_powers(self, coefficients, exponents):
+        """
+        Tính giá trị đa thức (hệ số bậc thấp đứng đầu) tại mọi điểm alpha^e với e trong `exponents`, trong một lượt NumPy.
+
+        Output:
+        - Mảng phần tử của trường cùng độ dài với `exponents` (xem GFKernel.evaluate_at_powers).
+        """
+        return self.field.get_kernel().evaluate_at_powers(list(coefficients)[::-1], exponents)
+
     def run_euclidean_algorithm(self, a, b, R):
         """
         Thực hiện thuật toán Euclid để tìm đa thức locator và evaluator.
@@ -142,8 +381,8 @@ class ReedSolomonDecoder:
             raise ReedSolomonException("sigmaTilde(0) bằng 0")
 
         inverse = self.field.inverse(sigma_tilde_at_zero)
-        sigma = t.multiply(inverse)
-        omega = r.multiply(inverse)
+        sigma = t.multiply_by_monomial(0, inverse)
+        omega = r.multiply_by_monomial(0, inverse)
         return [sigma, omega]
 
     def find_error_locations(self, error_locator):
@@ -1,6 +1,10 @@
+from .GFKernel import GFKernel
 from .GenericGF import GenericGF
 from .GenericGFPoly import GenericGFPoly
 from .FormatInformation import FormatInformation
 from .DecoderResult import DecoderResult
 from .ReedSolomonDecoder import ReedSolomonDecoder 
+from .BitSource import BitSource
+from .DataBlock import DataBlock
+from .DecodedBitStreamParser import DecodedBitStreamParser
 from .Decoder import  Decoder
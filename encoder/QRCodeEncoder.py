@@ -0,0 +1,383 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+import numpy as np
+from qrcode import BitMatrix, VersionManager
+from decoder import GenericGF, FormatInformation, DataBlock, DecodedBitStreamParser
+from enums import ErrorCorrectionLevel, Mode, DataMask
+from .ReedSolomonEncoder import ReedSolomonEncoder
+
+
+class QRCodeEncoder:
+    """
+    Tạo ký hiệu QR Code (BitMatrix, không có vùng yên tĩnh) từ một chuỗi, với phiên bản, mức sửa lỗi và mặt nạ
+    tùy chọn. Dùng để sinh dữ liệu thử nghiệm / đo hiệu năng mà không cần ảnh bên ngoài.
+
+    Bộ mã hóa dùng lại các bảng của bộ giải mã nên hai chiều luôn khớp nhau:
+    - Version: dung lượng, bố cục khối, function pattern và tọa độ các module dữ liệu.
+    - DataBlock.get_codeword_placements: thứ tự đan xen codeword giữa các khối.
+    - DataMask.get_mask_array: 8 mặt nạ dữ liệu.
+    - FormatInformation.FORMAT_INFO_DECODE_LOOKUP và Version.VERSION_DECODE_INFO: mã BCH của thông tin
+      định dạng / phiên bản.
+
+    Các chế độ được hỗ trợ: NUMERIC, ALPHANUMERIC và BYTE (ISO-8859-1, hoặc bảng mã khác kèm ECI).
+    """
+
+    # Byte đệm xen kẽ sau dữ liệu (ISO 18004:2006, 8.4.9)
+    PAD_BYTES = (0xEC, 0x11)
+
+    # Trọng số các luật tính điểm phạt khi chọn mặt nạ (ISO 18004:2006, 8.8.2)
+    PENALTY_N1 = 3
+    PENALTY_N2 = 3
+    PENALTY_N3 = 40
+    PENALTY_N4 = 10
+
+    # Mẫu 1:1:3:1:1 của finder pattern dùng trong luật phạt N3
+    FINDER_LIKE_PATTERN = np.array([1, 0, 1, 1, 1, 0, 1], dtype=bool)
+
+    RS_ENCODER = None
+
+    @staticmethod
+    def get_rs_encoder():
+        """
+        Bộ mã hóa Reed-Solomon dùng chung (các đa thức sinh và bảng phần dư được lưu trong đó).
+        """
+        if QRCodeEncoder.RS_ENCODER is None:
+            QRCodeEncoder.RS_ENCODER = ReedSolomonEncoder(GenericGF.QR_CODE_FIELD_256)
+        return QRCodeEncoder.RS_ENCODER
+
+    @staticmethod
+    def encode(content, ec_level=ErrorCorrectionLevel.L, version=None, mask=None, mode=None, encoding=None):
+        """
+        Mã hóa `content` thành một ký hiệu QR Code.
+
+        Input:
+        - content: str, nội dung cần mã hóa.
+        - ec_level: ErrorCorrectionLevel.
+        - version: số phiên bản (1-40) hoặc None để chọn phiên bản nhỏ nhất đủ chứa dữ liệu.
+        - mask: mã mặt nạ (0-7) hoặc None để chọn mặt nạ có điểm phạt nhỏ nhất.
+        - mode: Mode.NUMERIC / ALPHANUMERIC / BYTE hoặc None để chọn chế độ gọn nhất.
+        - encoding: bảng mã của chế độ BYTE; mặc định ISO-8859-1 nếu nội dung biểu diễn được, ngược lại UTF-8.
+          Bảng mã khác ISO-8859-1 được báo bằng một đoạn ECI.
+
+        Output:
+        - BitMatrix kích thước (17 + 4 * version), bit 1 là module tối.
+        - Ném ValueError nếu nội dung không mã hóa được với chế độ / phiên bản đã chọn.
+        """
+        if mode is None:
+            mode = QRCodeEncoder.choose_mode(content)
+        segment, eci = QRCodeEncoder.encode_segment(content, mode, encoding)
+        character_count = len(segment) if mode == Mode.BYTE else len(content)
+
+        if version is None:
+            version = QRCodeEncoder.choose_version(mode, character_count, len(segment), eci, ec_level)
+        else:
+            version = VersionManager.get_version_for_number(version)
+
+        bits = QRCodeEncoder.build_data_bits(mode, character_count, segment, eci, version, ec_level)
+        codewords = QRCodeEncoder.interleave_with_ec_codewords(QRCodeEncoder.pack_data_codewords(bits, version, ec_level),
+                                                             version, ec_level)
+        matrix = QRCodeEncoder.build_matrix(codewords, version, ec_level, mask)
+        return BitMatrix.from_bool_array(matrix)
+
+    @staticmethod
+    def choose_mode(content):
+        """
+        Chọn chế độ gọn nhất có thể biểu diễn toàn bộ nội dung.
+        """
+        if content and all("0" <= char <= "9" for char in content):
+            return Mode.NUMERIC
+        if content and all(char in DecodedBitStreamParser.ALPHANUMERIC_CHARS for char in content):
+            return Mode.ALPHANUMERIC
+        return Mode.BYTE
+
+    @staticmethod
+    def encode_segment(content, mode, encoding=None):
+        """
+        Mã hóa phần dữ liệu của một đoạn.
+
+        Output:
+        - (segment, eci): segment là danh sách bit (NUMERIC / ALPHANUMERIC) hoặc bytes (BYTE);
+          eci là giá trị ECI cần ghi trước đoạn, hoặc None.
+        """
+        if mode == Mode.NUMERIC:
+            if not all("0" <= char <= "9" for char in content):
+                raise ValueError("Nội dung không phải số")
+            bits = []
+            for start in range(0, len(content), 3):
+                group = content[start:start + 3]
+                QRCodeEncoder.append_bits(bits, int(group), 3 * len(group) + 1)
+            return bits, None
+        if mode == Mode.ALPHANUMERIC:
+            try:
+                values = [DecodedBitStreamParser.ALPHANUMERIC_CHARS.index(char) for char in content]
+            except ValueError:
+                raise ValueError("Nội dung có ký tự ngoài bảng alphanumeric")
+            bits = []
+            for start in range(0, len(values) - 1, 2):
+                QRCodeEncoder.append_bits(bits, values[start] * 45 + values[start + 1], 11)
+            if len(values) % 2 == 1:
+                QRCodeEncoder.append_bits(bits, values[-1], 6)
+            return bits, None
+        if mode == Mode.BYTE:
+            if encoding is None:
+                try:
+                    return content.encode(DecodedBitStreamParser.DEFAULT_BYTE_MODE_ENCODING), None
+                except UnicodeEncodeError:
+                    encoding = "utf-8"
+            eci = QRCodeEncoder.get_eci_value(encoding)
+            return content.encode(encoding), eci
+        raise ValueError(f"Chế độ không được hỗ trợ: {mode.name}")
+
+    @staticmethod
+    def get_eci_value(encoding):
+        """
+        Giá trị ECI của một bảng mã (theo DecodedBitStreamParser.CHARACTER_SET_ECI), None với bảng mã mặc định.
+        """
+        name = encoding.lower().replace("_", "-")
+        if name in ("latin-1", DecodedBitStreamParser.DEFAULT_BYTE_MODE_ENCODING):
+            return None
+        for value, charset in DecodedBitStreamParser.CHARACTER_SET_ECI.items():
+            if charset == name:
+                return value
+        raise ValueError(f"Bảng mã không có giá trị ECI: {encoding}")
+
+    @staticmethod
+    def append_bits(bits, value, num_bits):
+        """
+        Thêm num_bits bit thấp của value (bit cao trước) vào danh sách bits.
+        """
+        bits.extend((value >> shift) & 1 for shift in range(num_bits - 1, -1, -1))
+
+    @staticmethod
+    def get_num_data_codewords(version, ec_level):
+        return version.get_total_codewords() - version.get_ec_blocks_for_level(ec_level).get_total_ec_codewords()
+
+    @staticmethod
+    def get_header_bits(mode, eci, version):
+        """
+        Số bit của phần đầu: ECI (nếu có), chỉ thị chế độ và độ dài.
+        """
+        eci_bits = 0
+        if eci is not None:
+            eci_bits = 4 + (8 if eci < 0x80 else 16 if eci < 0x4000 else 24)
+        return eci_bits + 4 + mode.get_character_count_bits(version)
+
+    @staticmethod
+    def choose_version(mode, character_count, segment_length, eci, ec_level):
+        """
+        Chọn phiên bản nhỏ nhất chứa được dữ liệu. Ném ValueError nếu dữ liệu quá dài.
+        """
+        data_bits = segment_length * 8 if mode == Mode.BYTE else segment_length
+        for number in range(1, 41):
+            version = VersionManager.get_version_for_number(number)
+            if character_count >= 1 << mode.get_character_count_bits(version):
+                continue
+            needed = QRCodeEncoder.get_header_bits(mode, eci, version) + data_bits
+            if needed <= QRCodeEncoder.get_num_data_codewords(version, ec_level) * 8:
+                return version
+        raise ValueError("Dữ liệu quá dài cho QR Code")
+
+    @staticmethod
+    def build_data_bits(mode, character_count, segment, eci, version, ec_level):
+        """
+        Ghép phần đầu, dữ liệu và bit kết thúc. Ném ValueError nếu không đủ chỗ trong phiên bản.
+        """
+        bits = []
+        if eci is not None:
+            QRCodeEncoder.append_bits(bits, Mode.ECI.get_bits(), 4)
+            if eci < 0x80:
+                QRCodeEncoder.append_bits(bits, eci, 8)
+            elif eci < 0x4000:
+                QRCodeEncoder.append_bits(bits, 0x8000 | eci, 16)
+            else:
+                QRCodeEncoder.append_bits(bits, 0xC00000 | eci, 24)
+        count_bits = mode.get_character_count_bits(version)
+        if character_count >= 1 << count_bits:
+            raise ValueError("Dữ liệu quá dài cho phiên bản đã chọn")
+        QRCodeEncoder.append_bits(bits, mode.get_bits(), 4)
+        QRCodeEncoder.append_bits(bits, character_count, count_bits)
+        if mode == Mode.BYTE:
+            for byte in segment:
+                QRCodeEncoder.append_bits(bits, byte, 8)
+        else:
+            bits.extend(segment)
+
+        capacity = QRCodeEncoder.get_num_data_codewords(version, ec_level) * 8
+        if len(bits) > capacity:
+            raise ValueError("Dữ liệu quá dài cho phiên bản đã chọn")
+        # Bit kết thúc (tối đa 4 bit 0) rồi đệm tới biên byte
+        bits.extend([0] * min(4, capacity - len(bits)))
+        bits.extend([0] * (-len(bits) % 8))
+        return bits
+
+    @staticmethod
+    def pack_data_codewords(bits, version, ec_level):
+        """
+        Đóng gói các bit thành codeword và thêm các byte đệm 0xEC, 0x11 cho tới khi đủ số codeword dữ liệu.
+        """
+        codewords = np.packbits(np.array(bits, dtype=np.uint8)).tolist()
+        num_data_codewords = QRCodeEncoder.get_num_data_codewords(version, ec_level)
+        padding = num_data_codewords - len(codewords)
+        codewords.extend(QRCodeEncoder.PAD_BYTES[i & 1] for i in range(padding))
+        return codewords
+
+    @staticmethod
+    def interleave_with_ec_codewords(data_codewords, version, ec_level):
+        """
+        Chia dữ liệu thành các khối, tính codeword sửa lỗi (một lô cho mỗi độ dài khối) và đan xen
+        theo đúng thứ tự mà DataBlock.get_data_blocks tách ra khi giải mã.
+
+        Output:
+        - Danh sách version.get_total_codewords() codeword theo thứ tự đặt vào ký hiệu.
+        """
+        block_lengths, num_data_codewords, placements = DataBlock.get_codeword_placements(version, ec_level)
+        ec_count = version.get_ec_blocks_for_level(ec_level).get_ec_codewords_per_block()
+
+        blocks = []
+        offset = 0
+        for count in num_data_codewords:
+            blocks.append(data_codewords[offset:offset + count])
+            offset += count
+        for count in sorted(set(num_data_codewords)):
+            indices = [index for index, block_count in enumerate(num_data_codewords) if block_count == count]
+            ec_codewords = QRCodeEncoder.get_rs_encoder().encode_blocks([blocks[index] for index in indices], ec_count)
+            for index, ec_row in zip(indices, ec_codewords.tolist()):
+                blocks[index] = blocks[index] + ec_row
+
+        return [blocks[block][position] for block, position in placements]
+
+    @staticmethod
+    def build_matrix(codewords, version, ec_level, mask=None):
+        """
+        Dựng ma trận module (ndarray bool [y, x]) của ký hiệu từ các codeword đã đan xen.
+
+        Nếu mask là None, cả 8 mặt nạ được thử và mặt nạ có điểm phạt nhỏ nhất được chọn.
+        """
+        if mask is None:
+            candidates = [QRCodeEncoder.build_matrix(codewords, version, ec_level, index) for index in range(8)]
+            penalties = [QRCodeEncoder.mask_penalty(candidate) for candidate in candidates]
+            return candidates[int(np.argmin(penalties))]
+        if mask < 0 or mask > 7:
+            raise ValueError("Mã mặt nạ phải nằm trong [0, 7]")
+
+        dimension = version.get_dimension_for_version()
+        data_mask = DataMask.values()[mask].get_mask_array(dimension)
+        function_pattern = version.get_function_pattern_array()
+
+        # Vùng dữ liệu: các bit dư (ngoài bảng tọa độ) bằng 0 trước khi áp mặt nạ
+        matrix = data_mask & ~function_pattern
+        rows, cols = version.get_data_module_coordinates()
+        data_bits = np.unpackbits(np.array(codewords, dtype=np.uint8)).astype(bool)
+        matrix[rows, cols] = data_bits ^ data_mask[rows, cols]
+
+        QRCodeEncoder.draw_function_patterns(matrix, version)
+        QRCodeEncoder.draw_format_information(matrix, ec_level, mask)
+        QRCodeEncoder.draw_version_information(matrix, version)
+        return matrix
+
+    @staticmethod
+    def draw_function_patterns(matrix, version):
+        """
+        Vẽ finder pattern (kèm separator), timing pattern, alignment pattern và module tối cố định.
+        """
+        dimension = version.get_dimension_for_version()
+        finder = np.ones((7, 7), dtype=bool)
+        finder[1:6, 1:6] = False
+        finder[2:5, 2:5] = True
+        for top, left in ((0, 0), (0, dimension - 7), (dimension - 7, 0)):
+            # Separator trắng bao quanh
+            matrix[max(0, top - 1):top + 8, max(0, left - 1):left + 8] = False
+            matrix[top:top + 7, left:left + 7] = finder
+
+        timing = (np.arange(8, dimension - 8) % 2) == 0
+        matrix[6, 8:dimension - 8] = timing
+        matrix[8:dimension - 8, 6] = timing
+
+        alignment = np.ones((5, 5), dtype=bool)
+        alignment[1:4, 1:4] = False
+        alignment[2, 2] = True
+        centers = version.get_alignment_pattern_centers()
+        last = len(centers) - 1
+        for x, center_y in enumerate(centers):
+            for y, center_x in enumerate(centers):
+                # Không có alignment pattern trùng với ba finder pattern (cùng điều kiện với build_function_pattern_array)
+                if (x != 0 or (y != 0 and y != last)) and (x != last or y != 0):
+                    matrix[center_y - 2:center_y + 3, center_x - 2:center_x + 3] = alignment
+
+        matrix[dimension - 8, 8] = True
+
+    @staticmethod
+    def get_format_information_positions(dimension):
+        """
+        Tọa độ (x, y) của 15 bit thông tin định dạng (bit cao trước) ở hai bản sao,
+        theo đúng thứ tự BitMatrixParser.read_format_information đọc.
+        """
+        first = [(i, 8) for i in range(6)] + [(7, 8), (8, 8), (8, 7)] + [(8, j) for j in range(5, -1, -1)]
+        second = [(8, j) for j in range(dimension - 1, dimension - 8, -1)] + [(i, 8) for i in range(dimension - 8, dimension)]
+        return first, second
+
+    @staticmethod
+    def draw_format_information(matrix, ec_level, mask):
+        """
+        Ghi mã BCH (15, 5) đã áp mặt nạ 0x5412 của (mức sửa lỗi, mặt nạ) vào hai bản sao thông tin định dạng.
+        """
+        format_info = (ec_level.get_bits() << 3) | mask
+        code = next(target for target, info in FormatInformation.FORMAT_INFO_DECODE_LOOKUP if info == format_info)
+        for positions in QRCodeEncoder.get_format_information_positions(matrix.shape[0]):
+            for k, (x, y) in enumerate(positions):
+                matrix[y, x] = (code >> (14 - k)) & 1
+
+    @staticmethod
+    def draw_version_information(matrix, version):
+        """
+        Ghi mã BCH (18, 6) của phiên bản (từ phiên bản 7) vào hai khối 6x3, theo thứ tự BitMatrixParser.read_version đọc.
+        """
+        number = version.get_version_number()
+        if number < 7:
+            return
+        code = version.VERSION_DECODE_INFO[number - 7]
+        dimension = matrix.shape[0]
+        k = 0
+        for j in range(5, -1, -1):
+            for i in range(dimension - 9, dimension - 12, -1):
+                bit = (code >> (17 - k)) & 1
+                # Góc trên bên phải tại (x = i, y = j), góc dưới bên trái là bản chuyển vị
+                matrix[j, i] = bit
+                matrix[i, j] = bit
+                k += 1
+
+    @staticmethod
+    def mask_penalty(matrix):
+        """
+        Điểm phạt của một ma trận theo bốn luật của ISO 18004:2006, 8.8.2, tính vector hóa:
+        - N1: mỗi đoạn >= 5 module cùng màu trên hàng / cột, 3 + (độ dài - 5).
+        - N2: mỗi khối 2x2 cùng màu, 3.
+        - N3: mỗi mẫu 1:1:3:1:1 có 4 module trắng ở một phía (ngoài ma trận coi là trắng), 40.
+        - N4: 10 cho mỗi 5% tỉ lệ module tối lệch khỏi 50%.
+        """
+        penalty = 0
+        for lines in (matrix, matrix.T):
+            height, width = lines.shape
+            changes = np.ones((height, width + 1), dtype=bool)
+            changes[:, 1:-1] = lines[:, 1:] != lines[:, :-1]
+            # Các đoạn nối giữa hai hàng liên tiếp có độ dài 1 nên không ảnh hưởng
+            run_lengths = np.diff(np.flatnonzero(changes))
+            long_runs = run_lengths[run_lengths >= 5]
+            penalty += int(np.sum(long_runs - 5 + QRCodeEncoder.PENALTY_N1))
+
+        same = (matrix[:-1, :-1] == matrix[1:, :-1]) & (matrix[:-1, :-1] == matrix[:-1, 1:]) & (matrix[:-1, :-1] == matrix[1:, 1:])
+        penalty += QRCodeEncoder.PENALTY_N2 * int(np.count_nonzero(same))
+
+        for lines in (matrix, matrix.T):
+            padded = np.pad(lines, ((0, 0), (4, 4)), constant_values=False)
+            windows = np.lib.stride_tricks.sliding_window_view(padded, 15, axis=1)
+            is_finder = (windows[:, :, 4:11] == QRCodeEncoder.FINDER_LIKE_PATTERN).all(axis=2)
+            white_before = ~windows[:, :, :4].any(axis=2)
+            white_after = ~windows[:, :, 11:].any(axis=2)
+            penalty += QRCodeEncoder.PENALTY_N3 * int(np.count_nonzero(is_finder & (white_before | white_after)))
+
+        total = matrix.size
+        dark = int(np.count_nonzero(matrix))
+        penalty += (abs(dark * 2 - total) * 10 // total) * QRCodeEncoder.PENALTY_N4
+        return penalty
@@ -0,0 +1,125 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+import threading
+import numpy as np
+
+
+class ReedSolomonEncoder:
+    """
+    Bộ mã hóa Reed-Solomon: tính các codeword sửa lỗi của một hoặc nhiều khối dữ liệu.
+
+    Mã RS tuyến tính, nên phần dư của data(x) * x^ec_count khi chia cho đa thức sinh g(x) là tổng (XOR)
+    của data_i * (x^(ec_count + i) mod g(x)) theo từng vị trí i. Với mỗi bậc ec_count, bảng các phần dư
+    x^(ec_count + i) mod g(x) được tính một lần và lưu lại; mã hóa một lô khối khi đó chỉ là một phép nhân
+    từng phần tử (GFKernel) và một phép XOR theo trục, không có vòng lặp chia đa thức cho từng byte.
+    """
+
+    def __init__(self, field):
+        """
+        Input:
+        - field: GenericGF, trường Galois dùng để mã hóa (GenericGF.QR_CODE_FIELD_256 cho QR Code).
+        """
+        self.field = field
+        self.kernel = field.get_kernel()
+        # Đa thức sinh (hệ số bậc cao đứng đầu) và bảng phần dư theo số codeword sửa lỗi
+        self.generators = {}
+        self.remainders = {}
+        self.lock = threading.Lock()
+
+    def get_generator(self, ec_count):
+        """
+        Trả về đa thức sinh g(x) = (x - alpha^b)(x - alpha^(b + 1))...(x - alpha^(b + ec_count - 1))
+        dưới dạng mảng hệ số bậc cao đứng đầu (hệ số đầu bằng 1), b là generator base của trường.
+        """
+        generator = self.generators.get(ec_count)
+        if generator is None:
+            with self.lock:
+                generator = self.generators.get(ec_count)
+                if generator is None:
+                    generator = self.build_generator(ec_count)
+                    generator.flags.writeable = False
+                    self.generators[ec_count] = generator
+        return generator
+
+    def build_generator(self, ec_count):
+        """
+        Tính đa thức sinh bậc ec_count bằng cách nhân dần các thừa số (x - alpha^(b + d)).
+        """
+        generator = self.kernel.as_elements([1])
+        base = self.field.get_generator_base()
+        for degree in range(ec_count):
+            generator = self.kernel.poly_multiply(generator, [1, self.field.exp(degree + base)])
+        return generator
+
+    def get_remainders(self, ec_count):
+        """
+        Trả về mảng (size - 1 - ec_count, ec_count): hàng i là x^(ec_count + i) mod g(x), hệ số bậc cao đứng đầu.
+        """
+        remainders = self.remainders.get(ec_count)
+        if remainders is None:
+            generator = self.get_generator(ec_count)
+            with self.lock:
+                remainders = self.remainders.get(ec_count)
+                if remainders is None:
+                    remainders = self.build_remainders(generator, ec_count)
+                    remainders.flags.writeable = False
+                    self.remainders[ec_count] = remainders
+        return remainders
+
+    def build_remainders(self, generator, ec_count):
+        """
+        Tính lần lượt r_0 = x^ec_count mod g(x) và r_(i + 1) = x * r_i mod g(x).
+        g(x) có hệ số đầu bằng 1 nên x^ec_count mod g(x) chính là các hệ số còn lại của g(x) (phép trừ là XOR).
+        """
+        rows = self.field.get_size() - 1 - ec_count
+        remainders = np.zeros((rows, ec_count), dtype=self.kernel.dtype)
+        tail = generator[1:]
+        current = tail.copy()
+        for i in range(rows):
+            remainders[i] = current
+            overflow = current[0]
+            current = np.append(current[1:], self.kernel.dtype(0))
+            if overflow:
+                current ^= self.kernel.scale(tail, overflow)
+        return remainders
+
+    def encode_blocks(self, data_blocks, ec_count):
+        """
+        Tính các codeword sửa lỗi cho một lô khối dữ liệu cùng độ dài.
+
+        Input:
+        - data_blocks: mảng 2D (số khối, số codeword dữ liệu) hoặc danh sách các danh sách số nguyên.
+        - ec_count: số codeword sửa lỗi của mỗi khối.
+
+        Output:
+        - ndarray (số khối, ec_count) các codeword sửa lỗi.
+        """
+        if ec_count == 0:
+            raise ValueError("Không có codeword sửa lỗi nào")
+        data = np.atleast_2d(self.kernel.as_elements(data_blocks))
+        data_count = data.shape[1]
+        if data_count == 0:
+            raise ValueError("Không có codeword dữ liệu nào")
+        remainders = self.get_remainders(ec_count)
+        if data_count > len(remainders):
+            raise ValueError("Khối quá dài so với kích thước trường")
+        # Hệ số data[:, j] nhân với x^(ec_count + data_count - 1 - j)
+        rows = remainders[data_count - 1::-1]
+        terms = self.kernel.multiply(data[:, :, None], rows[None, :, :])
+        return np.bitwise_xor.reduce(terms, axis=1)
+
+    def encode(self, to_encode, ec_count):
+        """
+        Mã hóa tại chỗ theo quy ước của ZXing: `to_encode` chứa các codeword dữ liệu theo sau bởi ec_count
+        chỗ trống, các chỗ trống được ghi đè bằng các codeword sửa lỗi.
+
+        Input:
+        - to_encode: danh sách số nguyên.
+        - ec_count: số codeword sửa lỗi.
+        """
+        data_count = len(to_encode) - ec_count
+        if data_count <= 0:
+            raise ValueError("Không có codeword dữ liệu nào")
+        ec_codewords = self.encode_blocks([to_encode[:data_count]], ec_count)[0]
+        to_encode[data_count:] = ec_codewords.tolist()
@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+import numpy as np
+import cv2
+
+
+class SymbolRasterizer:
+    """
+    Chuyển một ký hiệu (BitMatrix, bit 1 là module tối) thành ảnh độ chói uint8 để đo hiệu năng / kiểm tra
+    khứ hồi mà không cần ảnh chụp.
+
+    Các biến dạng được điều khiển hoàn toàn bằng tham số và một seed cố định, nên cùng cấu hình luôn cho cùng một ảnh.
+    """
+
+    def __init__(self, module_size=4, quiet_zone=4, rotation=0.0, noise=0.0, seed=0):
+        """
+        :param module_size: Số pixel cho mỗi cạnh module (số nguyên >= 1).
+        :param quiet_zone: Độ rộng vùng yên tĩnh, tính bằng module.
+        :param rotation: Góc xoay (độ, ngược chiều kim đồng hồ); ảnh được nới rộng để không cắt mất ký hiệu.
+        :param noise: Độ lệch chuẩn của nhiễu Gauss cộng vào mỗi pixel (theo mức xám).
+        :param seed: Seed của bộ sinh số ngẫu nhiên dùng cho nhiễu.
+        """
+        if module_size < 1:
+            raise ValueError("module_size phải lớn hơn hoặc bằng 1")
+        if quiet_zone < 0:
+            raise ValueError("quiet_zone không được âm")
+        if noise < 0:
+            raise ValueError("noise không được âm")
+        self.module_size = int(module_size)
+        self.quiet_zone = int(quiet_zone)
+        self.rotation = float(rotation)
+        self.noise = float(noise)
+        self.seed = seed
+
+    def render(self, bits):
+        """
+        Dựng ảnh của ký hiệu.
+
+        :param bits: BitMatrix của ký hiệu (không có vùng yên tĩnh).
+        :return: ndarray uint8 (height, width), 0 là module tối và 255 là nền.
+        """
+        modules = np.pad(bits.to_bool_array(), self.quiet_zone, constant_values=False)
+        image = np.where(modules, np.uint8(0), np.uint8(255))
+        image = np.repeat(np.repeat(image, self.module_size, axis=0), self.module_size, axis=1)
+        if self.rotation % 360 != 0:
+            image = SymbolRasterizer.rotate(image, self.rotation)
+        if self.noise > 0:
+            rng = np.random.default_rng(self.seed)
+            noisy = image.astype(np.float32) + rng.normal(0.0, self.noise, image.shape).astype(np.float32)
+            image = np.clip(np.rint(noisy), 0, 255).astype(np.uint8)
+        return image
+
+    @staticmethod
+    def rotate(image, angle):
+        """
+        Xoay ảnh quanh tâm một góc `angle` (độ), nới rộng khung để chứa toàn bộ ảnh, phần mới lộ ra được tô trắng.
+        """
+        height, width = image.shape
+        matrix = cv2.getRotationMatrix2D((width / 2.0, height / 2.0), angle, 1.0)
+        cos = abs(matrix[0, 0])
+        sin = abs(matrix[0, 1])
+        new_width = int(np.ceil(height * sin + width * cos))
+        new_height = int(np.ceil(height * cos + width * sin))
+        matrix[0, 2] += new_width / 2.0 - width / 2.0
+        matrix[1, 2] += new_height / 2.0 - height / 2.0
+        return cv2.warpAffine(image, matrix, (new_width, new_height), flags=cv2.INTER_LINEAR,
+                              borderMode=cv2.BORDER_CONSTANT, borderValue=255)
@@ -0,0 +1,3 @@
+from .QRCodeEncoder import QRCodeEncoder
+from .ReedSolomonEncoder import ReedSolomonEncoder
+from .SymbolRasterizer import SymbolRasterizer
@@ -2,11 +2,15 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
 from abc import ABC, abstractmethod
-from qrcode import BitMatrix
+import numpy as np
 
 
 class DataMask(ABC):
 
+    def __init__(self):
+        # Mặt nạ dạng mảng bool đã tính, theo kích thước ma trận (xem get_mask_array)
+        self.mask_arrays = {}
+
     @abstractmethod
     def is_masked(self, i, j):
         """
@@ -23,6 +27,28 @@ class DataMask(ABC):
         """
         pass
 
+    @staticmethod
+    def values():
+        """
+        Trả về danh sách 8 mặt nạ dữ liệu, phần tử thứ k ứng với mã mặt nạ k trong thông tin định dạng.
+        """
+        return DataMask.VALUES
+
+    def get_mask_array(self, dimension):
+        """
+        Trả về mặt nạ dạng ndarray bool (dimension, dimension) chỉ đọc, phần tử [i, j] bằng is_masked(i, j).
+
+        Mặt nạ được tính một lần cho mỗi kích thước bằng cách gọi is_masked trên lưới chỉ số (các công thức
+        chỉ dùng phép toán số học nên áp dụng được cho ndarray) và được lưu lại cho các lần giải mã sau.
+        """
+        mask = self.mask_arrays.get(dimension)
+        if mask is None:
+            indices = np.arange(dimension)
+            mask = np.broadcast_to(self.is_masked(indices[:, None], indices[None, :]), (dimension, dimension)).copy()
+            mask.flags.writeable = False
+            self.mask_arrays[dimension] = mask
+        return mask
+
     def unmask_bit_matrix(self, bits, dimension):
         """
         Đảo ngược quá trình ẩn dữ liệu trên một ma trận QR code.
@@ -31,16 +57,14 @@ class DataMask(ABC):
         - bits (BitMatrix): Ma trận QR code chứa các bit cần được giải mã.
         - dimension (int): Kích thước của ma trận QR code.
 
-        Mô tả: Quá trình này sẽ kiểm tra mỗi vị trí trong ma trận, nếu vị trí đó bị ẩn
-        theo quy định của mỗi kiểu Data Mask thì sẽ đảo trạng thái bit tại vị trí đó.
+        Mô tả: Mọi vị trí bị ẩn theo quy định của kiểu Data Mask (get_mask_array) được đảo trạng thái
+        trong một phép XOR theo word.
 
         Output:
         - Không có giá trị trả về, hàm này thay đổi trực tiếp ma trận `bits`.
         """
-        for i in range(dimension):
-            for j in range(dimension):
-                if self.is_masked(i, j):
-                    bits.flip(j, i)
+        # Dựng mặt nạ cùng lớp với `bits` để enums không phải import qrcode (qrcode import lại enums.DataMask)
+        bits.xor(type(bits).from_bool_array(self.get_mask_array(dimension)))
 
 
 class DataMask000(DataMask):
@@ -177,3 +201,7 @@ class DataMask111(DataMask):
         - (bool): True nếu bit bị ẩn, False nếu không.
         """
         return ((i + j + ((i * j) % 3)) % 2) == 0
+
+
+DataMask.VALUES = [DataMask000(), DataMask001(), DataMask010(), DataMask011(),
+                   DataMask100(), DataMask101(), DataMask110(), DataMask111()]
@@ -17,6 +17,10 @@ class ErrorCorrectionLevel(Enum):
         # Trả về giá trị bits
         return self.bits
 
+    def ordinal(self):
+        # Thứ tự khai báo (L, M, Q, H), dùng làm chỉ số vào bảng ECBlocks của Version
+        return list(ErrorCorrectionLevel).index(self)
+
     @staticmethod
     def for_bits(bits):
         # Tìm kiếm ErrorCorrectionLevel theo bits
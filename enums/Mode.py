@@ -0,0 +1,57 @@
+import sys 
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+from enum import Enum
+
+
+class Mode(Enum):
+    """
+    Các chế độ mã hóa dữ liệu của QR Code (ISO 18004:2006, 6.4.1, Bảng 2 và 3).
+
+    Giá trị của mỗi chế độ là (bits, số bit độ dài cho phiên bản 1-9, 10-26, 27-40).
+    """
+    TERMINATOR = (0x00, (0, 0, 0))
+    NUMERIC = (0x01, (10, 12, 14))
+    ALPHANUMERIC = (0x02, (9, 11, 13))
+    STRUCTURED_APPEND = (0x03, (0, 0, 0))
+    BYTE = (0x04, (8, 16, 16))
+    ECI = (0x07, (0, 0, 0))
+    KANJI = (0x08, (8, 10, 12))
+    FNC1_FIRST_POSITION = (0x05, (0, 0, 0))
+    FNC1_SECOND_POSITION = (0x09, (0, 0, 0))
+    # Xem GBT 18284-2000; "Hanzi" là tên chế độ trong tiêu chuẩn Trung Quốc
+    HANZI = (0x0D, (8, 10, 12))
+
+    def __init__(self, bits, character_count_bits_for_versions):
+        self.bits = bits
+        self.character_count_bits_for_versions = character_count_bits_for_versions
+
+    def get_bits(self):
+        return self.bits
+
+    def get_character_count_bits(self, version):
+        """
+        Số bit dùng để mã hóa độ dài dữ liệu của chế độ này trong một phiên bản cho trước.
+
+        Input:
+        - version: Version, phiên bản của mã.
+        """
+        number = version.get_version_number()
+        if number <= 9:
+            offset = 0
+        elif number <= 26:
+            offset = 1
+        else:
+            offset = 2
+        return self.character_count_bits_for_versions[offset]
+
+    @staticmethod
+    def for_bits(bits):
+        """
+        Tìm chế độ theo 4 bit chỉ thị chế độ.
+        Ném ValueError nếu các bit không ứng với chế độ nào.
+        """
+        for mode in Mode:
+            if mode.bits == bits:
+                return mode
+        raise ValueError("Invalid mode bits")
@@ -2,4 +2,5 @@ from .BarcodeFormat import BarcodeFormat
 from .DataMask import DataMask
 from .DecodeHintType import DecodeHintType
 from .ErrorCorrectionLevel import ErrorCorrectionLevel
+from .Mode import Mode
 from .ResultMetadataType import ResultMetadataType
\ No newline at end of file
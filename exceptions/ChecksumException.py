@@ -0,0 +1,24 @@
+import sys 
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+
+class ChecksumException(Exception):
+    """Lớp ngoại lệ khi dữ liệu đọc được không vượt qua bước kiểm tra / sửa lỗi (Reed-Solomon).
+
+    Attributes:
+        message (str): Thông điệp lỗi chi tiết.
+    """
+
+    def __init__(self, message="QR Code checksum error."):
+        self.message = message
+        super().__init__(self.message)
+
+    @staticmethod
+    def get_checksum_instance():
+        """
+        Tạo và trả về một instance của ChecksumException.
+
+        Input: Không có.
+        Output: Trả về một instance của ChecksumException với thông điệp mặc định.
+        """
+        return ChecksumException()
@@ -17,4 +17,12 @@ class NotFoundException(Exception):
         self.message = message
         super().__init__(self.message)
 
+    @staticmethod
+    def get_not_found_instance():
+        """
+        Tạo và trả về một instance của NotFoundException.
 
+        Input: Không có.
+        Output: Trả về một instance của NotFoundException với thông điệp mặc định.
+        """
+        return NotFoundException()
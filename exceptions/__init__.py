@@ -1,2 +1,3 @@
+from .ChecksumException import ChecksumException
 from .FormatException import FormatException
 from .NotFoundException import NotFoundException
\ No newline at end of file
@@ -1,8 +1,11 @@
 import sys 
 import os
+import bisect
+import math
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
 from .AlignmentPattern import AlignmentPattern
 from qrcode import BitMatrix
+from exceptions import NotFoundException
 class AlignmentPatternFinder:
     def __init__(self, image, start_x, start_y, width, height, module_size, result_point_callback=None):
         """
@@ -30,38 +33,50 @@ class AlignmentPatternFinder:
         height = self.height
         max_j = start_x + self.width
         middle_i = self.start_y + (height // 2)
+        run_index = self.image.get_run_index()
         state_count = [0, 0, 0]
         for iGen in range(height):
             i = middle_i + ((iGen & 0x01) == 0 and (iGen + 1) // 2 or -((iGen + 1) // 2))
             state_count = [0, 0, 0]
+
+            # Duyệt theo từng đoạn cùng màu của hàng i, giới hạn trong [start_x, max_j)
+            first_black, boundaries = run_index.row_runs(i)
+            run = bisect.bisect_right(boundaries, start_x) - 1
+            black = ((run & 1) == 0) == first_black
             j = start_x
 
             # Skip leading white pixels
-            while j < max_j and not self.image.get(j,i):
-                j += 1
+            if j < max_j and not black:
+                j = boundaries[run + 1]
+                run += 1
+                black = True
 
             current_state = 0
             while j < max_j:
-                if self.image.get(j,i): # black pixel
+                end = min(boundaries[run + 1], max_j)
+                run_length = end - j
+                if black: # black run
                     if current_state == 1:
-                        state_count[1] += 1
+                        state_count[1] += run_length
                     else:
                         if current_state == 2: # have full state
                             if self.found_pattern_cross(state_count):
                                 confirmed = self.handle_possible_center(state_count, i, j)
                                 if confirmed is not None:
                                     return confirmed
-                            state_count[0], state_count[1] = state_count[2], 1
+                            state_count[0], state_count[1] = state_count[2], run_length
                             state_count[2] = 0
                             current_state = 1
                         else:
                             current_state += 1
-                            state_count[current_state] += 1
+                            state_count[current_state] += run_length
                 else:
                     if current_state == 1:
                         current_state += 1
-                    state_count[current_state] += 1
-                j += 1
+                    state_count[current_state] += run_length
+                j = end
+                run += 1
+                black = not black
 
             if self.found_pattern_cross(state_count):
                 confirmed = self.handle_possible_center(state_count, i, max_j)
@@ -69,7 +84,7 @@ class AlignmentPatternFinder:
                     return confirmed
         if len(self.possibleCenters) > 0:
             return self.possibleCenters[0]
-        raise ValueError("Not Found")
+        raise NotFoundException.get_not_found_instance()
 
     @staticmethod
     def center_from_end(state_count, end):
@@ -124,7 +139,7 @@ class AlignmentPatternFinder:
         state_count_total = sum(state_count)
         center_j = self.center_from_end(state_count, j)
         center_i = self.cross_check_vertical(i, int(center_j), 2 * state_count[1], state_count_total)
-        if not (center_i != float('nan')):
+        if math.isnan(center_i):
             return None
 
         estimated_module_size = sum(state_count) / 3.0
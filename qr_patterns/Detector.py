@@ -22,21 +22,25 @@ from enums import DecodeHintType
 
 
 class Detector:
-    def __init__(self, image):
+    def __init__(self, image, supersample=1):
         """
         Property: 
         - image : BitMatrix
         - result_point_call_back : ResultPointCallBack
+        - supersample : int, sub-samples per module side used by the grid sampler (1 samples the centre only)
         """
         self.image: BitMatrix = image
+        self.supersample = supersample
         self.result_point_callback = None
+        self.possible_centers = []
     
  
-    def detect(self, hints=None): # hint Map<DecodeHintType,?> hints
+    def detect(self, hints=None, rows=None): # hint Map<DecodeHintType,?> hints
         """
         Detects a QR Code in an image.
 
         :param hints: Optional hints for the detection process (default is None).
+        :param rows: Optional sorted list of rows the finder pattern search is restricted to.
         :return: DetectorResult containing the detection results.
         :raises NotFoundException: If a QR Code cannot be found.
         :raises FormatException: If a QR Code cannot be decoded.
@@ -47,7 +51,9 @@ class Detector:
             self.result_point_callback = hints.get(DecodeHintType.NEED_RESULT_POINT_CALLBACK, None)
 
         finder: FinderPatternFinder = FinderPatternFinder(self.image, self.result_point_callback)
-        info: FinderPatternInfo = finder.find(hints)
+        info: FinderPatternInfo = finder.find(hints, rows)
+        # Giữ lại các tâm ứng viên để bộ đọc đa tỉ lệ thu hẹp vùng tìm kiếm ở tầng mịn hơn
+        self.possible_centers = finder.get_possible_centers()
         return self.process_finder_pattern_info(info)
     
     
@@ -91,13 +97,17 @@ class Detector:
         transform: PerspectiveTransform = Detector.create_transform(top_left, top_right, bottom_left, alignment_pattern, dimension)
         if transform is None:
             return None
-        bits: BitMatrix = Detector.sample_grid(self.image, transform, dimension)
+        sampled = Detector.sample_grid(self.image, transform, dimension, with_confidence=True,
+                                       supersample=self.supersample)
+        if sampled is None:
+            return None
+        bits, confidence = sampled
         if alignment_pattern is None:
             points = [bottom_left, top_left, top_right]
         else:
             points = [bottom_left, top_left, top_right, alignment_pattern]
 
-        return DetectorResult(bits, points) 
+        return DetectorResult(bits, points, confidence)
 
 
     @staticmethod
@@ -109,60 +119,43 @@ class Detector:
         - bottom_left: ResultPoint
         - alignment_pattern: ResultPoint 
         - dimension: int
-        """             
+        Output:
+        - PerspectiveTransform mapping module coordinates to image coordinates
+        """
         dim_minus_three = dimension - 3.5
-        bottom_right_x = 0
-        bottom_right_y = 0
-        source_bottom_right_x = 0
-        source_bottom_right_y = 0 
         if alignment_pattern is not None:
-            bottom_right_x =  alignment_pattern.get_x()
+            bottom_right_x = alignment_pattern.get_x()
             bottom_right_y = alignment_pattern.get_y()
-            source_bottom_right_x = dim_minus_three - 3.0
-            source_bottom_right_y = source_bottom_right_x
+            source_bottom_right = dim_minus_three - 3.0
         else:
             # Don't have an alignment pattern, just make up the bottom-right point
-            bottom_right_x = (top_right.get_x() - top_left.get_x()) + bottom_left.get_x()
-            bottom_right_y = (top_right.get_y() - top_left.get_y()) + bottom_left.get_y()
-            source_bottom_right_x = dim_minus_three
-            source_bottom_right_y = dim_minus_three
+            bottom_right_x = top_right.get_x() - top_left.get_x() + bottom_left.get_x()
+            bottom_right_y = top_right.get_y() - top_left.get_y() + bottom_left.get_y()
+            source_bottom_right = dim_minus_three
         return PerspectiveTransform.quadrilateral_to_quadrilateral(
-            3.5,
-            3.5,
-            dim_minus_three,
-            3.5,
-            source_bottom_right_x,
-            source_bottom_right_y,
-            3.5,
-            dim_minus_three,
-            
-            top_left.get_x(),
-            top_left.get_y(),
-            top_right.get_x(),
-            top_right.get_y(),
-            bottom_right_x,
-            bottom_right_y,
-            bottom_left.get_x(),
-            bottom_left.get_y()
-        )
+            3.5, 3.5, dim_minus_three, 3.5, source_bottom_right, source_bottom_right, 3.5, dim_minus_three,
+            top_left.get_x(), top_left.get_y(), top_right.get_x(), top_right.get_y(),
+            bottom_right_x, bottom_right_y, bottom_left.get_x(), bottom_left.get_y())
     
     
     @staticmethod
-    def sample_grid(image, transform, dimension):
+    def sample_grid(image, transform, dimension, with_confidence=False, supersample=1):
         """
         Input: 
         - image: BitMatrix 
         - transform: PerpectiveTransform 
         - dimension: int
+        - with_confidence: bool, also return the per-module sampling confidence
+        - supersample: int, decide each module by a vote over a supersample x supersample sub-grid
         Output:
-        - BitMatrix
+        - BitMatrix, or (BitMatrix, ndarray) if with_confidence; None if sampling failed
         """
         try:
             # sampler = GridSampler.get_instance()
             # sampler = DefaultGridSampler()
             # print(type(sampler))
-            print("Transform", transform)
-            return DefaultGridSampler.sample_grid(image, dimension, dimension, transform)
+            return DefaultGridSampler.sample_grid(image, dimension, dimension, transform, with_confidence=with_confidence,
+                                                  supersample=supersample)
         except Exception as e:
             # raise NotFoundException("Sample grid failed") from e
             return None
@@ -11,13 +11,15 @@ class DetectorResult:
     in the image, like the location of finder patterns or corners of the barcode in the image.
     """
 
-    def __init__(self, bits, points):
+    def __init__(self, bits, points, confidence=None):
         """
         :param bits: BitMatrix, representing the barcode image matrix.
         :param points: List[ResultPoint], points of interest in the image.
+        :param confidence: optional ndarray (height, width) of per-module sampling confidence in [0, 1].
         """
         self.bits:BitMatrix  = bits
         self.points = points
+        self.confidence = confidence
 
     def get_bits(self):
         """
@@ -30,3 +32,9 @@ class DetectorResult:
         Returns the points of interest (e.g., corners or finder patterns).
         """
         return self.points
+
+    def get_confidence(self):
+        """
+        Returns the per-module sampling confidence, or None if the sampler did not provide it.
+        """
+        return self.confidence
@@ -5,10 +5,13 @@ import os
 from qrcode import BitMatrix
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+import bisect
 import math
+import numpy as np
 from .FinderPattern import FinderPattern
 from .ResultPoint import ResultPoint
 from .FinderPatternInfo import FinderPatternInfo
+from .FinderPatternGrid import FinderPatternGrid
 from enums import DecodeHintType
 from typing import List
 
@@ -39,8 +42,15 @@ class EstimatedModuleComparator:
 
 
 class FinderPatternFinder:
-    
-    
+
+    # Largest ratio between the estimated module sizes of the three patterns of one symbol
+    MAX_MODULE_SIZE_RATIO = 1.4
+    # Bounds on the distance between two finder pattern centers of one symbol, in modules: patterns cannot
+    # overlap (7 modules wide), and the hypotenuse of a version 40 symbol is 170 * sqrt(2) modules (plus slack
+    # for module sizes underestimated under perspective)
+    MIN_PATTERN_DISTANCE_MODULES = 7
+    MAX_PATTERN_DISTANCE_MODULES = 300
+
 
     def __init__(self, image, result_point_callback=None):
         """
@@ -58,6 +68,8 @@ class FinderPatternFinder:
         self.MIN_SKIP: int = 3  # 1 pixel/module times 3 modules/center
         self.MAX_MODULES: int = 97  # support up to version 20 for mobile clients
         self.module_comparator = EstimatedModuleComparator()
+        # Spatial index over possible_centers for the merge lookup of handle_possible_center
+        self.center_grid = FinderPatternGrid()
 
 
     def get_image(self):
@@ -74,7 +86,15 @@ class FinderPatternFinder:
         """
         return self.possible_centers
 
-    def find(self, hints):
+    def find(self, hints, rows=None):
+        """
+        Searches the image for the three finder patterns.
+
+        :param hints: Optional decode hints.
+        :param rows: Optional sorted list of row indices; when given, only those rows are scanned
+                     (used to restrict a fine pyramid level to the bands found at a coarser level).
+        :return: FinderPatternInfo, or None if no suitable patterns were found.
+        """
         try_harder = hints is not None and DecodeHintType.TRY_HARDER in hints
         max_i = self.image.get_height()
         max_j = self.image.get_width()
@@ -84,62 +104,43 @@ class FinderPatternFinder:
         if i_skip < self.MIN_SKIP or try_harder:
             i_skip = self.MIN_SKIP
 
+        # Các cửa sổ 5 đoạn thỏa tỉ lệ 1:1:3:1:1 của mọi hàng được tìm trước bằng NumPy
+        candidates = FinderPatternFinder.find_candidate_windows(self.image.get_run_index())
         done = False
-        state_count = [0] * 5
         i = i_skip - 1
 
         while i < max_i and not done:
-            # Xóa trạng thái đếm
-            FinderPatternFinder.do_clear_counts(state_count)
-            current_state = 0
-
-            j = 0
-            while j < max_j:
-                if self.image.get(j, i):  # Black pixel
-                    if (current_state & 1) == 1:  # Đang đếm pixel trắng
-                        current_state += 1
-                    state_count[current_state] += 1
-                else:  # White pixel
-                    if (current_state & 1) == 0:  # Đang đếm pixel đen
-                        if current_state == 4:  # Một mẫu hợp lệ?
-                            if self.found_pattern_cross(state_count):  # Đúng
-                                confirmed = self.handle_possible_center(state_count, i, j)
-                                if confirmed:
-                                    # Xem xét từng dòng khác
-                                    i_skip = 2
-                                    if self.has_skipped:
-                                        done = self.have_multiply_confirmed_centers()
-                                    else:
-                                        row_skip = self.find_row_skip()
-                                        if row_skip > state_count[2]:
-                                            # Bỏ qua các dòng một cách thận trọng
-                                            i += row_skip - state_count[2] - i_skip
-                                            j = max_j - 1
-                                else:
-                                    FinderPatternFinder.do_shift_counts2(state_count)
-                                    current_state = 3
-                                    continue
-
-                                # Xóa trạng thái để bắt đầu tìm kiếm lại
-                                current_state = 0
-                                FinderPatternFinder.do_clear_counts(state_count)
-                            else:  # Không hợp lệ, lùi lại hai bước
-                                FinderPatternFinder.do_shift_counts2(state_count)
-                                current_state = 3
-                        else:
-                            current_state += 1
-                            state_count[current_state] += 1
-                    else:  # Đang đếm pixel trắng
-                        state_count[current_state] += 1
-
-                j += 1
-
-            if self.found_pattern_cross(state_count):
-                confirmed = self.handle_possible_center(state_count, i, max_j)
-                if confirmed:
+            if rows is not None:
+                # Chỉ quét các dòng được phép: nhảy tới dòng được phép gần nhất phía dưới
+                k = bisect.bisect_left(rows, i)
+                if k == len(rows):
+                    break
+                i = rows[k]
+                if i >= max_i:
+                    break
+
+            # Cửa sổ kết thúc ở đoạn `window`; sau một tâm được xác nhận, máy trạng thái xóa bộ đếm
+            # nên cửa sổ kế tiếp có thể được xét phải kết thúc từ đoạn window + 6 trở đi
+            next_window = 0
+            for window, j, state_count in candidates.get(i, ()):
+                if window < next_window or not self.handle_possible_center(state_count, i, j):
+                    continue
+                next_window = window + 6
+                if j == max_j:  # Cửa sổ kết thúc ở cuối dòng
                     i_skip = state_count[0]
                     if self.has_skipped:
                         done = self.have_multiply_confirmed_centers()
+                else:
+                    # Xem xét từng dòng khác
+                    i_skip = 2
+                    if self.has_skipped:
+                        done = self.have_multiply_confirmed_centers()
+                    else:
+                        row_skip = self.find_row_skip()
+                        if row_skip > state_count[2]:
+                            # Bỏ qua các dòng một cách thận trọng và bỏ phần còn lại của dòng
+                            i += row_skip - state_count[2] - i_skip
+                            break
 
             i += i_skip
 
@@ -150,6 +151,42 @@ class FinderPatternFinder:
         ResultPoint.order_best_patterns(pattern_info)
         return FinderPatternInfo(pattern_info)
 
+    @staticmethod
+    def find_candidate_windows(run_index):
+        """
+        Batch candidate stage of find(): tests the 1:1:3:1:1 rule of found_pattern_cross on every
+        window of 5 consecutive runs (black-white-black-white-black) of every row at once.
+
+        :param run_index: BitMatrixRunIndex of the image.
+        :return: dict row -> list of (window, end_col, state_count) for the windows that pass,
+                 ordered by end_col; window is the index of the last run within its row.
+        """
+        rows, local, ends, lengths, blacks = run_index.row_run_arrays()
+        if len(rows) < 5:
+            return {}
+        starts = np.flatnonzero((rows[:-4] == rows[4:]) & blacks[:-4])
+        counts = np.lib.stride_tricks.sliding_window_view(lengths, 5)[starts]
+
+        # Same float operations as found_pattern_cross, evaluated over all windows
+        total_module_size = counts.sum(axis=1)
+        module_size = total_module_size / 7.0
+        max_variance = module_size / 2.0
+        passed = (
+            (total_module_size >= 7) &
+            (np.abs(module_size - counts[:, 0]) < max_variance) &
+            (np.abs(module_size - counts[:, 1]) < max_variance) &
+            (np.abs(3.0 * module_size - counts[:, 2]) < 3 * max_variance) &
+            (np.abs(module_size - counts[:, 3]) < max_variance) &
+            (np.abs(module_size - counts[:, 4]) < max_variance)
+        )
+        last = starts[passed] + 4
+
+        candidates = {}
+        for row, window, end, state_count in zip(rows[last].tolist(), local[last].tolist(),
+                                                 ends[last].tolist(), counts[passed].tolist()):
+            candidates.setdefault(row, []).append((window, end, state_count))
+        return candidates
+
     @staticmethod
     # each part of finder pattern only have below 50% variance
     def found_pattern_cross(state_count):
@@ -176,48 +213,59 @@ class FinderPatternFinder:
     def center_from_end(state_count, end):
         return (end - state_count[4] - state_count[3]) - state_count[2] / 2.0
 
-    def cross_check_vertical(self, start_y, center_x, max_count, original_state_count_total):
-        image = self.image
-        height = image.height
+    @staticmethod
+    def cross_check_runs(first_black, boundaries, start, max_count, original_state_count_total):
+        """
+        Kiểm tra tỉ lệ 1:1:3:1:1 dọc theo một hàng hoặc cột đã được chia thành các đoạn (run),
+        đi ngược từ `start` rồi xuôi từ `start + 1`, với cùng các giới hạn `max_count` như khi đếm từng pixel.
+
+        :param first_black: True nếu đoạn đầu tiên của hàng/cột là màu đen.
+        :param boundaries: Ranh giới các đoạn, từ 0 tới độ dài hàng/cột (xem BitMatrixRunIndex).
+        :return: Tâm của mẫu theo trục đang xét, hoặc nan nếu không hợp lệ.
+        """
+        length = boundaries[-1]
         state_count = [0] * 5
 
         # Start counting up from the center
-        y = start_y
-        while y >= 0 and image.get(center_x, y):
-            state_count[2] += 1
-            y -= 1
-        if y < 0:
+        run = bisect.bisect_right(boundaries, start) - 1
+        position = start
+        if ((run & 1) == 0) == first_black:  # count black
+            state_count[2] = position - boundaries[run] + 1
+            position = boundaries[run] - 1
+            run -= 1
+        if position < 0:
             return float('nan')
 
-        while y >= 0 and not image.get(center_x, y) and state_count[1] <= max_count:
-            state_count[1] += 1
-            y -= 1
-        if y < 0 or state_count[1] > max_count:
+        state_count[1] = position - boundaries[run] + 1  # count white
+        position = boundaries[run] - 1
+        run -= 1
+        if position < 0 or state_count[1] > max_count:
             return float('nan')
 
-        while y >= 0 and image.get(center_x, y) and state_count[0] <= max_count:
-            state_count[0] += 1
-            y -= 1
+        state_count[0] = position - boundaries[run] + 1  # count black
         if state_count[0] > max_count:
             return float('nan')
 
         # Start counting down from the center
-        y = start_y + 1
-        while y < height and image.get(center_x, y):
-            state_count[2] += 1
-            y += 1
-        if y == height:
+        position = start + 1
+        if position == length:
             return float('nan')
-
-        while y < height and not image.get(center_x, y) and state_count[3] < max_count:
-            state_count[3] += 1
-            y += 1
-        if y == height or state_count[3] >= max_count:
+        run = bisect.bisect_right(boundaries, position) - 1
+        if ((run & 1) == 0) == first_black:  # count black
+            state_count[2] += boundaries[run + 1] - position
+            position = boundaries[run + 1]
+            run += 1
+            if position == length:
+                return float('nan')
+
+        state_count[3] = boundaries[run + 1] - position  # count white
+        position = boundaries[run + 1]
+        run += 1
+        if position == length or state_count[3] >= max_count:
             return float('nan')
 
-        while y < height and image.get(center_x, y) and state_count[4] < max_count:
-            state_count[4] += 1
-            y += 1
+        state_count[4] = boundaries[run + 1] - position  # count black
+        position = boundaries[run + 1]
         if state_count[4] >= max_count:
             return float('nan')
 
@@ -227,97 +275,43 @@ class FinderPatternFinder:
             return float('nan')
 
         # Check for a valid finder pattern
-        return FinderPatternFinder.center_from_end(state_count, y) if self.found_pattern_cross(state_count) else float('nan')
+        return FinderPatternFinder.center_from_end(state_count, position) if FinderPatternFinder.found_pattern_cross(state_count) else float('nan')
 
-    def cross_check_horizontal(self,center_x, center_y, max_count, original_state_count_total):
-        width = self.image.get_width()
-        state_count = [0] * 5
-        x = int(center_x)
-        center_y = int(center_y)
-
-        # start count left from center_x in center_y row 
-        while x >= 0 and self.image.get(x,center_y): # count black
-            state_count[2] += 1
-            x -= 1
-        if x < 0:
-            return float('nan')
-        while x >= 0 and not self.image.get(x,center_y) and state_count[1] <= max_count: # count white
-            state_count[1] += 1
-            x -= 1
-        if x < 0 or state_count[1] > max_count:
-            return float('nan')
-        while x >= 0 and self.image.get(x,center_y) and state_count[0] <= max_count: # count black
-            state_count[0] += 1
-            x -= 1
-        if state_count[0] > max_count:
-            return float('nan')
-        
-        # start count right from center_y + 1 in center_y row
-        x = center_x + 1
-        while x < width and self.image.get(x,center_y): # count black
-            state_count[2] += 1
-            x += 1
-        if x == width:
-            return float('nan')
-        while x < width and not self.image.get(x,center_y) and state_count[3] < max_count: # count white
-            state_count[3] += 1
-            x += 1
-        if x == width or state_count[3] >= max_count:
-            return float('nan')
-        while x < width and self.image.get(x,center_y) and state_count[4] < max_count: # count black
-            state_count[4] += 1
-            x += 1
-        if state_count[4] >= max_count:
-            return float('nan')
-        
-          # If the total state count differs by more than 40%, it's a false positive
-        state_count_total = sum(state_count)
-        if 5 * abs(state_count_total - original_state_count_total) >= 2 * original_state_count_total:
-            return float('nan')
+    def cross_check_vertical(self, start_y, center_x, max_count, original_state_count_total):
+        first_black, boundaries = self.image.get_run_index().column_runs(center_x)
+        return FinderPatternFinder.cross_check_runs(first_black, boundaries, start_y, max_count, original_state_count_total)
 
-        # Check if it matches a finder pattern
-        return FinderPatternFinder.center_from_end(state_count, x) if self.found_pattern_cross(state_count) else float('nan')
+    def cross_check_horizontal(self,center_x, center_y, max_count, original_state_count_total):
+        first_black, boundaries = self.image.get_run_index().row_runs(int(center_y))
+        return FinderPatternFinder.cross_check_runs(first_black, boundaries, int(center_x), max_count, original_state_count_total)
 
+    @staticmethod
+    def leading_run_lengths(first_black, boundaries):
+        """
+        Trả về độ dài ba đoạn đầu tiên theo thứ tự đen - trắng - đen (0 nếu không có).
+        """
+        lengths = [boundaries[k + 1] - boundaries[k] for k in range(min(3, len(boundaries) - 1))]
+        if not first_black:
+            lengths.insert(0, 0)
+        return (lengths + [0, 0, 0])[:3]
 
     def cross_check_diagonal(self, center_y, center_x):
-        state_count = [0] * 5
-        
-        # Start counting up, left from center 
-        i = 0 
-        while center_y >= i and center_x >= i and self.image.get(center_x - i,center_y - i): # count black
-            state_count[2] += 1
-            i += 1
-        if state_count[2] == 0:
-            return False
-        while center_y >= i and center_x >= i and not self.image.get(center_x - i,center_y - i): # count white
-            state_count[1] += 1
-            i += 1
-        if state_count[1] == 0:
-            return False
-        while center_y >= i and center_x >= i and self.image.get(center_x - i,center_y - i): # count black
-            state_count[0] += 1
-            i += 1
-        if state_count[0] == 0:
+        run_index = self.image.get_run_index()
+
+        # Start counting up, left from center
+        up = FinderPatternFinder.leading_run_lengths(*run_index.diagonal_runs(center_x, center_y, -1))
+        state_count = [up[2], up[1], up[0], 0, 0]
+        if state_count[2] == 0 or state_count[1] == 0 or state_count[0] == 0:
             return False
 
         # Count down, right from center
-        width = self.image.get_width()
-        height = self.image.get_height()
-        i = 1
-        while center_y + i < height and center_x + i < width and self.image.get(center_x + i, center_y + i): # count black
-            state_count[2] += 1
-            i += 1
-        while center_y + i < height and center_x + i < width and not self.image.get(center_x + i, center_y + i): # count white
-            state_count[3] += 1
-            i += 1
-        if state_count[3] == 0:
-            return False
-        while center_y + i < height and center_x + i < width and self.image.get(center_x + i, center_y + i): # count black
-            state_count[4] += 1
-            i += 1
-        if state_count[4] == 0:
+        down = FinderPatternFinder.leading_run_lengths(*run_index.diagonal_runs(center_x + 1, center_y + 1, 1))
+        state_count[2] += down[0]
+        state_count[3] = down[1]
+        state_count[4] = down[2]
+        if state_count[3] == 0 or state_count[4] == 0:
             return False
-         
+
         return FinderPatternFinder.found_pattern_diagonal(state_count)
     
     @staticmethod
@@ -357,26 +351,21 @@ class FinderPatternFinder:
             if not math.isnan(center_width):
                 if self.cross_check_diagonal(int(center_height), int(center_width)):
                     estimated_module_size = state_count_total / 7.0
-                    found = False
-
-
-                    for i in range(0, len(self.possible_centers)):
-                        center = self.possible_centers[i]
-
-                        #Look for about the same center and module size:
-                        if center.about_equals(estimated_module_size, center_height, center_width):
-                            self.possible_centers[i] = center.combine_estimate(center_height, center_width, estimated_module_size)
-                            found = True
-                            break
-                    if not found:
-                    
+                    # Look for about the same center and module size
+                    index = self.center_grid.find_about_equal(self.possible_centers, estimated_module_size,
+                                                              center_height, center_width)
+                    if index >= 0:
+                        center = self.possible_centers[index]
+                        combined = center.combine_estimate(center_height, center_width, estimated_module_size)
+                        self.possible_centers[index] = combined
+                        self.center_grid.move(index, center, combined)
+                    else:
                         point = FinderPattern(center_width, center_height, estimated_module_size)
+                        self.center_grid.add(len(self.possible_centers), point)
                         self.possible_centers.append(point)
 
                         # CALL BACK WILL BE IMPLEMENTED HERE
                     return True
-                for i in range(0, len(self.possible_centers)):
-                    center = self.possible_centers[i]
             return False
         
     def have_multiply_confirmed_centers(self):
@@ -431,68 +420,87 @@ class FinderPatternFinder:
         return x * x + y * y
 
     def select_best_patterns(self):
-        start_size = len(self.possible_centers)
-        if start_size < 3:
-            # raise FinderPatternNotFoundException("Not enough finder patterns found.")
-            print("Not enough finder patterns found.")
+        """
+        Chooses the three confirmed centers that best form an isosceles right triangle.
+
+        Pairwise squared distances are computed once as a matrix; pairs whose module sizes differ by more than
+        MAX_MODULE_SIZE_RATIO or whose distance cannot separate two finder patterns of one symbol are pruned
+        before triples are enumerated (see enumerate_triples). The distortion of the triples sharing a first center
+        is evaluated in one pass, and a running minimum is kept across those chunks.
+
+        :return: list of three FinderPattern, or None if no suitable triple was found.
+        """
+        if len(self.possible_centers) < 3:
             return None
-        # Remove patterns that don't meet the count threshold
-        # Lọc các FinderPattern có `get_count()` >= CENTER_QUORUM
+        # Keep the confirmed centers, ordered by estimated module size
         self.possible_centers = [fp for fp in self.possible_centers if fp.get_count() >= self.CENTER_QUORUM]
+        self.possible_centers.sort(key=lambda x: x.get_estimated_module_size())
+        self.center_grid = FinderPatternGrid.from_centers(self.possible_centers)
+
+        best_distortion = float('inf')
+        best_triple = None
+        for triples, edges in FinderPatternFinder.enumerate_triples(self.possible_centers, self.MAX_MODULE_SIZE_RATIO):
+            # Check isosceles right triangle: with sorted squared edges a <= b <= c, c = 2a = 2b
+            a, b, c = np.sort(edges, axis=1).T
+            distortion = np.abs(c - 2 * b) + np.abs(c - 2 * a)
+            # Chunks and the triples within them are in lexicographic order, so keeping the first strict minimum
+            # selects the triple the former nested loops kept
+            index = int(np.argmin(distortion))
+            if distortion[index] < best_distortion:
+                best_distortion = distortion[index]
+                best_triple = triples[index].tolist()
+        if best_triple is None:
+            return None
+        i, j, k = best_triple
+        return [self.possible_centers[i], self.possible_centers[j], self.possible_centers[k]]
+
+    @staticmethod
+    def enumerate_triples(centers, max_module_size_ratio):
+        """
+        Enumerates the triples of centers that can be the three finder patterns of one symbol.
 
-        # # In ra danh sách các FinderPattern trước khi sắp xếp, với các thuộc tính `count` và `estimated_module_size`
-        # print("Before:")
-        # for fp in self.possible_centers:
-        #     print(f"FinderPattern(count={fp.get_count()}, estimated_module_size={fp.get_estimated_module_size()})")
+        A pair is kept when the larger module size is at most max_module_size_ratio times the smaller one and
+        the distance is between MIN_PATTERN_DISTANCE_MODULES and MAX_PATTERN_DISTANCE_MODULES modules. A triple
+        is kept when all three of its pairs are.
 
-        # Sắp xếp theo `estimated_module_size`
-        self.possible_centers.sort(key=lambda x: x.get_estimated_module_size())
+        Triples are produced in chunks, one per first index i, vectorized over the (j, k) pairs among the
+        centers paired with i, so memory grows with the square of the neighbourhood size rather than with
+        the number of triples.
 
-        # In ra danh sách các FinderPattern sau khi sắp xếp
-        # print("After:")
-        # for fp in self.possible_centers:
-        #     print(f"FinderPattern(count={fp.get_count()}, estimated_module_size={fp.get_estimated_module_size()})")
-        distortion = float('inf')
-        best_patterns = [None, None, None]
-
-        for i in range(len(self.possible_centers) - 2):
-            fpi = self.possible_centers[i]
-            min_module_size = fpi.get_estimated_module_size()
-
-            for j in range(i + 1, len(self.possible_centers) - 1):
-                fpj = self.possible_centers[j]
-                squares0 = FinderPatternFinder.squared_distance(fpi, fpj)
-
-                for k in range(j + 1, len(self.possible_centers)):
-                    fpk = self.possible_centers[k]
-                    max_module_size = fpk.get_estimated_module_size()
-                    if max_module_size > min_module_size * 1.4:
-                        # Module size is not similar
-                        continue
-
-                    a = squares0
-                    b = FinderPatternFinder.squared_distance(fpj, fpk)
-                    c = FinderPatternFinder.squared_distance(fpi, fpk)
-
-                    # Sort values a, b, c
-                    if a > b:
-                        a, b = b, a
-                    if b > c:
-                        b, c = c, b
-                    if a > b:
-                        a, b = b, a
-
-                    # Check isosceles right triangle
-                    d = abs(c - 2 * b) + abs(c - 2 * a)
-                    if d < distortion:
-                        distortion = d
-                        best_patterns = [fpi, fpj, fpk]
-
-        if distortion == float('inf'):
-            # raise FinderPatternNotFoundException("No suitable patterns found.")
-            print("No suitable patterns found")
-            return None
-        return best_patterns
+        :param centers: list of FinderPattern.
+        :param max_module_size_ratio: largest allowed ratio between module sizes within a triple.
+        :return: generator of (triples, edges) chunks: ndarray (T, 3) of indices i < j < k in lexicographic order
+                 (chunks are ordered by i), and ndarray (T, 3) of the squared distances (i, j), (j, k), (i, k).
+                 Empty chunks are skipped.
+        """
+        x = np.array([center.get_x() for center in centers], dtype=np.float64)
+        y = np.array([center.get_y() for center in centers], dtype=np.float64)
+        module_size = np.array([center.get_estimated_module_size() for center in centers], dtype=np.float64)
+
+        dx = x[:, None] - x[None, :]
+        dy = y[:, None] - y[None, :]
+        squared = dx * dx + dy * dy
+        smaller = np.minimum(module_size[:, None], module_size[None, :])
+        larger = np.maximum(module_size[:, None], module_size[None, :])
+        min_distance = FinderPatternFinder.MIN_PATTERN_DISTANCE_MODULES * larger
+        max_distance = FinderPatternFinder.MAX_PATTERN_DISTANCE_MODULES * smaller
+        pairs = (np.triu(larger <= max_module_size_ratio * smaller, 1) &
+                 (squared >= min_distance * min_distance) &
+                 (squared <= max_distance * max_distance))
+
+        for i in range(len(centers) - 2):
+            # Both j and k must pair with i, and k > j must pair with j
+            neighbours = np.flatnonzero(pairs[i])
+            if len(neighbours) < 2:
+                continue
+            second, third = np.nonzero(pairs[np.ix_(neighbours, neighbours)])
+            if len(second) == 0:
+                continue
+            j = neighbours[second]
+            k = neighbours[third]
+            triples = np.stack([np.full(len(j), i), j, k], axis=1)
+            edges = np.stack([squared[i, j], squared[j, k], squared[i, k]], axis=1)
+            yield triples, edges
 
     @staticmethod
     def do_clear_counts(counts):
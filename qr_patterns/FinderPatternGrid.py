@@ -0,0 +1,75 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+
+
+class FinderPatternGrid:
+    """
+    Uniform grid index over the finder pattern candidates of a FinderPatternFinder.
+
+    Candidates are bucketed by the cell containing their center. The merge lookup of handle_possible_center
+    only accepts a candidate within one estimated module size of the new center (see FinderPattern.about_equals),
+    so a query visits the few cells overlapping that square instead of every candidate found so far.
+    Buckets hold indices into the finder's possible_centers list, and a lookup returns the lowest matching index,
+    which is the candidate the former linear scan would have merged into.
+    """
+
+    # Side of a grid cell in pixels; larger than typical module sizes so a query touches at most a few cells
+    CELL_SIZE = 32.0
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = float(cell_size)
+        self.cells = {}
+
+    @staticmethod
+    def from_centers(centers, cell_size=CELL_SIZE):
+        """
+        Builds the index of an existing list of centers.
+        """
+        grid = FinderPatternGrid(cell_size)
+        for index, center in enumerate(centers):
+            grid.add(index, center)
+        return grid
+
+    def cell_of(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def add(self, index, center):
+        """
+        Registers possible_centers[index] = center.
+        """
+        self.cells.setdefault(self.cell_of(center.get_x(), center.get_y()), []).append(index)
+
+    def move(self, index, old_center, new_center):
+        """
+        Updates the bucket of possible_centers[index] after it was replaced by new_center (e.g. combine_estimate).
+        """
+        old_cell = self.cell_of(old_center.get_x(), old_center.get_y())
+        new_cell = self.cell_of(new_center.get_x(), new_center.get_y())
+        if old_cell == new_cell:
+            return
+        bucket = self.cells[old_cell]
+        bucket.remove(index)
+        if not bucket:
+            del self.cells[old_cell]
+        self.cells.setdefault(new_cell, []).append(index)
+
+    def find_about_equal(self, centers, module_size, i, j):
+        """
+        Finds the candidate a new center should be merged into.
+
+        :param centers: the indexed possible_centers list.
+        :param module_size: estimated module size of the new center.
+        :param i: row (y) of the new center.
+        :param j: column (x) of the new center.
+        :return: lowest index k such that centers[k].about_equals(module_size, i, j), or -1.
+        """
+        min_x, min_y = self.cell_of(j - module_size, i - module_size)
+        max_x, max_y = self.cell_of(j + module_size, i + module_size)
+        best = -1
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                for index in self.cells.get((cell_x, cell_y), ()):
+                    if (best < 0 or index < best) and centers[index].about_equals(module_size, i, j):
+                        best = index
+        return best
@@ -0,0 +1,40 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+from .Detector import Detector
+from .MultiFinderPatternFinder import MultiFinderPatternFinder
+from exceptions import FormatException, NotFoundException
+from enums import DecodeHintType
+
+
+class MultiDetector(Detector):
+    """
+    Detects every QR Code in an image. The finder pattern search runs once over the whole BitMatrix
+    (see MultiFinderPatternFinder) and each disjoint triple is then processed like a single detection.
+    """
+
+    def detect_multi(self, hints=None):
+        """
+        Detects all QR Codes in the image.
+
+        :param hints: Optional hints for the detection process (default is None).
+        :return: list of DetectorResult, one per symbol that could be sampled; empty if none was found.
+        """
+        if hints is None:
+            self.result_point_callback = None
+        else:
+            self.result_point_callback = hints.get(DecodeHintType.NEED_RESULT_POINT_CALLBACK, None)
+
+        finder = MultiFinderPatternFinder(self.image, self.result_point_callback)
+        infos = finder.find_multi(hints)
+        self.possible_centers = finder.get_possible_centers()
+
+        results = []
+        for info in infos:
+            try:
+                result = self.process_finder_pattern_info(info)
+            except (NotFoundException, FormatException):
+                continue
+            if result is not None:
+                results.append(result)
+        return results
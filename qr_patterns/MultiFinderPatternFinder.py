@@ -0,0 +1,125 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+import numpy as np
+from .FinderPatternFinder import FinderPatternFinder
+from .FinderPatternInfo import FinderPatternInfo
+from .ResultPoint import ResultPoint
+
+
+class MultiFinderPatternFinder(FinderPatternFinder):
+    """
+    Finds the finder patterns of every QR Code in an image.
+
+    The image is scanned once, every MIN_SKIP rows and without the early exit and adaptive row skipping of
+    FinderPatternFinder.find, so every finder pattern is confirmed. The confirmed centers are then clustered into
+    disjoint triples. The candidate triples left after pair pruning (see FinderPatternFinder.enumerate_triples)
+    are scored chunk by chunk, and triples are accepted greedily from the lowest distortion upward, skipping any
+    triple that reuses an already accepted center.
+    """
+
+    # Largest relative difference between the module sizes of the three patterns of one symbol
+    MAX_MODULE_SIZE_DIFFERENCE = 0.5
+    # Largest relative difference between the two legs, and between the hypotenuse and its expected length
+    MAX_EDGE_DIFFERENCE = 0.1
+    # Bounds on the estimated number of modules between two finder pattern centers (versions 1 to 40)
+    MIN_MODULE_COUNT_PER_EDGE = 9
+    MAX_MODULE_COUNT_PER_EDGE = 180
+
+    def find_multi(self, hints=None):
+        """
+        Searches the image for the finder patterns of all QR Codes.
+
+        :param hints: Optional decode hints.
+        :return: list of FinderPatternInfo, one per symbol, best triples first; empty if none was found.
+        """
+        # The row step of find() assumes one symbol spanning the image; several symbols per frame are each
+        # much smaller, so every MIN_SKIP-th row is scanned (the candidate windows are precomputed for all rows)
+        max_i = self.image.get_height()
+        i_skip = self.MIN_SKIP
+
+        candidates = FinderPatternFinder.find_candidate_windows(self.image.get_run_index())
+        for i in range(i_skip - 1, max_i, i_skip):
+            next_window = 0
+            for window, j, state_count in candidates.get(i, ()):
+                if window < next_window or not self.handle_possible_center(state_count, i, j):
+                    continue
+                next_window = window + 6
+
+        infos = []
+        for patterns in self.select_multiple_best_patterns():
+            ResultPoint.order_best_patterns(patterns)
+            infos.append(FinderPatternInfo(patterns))
+        return infos
+
+    def select_multiple_best_patterns(self):
+        """
+        Clusters the confirmed centers into disjoint triples that look like the three finder patterns of one symbol.
+
+        :return: list of [FinderPattern, FinderPattern, FinderPattern], lowest distortion first.
+        """
+        centers = [center for center in self.possible_centers if center.get_count() >= self.CENTER_QUORUM]
+        if len(centers) < 3:
+            return []
+
+        triples, distortion = MultiFinderPatternFinder.score_triples(centers)
+        order = np.argsort(distortion, kind="stable")
+        used = np.zeros(len(centers), dtype=bool)
+        selected = []
+        for i, j, k in triples[order].tolist():
+            if used[i] or used[j] or used[k]:
+                continue
+            used[[i, j, k]] = True
+            selected.append([centers[i], centers[j], centers[k]])
+        return selected
+
+    @staticmethod
+    def score_triples(centers):
+        """
+        Scores the candidate triples of centers at once.
+
+        :param centers: list of FinderPattern.
+        :return: (triples, distortion): ndarray (T, 3) of center indices for the plausible triples and ndarray (T,)
+                 of their distortion |c - 2b| + |c - 2a| over the sorted squared edges a <= b <= c, normalized by c.
+                 A triple is plausible when its module sizes agree, its two legs have about the same length and
+                 the hypotenuse is about sqrt(2) times a leg, with a module count per edge that fits a version.
+        """
+        module_size = np.array([center.get_estimated_module_size() for center in centers], dtype=np.float64)
+        kept_triples = []
+        kept_distortion = []
+        for triples, edges in FinderPatternFinder.enumerate_triples(
+                centers, 1.0 + MultiFinderPatternFinder.MAX_MODULE_SIZE_DIFFERENCE):
+            # Only the plausible triples of each chunk are kept
+            plausible, distortion = MultiFinderPatternFinder.score_chunk(edges, module_size[triples])
+            kept_triples.append(triples[plausible])
+            kept_distortion.append(distortion[plausible])
+        if not kept_triples:
+            return np.empty((0, 3), dtype=np.intp), np.empty(0, dtype=np.float64)
+        return np.concatenate(kept_triples), np.concatenate(kept_distortion)
+
+    @staticmethod
+    def score_chunk(edges, sizes):
+        """
+        Scores one chunk of triples.
+
+        :param edges: ndarray (T, 3) of the squared edge lengths of each triple.
+        :param sizes: ndarray (T, 3) of the estimated module sizes of the three centers.
+        :return: (plausible, distortion): ndarray bool (T,) and ndarray (T,), see score_triples.
+        """
+        edges = np.sort(edges, axis=1)
+        a, b, c = edges.T
+
+        legs = np.sqrt(edges[:, :2])
+        hypotenuse = np.sqrt(c)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            leg_difference = (legs[:, 1] - legs[:, 0]) / legs[:, 0]
+            expected_hypotenuse = np.sqrt(a + b)
+            hypotenuse_difference = (np.abs(hypotenuse - expected_hypotenuse) /
+                                     np.minimum(hypotenuse, expected_hypotenuse))
+            module_count = legs.sum(axis=1) / (2 * sizes.mean(axis=1))
+            distortion = (np.abs(c - 2 * b) + np.abs(c - 2 * a)) / c
+        plausible = ((leg_difference < MultiFinderPatternFinder.MAX_EDGE_DIFFERENCE) &
+                     (hypotenuse_difference < MultiFinderPatternFinder.MAX_EDGE_DIFFERENCE) &
+                     (module_count >= MultiFinderPatternFinder.MIN_MODULE_COUNT_PER_EDGE) &
+                     (module_count <= MultiFinderPatternFinder.MAX_MODULE_COUNT_PER_EDGE))
+        return plausible, distortion
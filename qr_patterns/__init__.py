@@ -1,7 +1,10 @@
 from .Detector import Detector
+from .MultiDetector import MultiDetector
 from .DetectorResult import DetectorResult
 from .FinderPattern import FinderPattern
 from .FinderPatternInfo import FinderPatternInfo
+from .FinderPatternFinder import FinderPatternFinder
+from .MultiFinderPatternFinder import MultiFinderPatternFinder
 from .ResultPoint import ResultPoint
 from .AlignmentPatternFinder import AlignmentPatternFinder
 from .AlignmentPattern import AlignmentPattern
\ No newline at end of file
@@ -84,6 +84,14 @@ class BitArray:
     def set_bulk(self, i, new_bits):
         self.bits[i // 32] = new_bits
 
+    def set_bool_array(self, array):
+        # Đặt bit i cho mọi phần tử True array[i] (bắt đầu từ vị trí 0), đóng gói hàng loạt bằng np.packbits
+        array = np.asarray(array, dtype=bool)
+        words = (len(array) + 31) // 32
+        padded = np.zeros(words * 32, dtype=bool)
+        padded[:len(array)] = array
+        self.bits[:words] |= np.packbits(padded, bitorder="little").view("<u4").astype(np.uint32)
+
 
     def set_range(self, start, end):
         if end < start or start < 0 or end > self.size:
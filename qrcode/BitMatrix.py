@@ -3,6 +3,7 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
 import numpy as np
 from .BitArray import BitArray
+from .BitMatrixRunIndex import BitMatrixRunIndex
 
 class BitMatrix():
     """
@@ -44,6 +45,9 @@ class BitMatrix():
         # Kiểm tra nếu chiều rộng hoặc chiều cao nhỏ hơn 1
         if self.width < 1 or self.height < 1:
             raise ValueError("Both dimensions must be greater than 0")
+
+        # Chỉ mục run-length, chỉ được tạo khi bộ quét yêu cầu (xem get_run_index)
+        self._run_index = None
         
 
     @staticmethod
@@ -57,22 +61,37 @@ class BitMatrix():
         Quy trình thực hiện:
         - Tính toán chiều cao và chiều rộng của ảnh từ mảng `image`.
         - Tạo một đối tượng BitMatrix với kích thước chiều cao và chiều rộng của ảnh.
-        - Duyệt qua từng pixel trong ảnh và nếu pixel có giá trị `True` (màu sáng), đặt bit tại vị trí tương ứng trong BitMatrix thành 1.
+        - Đóng gói toàn bộ mảng vào các word của BitMatrix bằng `from_bool_array`, pixel `True` tại hàng i, cột j
+          tương ứng với bit (x=j, y=i).
         
         Trả về:
         - Đối tượng `BitMatrix` đã được khởi tạo và các bit được thiết lập từ mảng ảnh.
         """
-        height = len(image)
-        width = len(image[0])
-        bits = BitMatrix(width, height)
-        
-        for i in range(height):
-            image_row = image[i]
-            for j in range(width):
-                if image_row[j]:
-                    bits.set(i, j)  # Đặt bit 1 tại vị trí (i, j)
-        
-        return bits
+        return BitMatrix.from_bool_array(image)
+
+    @staticmethod
+    def from_bool_array(array):
+        """
+        Tạo BitMatrix từ một mảng 2D kiểu boolean bằng cách đóng gói hàng loạt thay vì gọi `set` cho từng bit.
+
+        - `array`: ndarray (hoặc danh sách lồng nhau) kích thước (height, width), phần tử `True` là bit 1.
+
+        Mỗi hàng được đệm tới bội số của 32 bit rồi đóng gói bằng `np.packbits` theo thứ tự bit thấp trước,
+        đúng với bố cục word uint32 mà `get`/`set` sử dụng.
+
+        Trả về:
+        - Đối tượng `BitMatrix` có width = số cột và height = số hàng của mảng.
+        """
+        array = np.asarray(array, dtype=bool)
+        if array.ndim != 2:
+            raise ValueError("Mảng đầu vào phải có 2 chiều")
+        height, width = array.shape
+        matrix = BitMatrix(width, height)
+        padded = np.zeros((height, matrix.row_size * 32), dtype=bool)
+        padded[:, :width] = array
+        packed = np.packbits(padded, axis=1, bitorder="little")
+        matrix.bits = packed.view("<u4").astype(np.uint32).ravel()
+        return matrix
     
 
     @staticmethod
@@ -164,6 +183,7 @@ class BitMatrix():
        
         offset = y * self.row_size + (x // 32)
         self.bits[offset] |= 1 << (x & 0x1f)
+        self._run_index = None
         
     def unset(self, x, y):
         """
@@ -174,6 +194,7 @@ class BitMatrix():
         """
         offset = y * self.row_size + (x // 32)
         self.bits[offset] &= ~(1 << (x & 0x1f))
+        self._run_index = None
 
     def flip(self, x, y):
         """
@@ -184,6 +205,7 @@ class BitMatrix():
         """
         offset = y * self.row_size + (x // 32)
         self.bits[offset] ^= 1 << (x & 0x1f)
+        self._run_index = None
 
 
     def flip_all(self):
@@ -193,6 +215,7 @@ class BitMatrix():
         max_bits = len(self.bits)
         for i in range(max_bits):
             self.bits[i] = ~self.bits[i]
+        self._run_index = None
 
     def xor(self, mask):
         """
@@ -209,12 +232,14 @@ class BitMatrix():
             offset = y * self.row_size
             for x in range(self.row_size):
                 self.bits[offset + x] ^= mask.bits[offset + x]
+        self._run_index = None
 
     def clear(self):
         """
         Xóa tất cả các bit trong ma trận (đặt tất cả các bit về false).
         """
         self.bits.fill(0)
+        self._run_index = None
 
 
     def set_region(self, left, top, width, height):
@@ -248,7 +273,7 @@ class BitMatrix():
             offset = y * self.row_size
             for x in range(left, right):
                 self.bits[offset + (x // 32)] |= 1 << (x & 0x1f)
-
+        self._run_index = None
 
 
     def get_row(self, y, row=None):
@@ -281,6 +306,7 @@ class BitMatrix():
         - row: Đối tượng BitArray chứa dữ liệu cần sao chép vào hàng trong ma trận.
         """
         self.bits[y * self.row_size: (y + 1) * self.row_size] = row.bits[:self.row_size]
+        self._run_index = None
 
     def rotate(self, degrees):
         """
@@ -307,47 +333,42 @@ class BitMatrix():
         """
         Chỉnh sửa ma trận này sao cho nó quay 180 độ.
 
-        Hàm sẽ đảo ngược từng hàng, rồi hoán đổi vị trí các hàng đối diện nhau.
+        Hàm giải nén ma trận thành mảng boolean, quay bằng `np.rot90` rồi đóng gói lại.
+        Kết quả bằng đúng b[::-1, ::-1]; bản cũ (đảo từng hàng qua BitArray.reverse) không cho ra phép quay 180 độ.
         """
-        max_height = (self.height + 1) // 2
-        for i in range(max_height):
-            top_row = self.get_row(i)
-            bottom_row_index = self.height - 1 - i
-            bottom_row = self.get_row(bottom_row_index)
-            
-            # Đảo ngược các hàng
-            top_row.reverse()
-            bottom_row.reverse()
-
-            # Đặt lại các hàng đã đảo ngược vào đúng vị trí
-            self.set_row(i, bottom_row)
-            self.set_row(bottom_row_index, top_row)
+        self._assign_bool_array(np.rot90(self.to_bool_array(), 2))
 
     def rotate_90(self):
         """
         Chỉnh sửa ma trận này sao cho nó quay 90 độ theo chiều ngược kim đồng hồ.
 
-        Hàm tạo ra một ma trận mới với chiều rộng và chiều cao hoán đổi cho nhau.
+        Hàm tạo ra một ma trận mới với chiều rộng và chiều cao hoán đổi cho nhau,
+        thông qua `to_bool_array` và `np.rot90` thay vì duyệt từng bit.
         """
-        new_width = self.height
-        new_height = self.width
-        new_row_size = (new_width + 31) // 32
-        new_bits = [0] * (new_row_size * new_height)
+        self._assign_bool_array(np.rot90(self.to_bool_array(), 1))
 
-        for y in range(self.height):
-            for x in range(self.width):
-                # Tính toán vị trí offset trong ma trận cũ
-                offset = y * self.row_size + (x // 32)
-                if (self.bits[offset] >> (x & 0x1f)) & 1:
-                    # Tính toán vị trí mới trong ma trận quay 90 độ
-                    new_offset = (new_height - 1 - x) * new_row_size + (y // 32)
-                    new_bits[new_offset] |= 1 << (y & 0x1f)
+    def _assign_bool_array(self, array):
+        """
+        Thay nội dung (kể cả kích thước) của ma trận này bằng một mảng 2D kiểu boolean.
+        """
+        matrix = BitMatrix.from_bool_array(array)
+        self.width = matrix.width
+        self.height = matrix.height
+        self.row_size = matrix.row_size
+        self.bits = matrix.bits
+        self._run_index = None
 
-        # Cập nhật lại kích thước và dữ liệu của ma trận
-        self.width = new_width
-        self.height = new_height
-        self.row_size = new_row_size
-        self.bits = new_bits
+    def get_run_index(self):
+        """
+        Trả về chỉ mục run-length (BitMatrixRunIndex) của ma trận, tạo lười ở lần gọi đầu tiên.
+
+        Vị trí chuyển màu của mọi hàng và cột được tính trong một lượt vector hóa, cho phép các bộ quét
+        (FinderPatternFinder, AlignmentPatternFinder) duyệt theo từng đoạn thay vì từng pixel.
+        Chỉ mục bị hủy khi ma trận bị thay đổi qua các phương thức set/unset/flip/xor/clear/set_region/set_row/rotate.
+        """
+        if self._run_index is None:
+            self._run_index = BitMatrixRunIndex(self.to_bool_array())
+        return self._run_index
 
 
     def get_enclosing_rectangle(self):
@@ -556,12 +577,8 @@ class BitMatrix():
         Trả về:
         - str: chuỗi đại diện của ma trận.
         """
-        result = []
-        for y in range(self.height):
-            for x in range(self.width):
-                result.append(set_string if self.get(x, y) else unset_string)
-            result.append(line_separator)
-        return ''.join(result)
+        cells = np.where(self.to_bool_array(), set_string, unset_string)
+        return ''.join(''.join(row) + line_separator for row in cells.tolist())
 
     def clone(self):
         """
@@ -572,12 +589,28 @@ class BitMatrix():
         """
         return BitMatrix(self.width, self.height, self.row_size, self.bits[:])
 
+    def to_bool_array(self):
+        """
+        Giải nén ma trận thành mảng 2D kiểu boolean (height, width) bằng `np.unpackbits`.
+
+        Trả về:
+        - ndarray kiểu bool, phần tử [y, x] bằng `get(x, y)`.
+        """
+        words = np.asarray(self.bits, dtype=np.uint32).reshape(self.height, self.row_size)
+        unpacked = np.unpackbits(words.astype("<u4").view(np.uint8), axis=1, bitorder="little")
+        return unpacked[:, :self.width].astype(bool)
+
+    def to_uint8_image(self, black=0, white=255):
+        """
+        Chuyển ma trận thành ảnh xám uint8, bit 1 (màu đen) nhận giá trị `black`, bit 0 nhận giá trị `white`.
+
+        Trả về:
+        - ndarray uint8 kích thước (height, width).
+        """
+        return np.where(self.to_bool_array(), np.uint8(black), np.uint8(white)).astype(np.uint8)
+
     def bitmatrix_to_image(self):
-        img = []
-        for y in range(self.get_height()):
-            row = []
-            for x in range(self.get_width()):
-                row.append(1 - np.uint8(self.get(x, y)))
-            img.append(row)
-        img = np.array(img, dtype=np.uint8)
-        return img
\ No newline at end of file
+        """
+        Chuyển ma trận thành ảnh nhị phân uint8 với 0 là màu đen và 1 là màu trắng.
+        """
+        return self.to_uint8_image(0, 1)
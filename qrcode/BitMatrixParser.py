@@ -1,26 +1,29 @@
 import sys 
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+import numpy as np
 from exceptions import FormatException
-print(FormatException.get_format_instance())
 from decoder import FormatInformation
-from .Version import Version
-from enums import DataMask
 from .Version import VersionManager
 from enums.DataMask import DataMask
 class BitMatrixParser:
 
-    def __init__(self, bit_matrix):
+    def __init__(self, bit_matrix, confidence=None):
         """
         Hàm khởi tạo cho đối tượng BitMatrixParser.
         - Input: bit_matrix (BitMatrix): Đối tượng BitMatrix cần phân tích.
+                 confidence (ndarray, tùy chọn): Độ tin cậy (height, width) của từng module do bộ lấy mẫu cung cấp.
         - Hàm kiểm tra xem chiều cao của BitMatrix có hợp lệ (>= 21 và chia cho 4 dư 1) không.
         - Output: None (nếu không hợp lệ, sẽ ném ra ngoại lệ FormatException).
         """
         self.bit_matrix = bit_matrix
         self.parsed_version = None
         self.parsed_format_info = None
-        self.mirror = False
+        self.mirrored = False
+        self.modules = None
+        self.confidence = confidence
+        # Độ tin cậy của từng codeword (nhỏ nhất trong 8 module của nó), được tính trong read_codewords
+        self.codeword_confidence = None
         
         dimension = bit_matrix.get_height()
         if dimension < 21 or (dimension & 0x03) != 1:
@@ -85,7 +88,7 @@ class BitMatrixParser:
             for i in range(dimension - 9, ij_min - 1, -1):
                 version_bits = self.copy_bit(i, j, version_bits)
 
-        parsed_version = Version.decode_version_information(version_bits)
+        parsed_version = VersionManager.decode_version_information(version_bits)
         if parsed_version is not None and parsed_version.get_dimension_for_version() == dimension:
             self.parsed_version = parsed_version
             return parsed_version
@@ -96,7 +99,7 @@ class BitMatrixParser:
             for j in range(dimension - 9, ij_min - 1, -1):
                 version_bits = self.copy_bit(i, j, version_bits)
 
-        parsed_version = Version.decode_version_information(version_bits)
+        parsed_version = VersionManager.decode_version_information(version_bits)
         if parsed_version is not None and parsed_version.get_dimension_for_version() == dimension:
             self.parsed_version = parsed_version
             return parsed_version
@@ -111,76 +114,72 @@ class BitMatrixParser:
             version_bits (int): Biến chứa các bit đã sao chép.
         - Output: Trả về version_bits với bit mới được sao chép.
         """
-        bit = self.bit_matrix.get(j, i) if not self.mirror else self.bit_matrix.get(i, j)
+        modules = self.get_modules()
+        bit = modules[i, j] if self.mirrored else modules[j, i]
         return (version_bits << 1) | 0x1 if bit else version_bits << 1
 
     def read_codewords(self):
         """
         Đọc các mã codewords trong BitMatrix theo đúng thứ tự, tái tạo lại các byte chứa mã QR Code.
         - Input: None.
-        - Hàm sẽ đọc thông tin mã hóa từ QR Code và trả về mảng byte chứa các codeword.
+        - Hàm lấy các module dữ liệu theo bảng tọa độ của phiên bản (Version.get_data_module_coordinates),
+          bỏ mask bằng phép XOR với mặt nạ đã tính sẵn (DataMask.get_mask_array) rồi đóng gói 8 bit thành một byte.
+          Khi parser ở chế độ gương (set_mirror), tọa độ được chuyển vị. BitMatrix không bị thay đổi.
         - Output: Trả về mảng byte chứa codewords của QR Code.
         - Nếu không đọc đúng số byte mong muốn, sẽ ném ra ngoại lệ FormatException.
         """
-        DATA_MASKS = {
-            0: DataMask000,
-            1: DataMask001,
-            2: DataMask010,
-            3: DataMask011,
-            4: DataMask100,
-            5: DataMask101,
-            6: DataMask110,
-            7: DataMask111,
-        }
         format_info = self.read_format_information()
         version = self.read_version()
 
-        # Lấy data mask cho định dạng QR Code, loại bỏ các bit không cần thiết.
-        data_mask = DataMask.values()[format_info.get_data_mask()]
         dimension = self.bit_matrix.get_height()
-        data_mask.unmask_bit_matrix(self.bit_matrix, dimension)
-
-        function_pattern = version.build_function_pattern()
-
-        reading_up = True
-        result = bytearray(version.get_total_codewords())
-        result_offset = 0
-        current_byte = 0
-        bits_read = 0
-
-        # Đọc cột theo cặp từ phải sang trái
-        for j in range(dimension - 1, 0, -2):
-            if j == 6:
-                j -= 1
-            for count in range(dimension):
-                i = dimension - 1 - count if reading_up else count
-                for col in range(2):
-                    if not function_pattern.get(j - col, i):
-                        bits_read += 1
-                        current_byte <<= 1
-                        if self.bit_matrix.get(j - col, i):
-                            current_byte |= 1
-                        if bits_read == 8:
-                            result[result_offset] = current_byte
-                            result_offset += 1
-                            bits_read = 0
-                            current_byte = 0
-            reading_up ^= True  # Thay đổi chiều đọc
-        if result_offset != version.get_total_codewords():
+        if version.get_dimension_for_version() != dimension:
+            raise FormatException.get_format_instance()
+        rows, cols = version.get_data_module_coordinates()
+        if len(rows) != version.get_total_codewords() * 8:
             raise FormatException.get_format_instance()
-        return bytes(result)
+        # Mã lật gương là chuyển vị của mã thường: chỉ cần đổi vai trò hàng / cột khi lấy mẫu,
+        # mặt nạ vẫn tính theo tọa độ của ký hiệu
+        sample_rows, sample_cols = (cols, rows) if self.mirrored else (rows, cols)
+
+        data_mask = DataMask.values()[format_info.get_data_mask()]
+        modules = self.get_modules()[sample_rows, sample_cols] ^ data_mask.get_mask_array(dimension)[rows, cols]
+
+        if self.confidence is not None:
+            # Độ tin cậy của một codeword là độ tin cậy nhỏ nhất trong 8 module của nó
+            confidence = np.asarray(self.confidence)[sample_rows, sample_cols]
+            self.codeword_confidence = confidence.reshape(-1, 8).min(axis=1)
+        else:
+            self.codeword_confidence = None
+        return np.packbits(modules).tobytes()
+
+    def get_modules(self):
+        """
+        Trả về ma trận dạng ndarray bool (height, width), được giải nén một lần và dùng lại cho lần đọc gương.
+        - Input: None.
+        - Output: ndarray bool, phần tử [y, x] bằng bit_matrix.get(x, y).
+        """
+        if self.modules is None:
+            self.modules = self.bit_matrix.to_bool_array()
+        return self.modules
+
+    def get_low_confidence_codewords(self, threshold):
+        """
+        Trả về chỉ số (theo thứ tự đọc của read_codewords) các codeword có độ tin cậy nhỏ hơn threshold.
+        - Input: threshold (float): Ngưỡng độ tin cậy trong [0, 1].
+        - Output: Danh sách chỉ số codeword, rỗng nếu không có thông tin độ tin cậy hoặc chưa đọc codewords.
+        """
+        if self.codeword_confidence is None:
+            return []
+        return np.flatnonzero(self.codeword_confidence < threshold).tolist()
 
     def remask(self):
         """
-        Đảo ngược việc bỏ mask khi đọc codewords. Trả lại BitMatrix về trạng thái ban đầu.
+        Trả lại BitMatrix về trạng thái ban đầu sau khi đọc codewords.
         - Input: None.
-        - Output: Không có trả về. Chỉ thực hiện thao tác đảo ngược mask.
+        - Output: Không có trả về. read_codewords không bỏ mask tại chỗ nên ma trận luôn giữ nguyên,
+          hàm này không cần làm gì và chỉ được giữ lại cho các nơi gọi theo thứ tự remask / mirror.
         """
-        if self.parsed_format_info is None:
-            return  # Không có format info, không có data mask để bỏ
-        data_mask = DataMask.values()[self.parsed_format_info.get_data_mask()]
-        dimension = self.bit_matrix.get_height()
-        data_mask.unmask_bit_matrix(self.bit_matrix, dimension)
+        pass
 
     def set_mirror(self, mirror):
         """
@@ -190,16 +189,13 @@ class BitMatrixParser:
         """
         self.parsed_version = None
         self.parsed_format_info = None
-        self.mirror = mirror
+        self.mirrored = mirror
 
     def mirror(self):
         """
-        Lật ngược BitMatrix để thử đọc lại từ gương (mirrored) nếu cần.
+        Chuẩn bị đọc lại mã dạng gương (mirrored).
         - Input: None.
-        - Output: Thực hiện đảo ngược (flip) các bit trong BitMatrix.
+        - Output: Không có trả về. Ma trận và độ tin cậy không bị chuyển vị: read_codewords đọc theo tọa độ
+          chuyển vị khi cờ mirror (set_mirror) được bật, nên hàm này không cần làm gì.
         """
-        for x in range(self.bit_matrix.get_width()):
-            for y in range(x + 1, self.bit_matrix.get_height()):
-                if self.bit_matrix.get(x, y) != self.bit_matrix.get(y, x):
-                    self.bit_matrix.flip(y, x)
-                    self.bit_matrix.flip(x, y)
+        pass
@@ -0,0 +1,115 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+import numpy as np
+
+
+class BitMatrixRunIndex():
+    """
+    Chỉ mục run-length của một BitMatrix, dùng cho các bộ quét chỉ quan tâm tới độ dài các đoạn pixel cùng màu.
+
+    Property:
+    - array: ndarray bool (height, width), bản giải nén của ma trận tại thời điểm tạo chỉ mục
+    - width: int
+    - height: int
+
+    Vị trí chuyển màu của mọi hàng và mọi cột được tính trong một lượt vector hóa khi tạo chỉ mục.
+    Mỗi hàng/cột được trả về dưới dạng (first_black, boundaries):
+    - first_black: True nếu đoạn đầu tiên là màu đen (bit 1).
+    - boundaries: danh sách int tăng dần, bắt đầu bằng 0 và kết thúc bằng độ dài của hàng/cột;
+      đoạn thứ k chiếm [boundaries[k], boundaries[k + 1]) và có màu xen kẽ bắt đầu từ first_black.
+    """
+    def __init__(self, array):
+        self.array = array
+        self.height, self.width = array.shape
+        self._rows = BitMatrixRunIndex.build_line_transitions(array)
+        self._columns = BitMatrixRunIndex.build_line_transitions(array.T)
+        self._row_cache = {}
+        self._column_cache = {}
+        self._row_run_arrays = None
+
+    @staticmethod
+    def build_line_transitions(array):
+        """
+        Tính vị trí chuyển màu của tất cả các hàng trong mảng 2D kiểu boolean.
+
+        Trả về:
+        - first: ndarray bool, màu của pixel đầu tiên mỗi hàng.
+        - pointers: ndarray int, vị trí chuyển màu của hàng r nằm trong positions[pointers[r]:pointers[r + 1]].
+        - positions: ndarray int, chỉ số pixel đầu tiên của mỗi đoạn mới.
+        """
+        lines = array.shape[0]
+        change_lines, change_positions = np.nonzero(array[:, 1:] != array[:, :-1])
+        pointers = np.zeros(lines + 1, dtype=np.int64)
+        np.cumsum(np.bincount(change_lines, minlength=lines), out=pointers[1:])
+        return array[:, 0].copy(), pointers, change_positions + 1
+
+    @staticmethod
+    def _line_runs(transitions, cache, index, length):
+        runs = cache.get(index)
+        if runs is None:
+            first, pointers, positions = transitions
+            boundaries = [0]
+            boundaries.extend(positions[pointers[index]:pointers[index + 1]].tolist())
+            boundaries.append(length)
+            runs = (bool(first[index]), boundaries)
+            cache[index] = runs
+        return runs
+
+    def row_runs(self, y):
+        """
+        Trả về (first_black, boundaries) của hàng y.
+        """
+        return BitMatrixRunIndex._line_runs(self._rows, self._row_cache, y, self.width)
+
+    def column_runs(self, x):
+        """
+        Trả về (first_black, boundaries) của cột x.
+        """
+        return BitMatrixRunIndex._line_runs(self._columns, self._column_cache, x, self.height)
+
+    def row_run_arrays(self):
+        """
+        Trả về toàn bộ các đoạn của mọi hàng dưới dạng các mảng phẳng (tính một lần và lưu lại):
+        - rows: chỉ số hàng của từng đoạn.
+        - local: thứ tự của đoạn trong hàng (0 là đoạn đầu tiên).
+        - ends: vị trí ngay sau pixel cuối cùng của đoạn.
+        - lengths: độ dài đoạn.
+        - blacks: True nếu đoạn màu đen.
+        Các đoạn được sắp theo hàng rồi theo vị trí, nên các đoạn liên tiếp của cùng một hàng nằm cạnh nhau.
+        """
+        if self._row_run_arrays is None:
+            first, pointers, positions = self._rows
+            runs_per_row = np.diff(pointers) + 1
+            first_runs = pointers[:-1] + np.arange(self.height)
+            rows = np.repeat(np.arange(self.height), runs_per_row)
+            local = np.arange(len(rows)) - first_runs[rows]
+
+            starts = np.zeros(len(rows), dtype=np.int64)
+            starts[local != 0] = positions
+            ends = np.empty_like(starts)
+            ends[:-1] = starts[1:]
+            ends[first_runs + runs_per_row - 1] = self.width
+
+            blacks = first[rows] ^ ((local & 1) == 1)
+            self._row_run_arrays = (rows, local, ends, ends - starts, blacks)
+        return self._row_run_arrays
+
+    def diagonal_runs(self, x, y, step):
+        """
+        Trả về (first_black, boundaries) của đường chéo bắt đầu tại (x, y) và đi theo hướng (step, step)
+        cho tới mép ảnh. Các vị trí trong boundaries tính theo số bước kể từ (x, y).
+        Nếu (x, y) nằm ngoài ảnh, trả về (False, [0]).
+        """
+        if step < 0:
+            length = min(x, y) + 1
+        else:
+            length = min(self.width - x, self.height - y)
+        if length <= 0 or x < 0 or y < 0:
+            return False, [0]
+        steps = np.arange(length) * step
+        segment = self.array[y + steps, x + steps]
+        boundaries = [0]
+        boundaries.extend((np.flatnonzero(segment[1:] != segment[:-1]) + 1).tolist())
+        boundaries.append(length)
+        return bool(segment[0]), boundaries
@@ -3,9 +3,11 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
 from decoder import Decoder
 from enums import DecodeHintType, ResultMetadataType, BarcodeFormat
-from qr_patterns import Detector, DetectorResult, FinderPatternInfo
-from qrcode import Result, QRCodeDecoderMetaData, BitMatrix, BinaryBitmap
-from exceptions import NotFoundException
+from qr_patterns import Detector, FinderPatternFinder, DetectorResult, FinderPatternInfo, FinderPattern, AlignmentPattern, ResultPoint
+from qrcode import QRCodeDecoderMetaData, BitMatrix, BinaryBitmap
+from qrcode.Result import Result
+from common import LuminancePyramid
+from exceptions import NotFoundException, FormatException, ChecksumException
 
 
 class QRCodeReader:
@@ -15,8 +17,31 @@ class QRCodeReader:
 
     NO_POINTS = []
 
-    def __init__(self):
+    # Nửa chiều cao (tính theo module) của dải dòng được quét lại quanh mỗi tâm ứng viên ở tầng mịn hơn
+    PYRAMID_BAND_MODULES = 7
+
+    # Lề (tính theo module) thêm vào quanh các tâm finder pattern khi cắt vùng quan tâm:
+    # 3.5 module tới mép finder pattern, 4 module vùng yên tĩnh và phần dư cho sai số của tầng thô
+    ROI_MARGIN_MODULES = 9
+
+    def __init__(self, multi_scale: bool = False, max_pyramid_level: int = 2, roi: bool = False, supersample: int = 1):
+        """
+        Input:
+        - multi_scale: True để phát hiện theo kim tự tháp ảnh, bắt đầu từ tầng thô nhất và chỉ chuyển sang
+          tầng mịn hơn khi thất bại (xem decode_multi_scale).
+        - max_pyramid_level: tầng thô nhất được thử (tầng k nhỏ hơn ảnh gốc 2^k lần mỗi chiều).
+        - roi: True để định vị mã bằng một lượt độ phân giải thấp rồi chỉ nhị phân hóa vùng chứa mã
+          ở độ phân giải gốc (xem decode_roi).
+        - supersample: số điểm con k trên mỗi cạnh module; với k > 1 mỗi module được quyết định bằng bỏ phiếu
+          trên lưới con k x k thay vì một pixel tại tâm (xem DefaultGridSampler.vote_modules).
+        """
+        if supersample < 1:
+            raise ValueError("supersample phải lớn hơn hoặc bằng 1")
         self.decoder = Decoder()
+        self.multi_scale = multi_scale
+        self.max_pyramid_level = max_pyramid_level
+        self.roi = roi
+        self.supersample = supersample
 
     def get_decoder(self):
         """ 
@@ -32,23 +57,277 @@ class QRCodeReader:
         - image: đối tượng BinaryBitmap, chứa thông tin ảnh cần giải mã.
         - hints: một từ điển chứa các gợi ý giải mã (tùy chọn).
 
-        Hàm này sẽ phát hiện và giải mã QR code trong bức ảnh được truyền vào.
+        Hàm này sẽ phát hiện (xem detect) và giải mã QR code trong bức ảnh được truyền vào. Nếu mã được phát hiện
+        trong vùng quan tâm hoặc trên một tầng thô của kim tự tháp nhưng giải mã thất bại, hàm phát hiện lại
+        trên toàn ảnh ở độ phân giải gốc và giải mã thêm một lần.
 
         Output:
         - Trả về đối tượng Result chứa kết quả giải mã (nội dung, byte segments, points, thông tin bổ sung).
+        - Ném NotFoundException nếu không phát hiện được mã, FormatException / ChecksumException nếu không giải mã được.
         """
-        decoder_result = None
-        points = None
         if hints and DecodeHintType.PURE_BARCODE in hints:
             bits: BitMatrix = self.extract_pure_bits(image.get_black_matrix())
-            decoder_result = self.decoder.decode(bits, hints)
-            points = self.NO_POINTS
+            decoder_result = self.decoder.decode_bit_matrix(bits, hints)
+            return QRCodeReader.build_result(decoder_result, list(self.NO_POINTS))
+
+        detector_result = self.detect(image, hints)
+        try:
+            return self.decode_detector_result(detector_result, hints)
+        except (NotFoundException, FormatException, ChecksumException):
+            if not (self.roi or self.multi_scale):
+                raise
+        detector_result = QRCodeReader.try_detect(self.create_detector(image.get_black_matrix()), hints, None)
+        return self.decode_detector_result(detector_result, hints)
+
+    def decode_multiple(self, image: BinaryBitmap, hints=None):
+        """
+        Phát hiện và giải mã mọi QR code trong bức ảnh.
+
+        Input:
+        - image: đối tượng BinaryBitmap, chứa thông tin ảnh cần giải mã.
+        - hints: một từ điển chứa các gợi ý giải mã (tùy chọn).
+
+        Ảnh được nhị phân hóa và quét tìm finder pattern một lần (xem MultiDetector); mỗi bộ ba finder pattern
+        rời nhau được lấy mẫu và giải mã riêng, mã nào giải mã thất bại thì bị bỏ qua.
+
+        Output:
+        - Danh sách Result theo thứ tự độ méo tăng dần của bộ ba finder pattern; rỗng nếu không giải mã được mã nào.
+        """
+        # Import muộn: qr_patterns/__init__ -> Detector -> DetectorResult -> qrcode -> QRCodeReader tạo vòng import
+        from qr_patterns import MultiDetector
+        try:
+            # Bộ nhị phân hóa có thể ném NotFoundException (ví dụ ảnh đồng màu hoặc độ tương phản thấp)
+            detector_results = MultiDetector(image.get_black_matrix(), self.supersample).detect_multi(hints)
+        except NotFoundException:
+            return []
+        results = []
+        for detector_result in detector_results:
+            try:
+                results.append(self.decode_detector_result(detector_result, hints))
+            except (NotFoundException, FormatException, ChecksumException):
+                continue
+        return results
+
+    def detect(self, image: BinaryBitmap, hints=None):
+        """
+        Chỉ phát hiện QR code (không giải mã), theo chế độ đã cấu hình (ROI, multi_scale hoặc toàn ảnh).
+
+        Output:
+        - DetectorResult (lưới module đã lấy mẫu, các điểm ở tọa độ ảnh gốc, độ tin cậy của từng module),
+          hoặc None nếu không phát hiện được.
+        """
+        if self.roi:
+            return self.decode_roi(image, hints)
+        return self.detect_full_frame(image, hints)
+
+    def decode_detector_result(self, detector_result: DetectorResult, hints=None):
+        """
+        Giải mã một DetectorResult (ví dụ kết quả của detect hoặc decode2).
+
+        Output:
+        - Result; ném NotFoundException nếu detector_result là None.
+        """
+        if detector_result is None or detector_result.get_bits() is None:
+            raise NotFoundException.get_not_found_instance()
+        decoder_result = self.decoder.decode_bit_matrix(detector_result.get_bits(), hints,
+                                                        detector_result.get_confidence())
+        return QRCodeReader.build_result(decoder_result, list(detector_result.get_points()))
+
+    @staticmethod
+    def build_result(decoder_result, points):
+        """
+        Tạo Result từ DecoderResult: sửa thứ tự các điểm nếu mã bị lật gương và gắn các metadata.
+        """
+        other = decoder_result.get_other()
+        if isinstance(other, QRCodeDecoderMetaData):
+            other.apply_mirrored_correction(points)
+
+        result = Result(decoder_result.get_text(), decoder_result.get_raw_bytes(), points, BarcodeFormat.QR_CODE)
+        if decoder_result.get_byte_segments() is not None:
+            result.put_metadata(ResultMetadataType.BYTE_SEGMENTS, decoder_result.get_byte_segments())
+        if decoder_result.get_ec_level() is not None:
+            result.put_metadata(ResultMetadataType.ERROR_CORRECTION_LEVEL, decoder_result.get_ec_level())
+        if decoder_result.get_errors_corrected() is not None:
+            result.put_metadata(ResultMetadataType.ERRORS_CORRECTED, decoder_result.get_errors_corrected())
+        if decoder_result.get_erasures():
+            result.put_metadata(ResultMetadataType.ERASURES_CORRECTED, decoder_result.get_erasures())
+        if decoder_result.has_structured_append():
+            result.put_metadata(ResultMetadataType.STRUCTURED_APPEND_SEQUENCE,
+                                decoder_result.get_structured_append_sequence_number())
+            result.put_metadata(ResultMetadataType.STRUCTURED_APPEND_PARITY,
+                                decoder_result.get_structured_append_parity())
+        result.put_metadata(ResultMetadataType.SYMBOLOGY_IDENTIFIER, f"]Q{decoder_result.get_symbology_modifier()}")
+        return result
+
+    def detect_full_frame(self, image: BinaryBitmap, hints=None):
+        """
+        Phát hiện QR code trên toàn bộ ảnh, theo kim tự tháp nếu chế độ multi_scale được bật.
+        """
+        if self.multi_scale:
+            return self.decode_multi_scale(image, hints)
+        detector_result  = self.create_detector(image.get_black_matrix()).detect(hints)
+        return detector_result
+
+    def decode_roi(self, image: BinaryBitmap, hints=None):
+        """
+        Phát hiện QR code chỉ trong vùng quan tâm (ROI).
+
+        Input:
+        - image: đối tượng BinaryBitmap ở độ phân giải gốc.
+        - hints: một từ điển chứa các gợi ý giải mã (tùy chọn).
+
+        Một lượt tìm finder pattern trên các tầng thô của kim tự tháp ước lượng hình bao của mã. Vùng này (cộng thêm
+        ROI_MARGIN_MODULES module lề) được cắt bằng `BinaryBitmap.crop`, nên với nguồn độ chói hỗ trợ view
+        (NdarrayLuminanceSource) chỉ vùng cắt được nhị phân hóa ở độ phân giải gốc. Tọa độ kết quả được dịch
+        về ảnh gốc. Nếu không hỗ trợ cắt, các tầng thô không tìm thấy mã, hoặc phát hiện trong vùng cắt thất bại,
+        hàm quay về phát hiện trên toàn ảnh.
+
+        Output:
+        - DetectorResult, hoặc None nếu không phát hiện được.
+        """
+        if image.is_crop_supported():
+            region = self.estimate_roi(image, hints)
+            if region is not None:
+                left, top, width, height = region
+                cropped = image.crop(left, top, width, height)
+                detector_result = QRCodeReader.try_detect(self.create_detector(cropped.get_black_matrix()), hints, None)
+                if detector_result is not None:
+                    points = QRCodeReader.map_points(detector_result.get_points(), 1, left, top)
+                    return DetectorResult(detector_result.get_bits(), points, detector_result.get_confidence())
+        return self.detect_full_frame(image, hints)
+
+    def estimate_roi(self, image: BinaryBitmap, hints=None):
+        """
+        Ước lượng hình bao (left, top, width, height) của mã QR ở tọa độ ảnh gốc từ ba finder pattern.
+
+        Các tầng được thử từ tầng thô nhất xuống tầng 1, dừng ở tầng đầu tiên FinderPatternFinder.find tìm được
+        bộ ba: hình bao chỉ cần vị trí các finder pattern nên không cần lấy mẫu lưới như Detector.detect, và
+        tầng thô nhất thường quá nhỏ để tìm thấy mã nên không thể chỉ dựa vào nó.
+        Trả về None nếu ảnh quá nhỏ để có tầng thô hoặc không tầng thô nào tìm thấy mã.
+        """
+        binarizer = image.binarizer
+        pyramid = LuminancePyramid(binarizer.get_luminance_source(), self.max_pyramid_level)
+        for level in range(pyramid.get_level_count() - 1, 0, -1):
+            coarse = BinaryBitmap(binarizer.create_binarizer(pyramid.get_level(level)))
+            info = FinderPatternFinder(coarse.get_black_matrix()).find(hints)
+            if info is not None:
+                break
         else:
-            detector_result  = Detector(image.get_black_matrix()).detect(hints)
-            return detector_result
+            return None
+
+        scale = pyramid.get_scale(level)
+        points = QRCodeReader.map_points([info.get_bottom_left(), info.get_top_left(), info.get_top_right()], scale)
+        bottom_left, top_left, top_right = points[0], points[1], points[2]
+        xs = [p.get_x() for p in points]
+        ys = [p.get_y() for p in points]
+        # Góc dưới phải suy ra từ ba finder pattern
+        xs.append(top_right.get_x() - top_left.get_x() + bottom_left.get_x())
+        ys.append(top_right.get_y() - top_left.get_y() + bottom_left.get_y())
+        module_size = max(p.get_estimated_module_size() for p in (bottom_left, top_left, top_right))
+        margin = QRCodeReader.ROI_MARGIN_MODULES * module_size
+
+        left = max(0, int(min(xs) - margin))
+        top = max(0, int(min(ys) - margin))
+        right = min(image.get_width(), int(max(xs) + margin) + 1)
+        bottom = min(image.get_height(), int(max(ys) + margin) + 1)
+        if right <= left or bottom <= top:
+            return None
+        return left, top, right - left, bottom - top
+
+    def decode_multi_scale(self, image: BinaryBitmap, hints=None):
+        """
+        Phát hiện QR code theo kim tự tháp ảnh dựng lười từ LuminanceSource của `image`.
+
+        Input:
+        - image: đối tượng BinaryBitmap ở độ phân giải gốc.
+        - hints: một từ điển chứa các gợi ý giải mã (tùy chọn).
+
+        Hàm thử tầng thô nhất trước; nếu thất bại, các tâm finder pattern ứng viên của tầng đó được đưa lên
+        tầng mịn kế tiếp để chỉ quét các dải dòng quanh chúng. Nếu tầng gốc vẫn thất bại với vùng bị thu hẹp,
+        hàm quét lại toàn bộ tầng gốc, nên khả năng phát hiện không kém chế độ một tỉ lệ.
+        Các điểm trong kết quả luôn ở tọa độ ảnh gốc.
+
+        Output:
+        - DetectorResult, hoặc None nếu không phát hiện được.
+        """
+        binarizer = image.binarizer
+        pyramid = LuminancePyramid(binarizer.get_luminance_source(), self.max_pyramid_level)
+        rows = None
+        for level in range(pyramid.get_level_count() - 1, -1, -1):
+            if level == 0:
+                bitmap = image
+            else:
+                bitmap = BinaryBitmap(binarizer.create_binarizer(pyramid.get_level(level)))
+            matrix = bitmap.get_black_matrix()
+            detector = self.create_detector(matrix)
+            detector_result = QRCodeReader.try_detect(detector, hints, rows)
+            if detector_result is None and level == 0 and rows is not None:
+                detector = self.create_detector(matrix)
+                detector_result = QRCodeReader.try_detect(detector, hints, None)
+            if detector_result is not None:
+                scale = pyramid.get_scale(level)
+                points = QRCodeReader.map_points(detector_result.get_points(), scale)
+                return DetectorResult(detector_result.get_bits(), points, detector_result.get_confidence())
+            if level > 0:
+                rows = QRCodeReader.rows_around_centers(detector.possible_centers, 2, (matrix.get_height() * 2) + 1)
+        return None
+
+    def create_detector(self, matrix: BitMatrix):
+        """
+        Tạo Detector cho một ma trận nhị phân với cấu hình lấy mẫu của bộ đọc.
+        """
+        return Detector(matrix, self.supersample)
+
+    @staticmethod
+    def try_detect(detector: Detector, hints, rows):
+        """
+        Chạy detector và coi các lỗi không tìm thấy / sai định dạng là thất bại (None).
+        """
+        try:
+            return detector.detect(hints, rows)
+        except (NotFoundException, FormatException):
+            return None
+
+    @staticmethod
+    def rows_around_centers(centers, factor, height):
+        """
+        Chuyển các tâm ứng viên của một tầng thô sang tầng mịn hơn `factor` lần và trả về danh sách
+        (đã sắp xếp) các dòng nằm trong dải ±PYRAMID_BAND_MODULES module quanh mỗi tâm.
+        Trả về None nếu không có tâm nào (khi đó tầng mịn được quét toàn bộ).
+        """
+        if not centers:
+            return None
+        rows = set()
+        for center in centers:
+            y = center.get_y() * factor
+            band = QRCodeReader.PYRAMID_BAND_MODULES * center.get_estimated_module_size() * factor
+            top = max(0, int(y - band))
+            bottom = min(height, int(y + band) + 1)
+            rows.update(range(top, bottom))
+        return sorted(rows)
+
+    @staticmethod
+    def map_points(points, scale, dx=0, dy=0):
+        """
+        Đưa các điểm về ảnh gốc: tọa độ thành (x * scale + dx, y * scale + dy), kích thước module ước lượng
+        được nhân với `scale`.
+        """
+        if scale == 1 and dx == 0 and dy == 0:
+            return points
+        scaled = []
+        for point in points:
+            x = point.get_x() * scale + dx
+            y = point.get_y() * scale + dy
+            if isinstance(point, FinderPattern):
+                scaled.append(FinderPattern(x, y, point.get_estimated_module_size() * scale, point.get_count()))
+            elif isinstance(point, AlignmentPattern):
+                scaled.append(AlignmentPattern(x, y, point.estimated_module_size * scale))
+            else:
+                scaled.append(ResultPoint(x, y))
+        return scaled
         
     def decode2(self, image:BinaryBitmap, finder_pattern_info):
-        detector_result = Detector(image.get_black_matrix()).process_finder_pattern_info(finder_pattern_info)
+        detector_result = self.create_detector(image.get_black_matrix()).process_finder_pattern_info(finder_pattern_info)
         return detector_result
     
     def reset(self):
@@ -1,8 +1,10 @@
 import sys 
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+import itertools
+import threading
+import numpy as np
 from exceptions import FormatException
-from .FormatInformation import FormatInformation
 from .BitMatrix import BitMatrix
 
 class Version:
@@ -58,6 +60,9 @@ class Version:
         0x2542E, 0x26A64, 0x27541, 0x28C69
     ]
 
+    # Khóa bảo vệ việc tính các bảng trong cache (RLock vì một bảng có thể dựng từ bảng khác)
+    CACHE_LOCK = threading.RLock()
+
     def __init__(self, version_number, alignment_pattern_centers, *ec_blocks):
         """
         Input:
@@ -69,6 +74,8 @@ class Version:
         - ec_codewords : int
         - ecb_array : ECB []
         - total_codewords : int
+        - cache : dict, các bảng dẫn xuất (function pattern, tọa độ module dữ liệu, bố cục khối)
+          được tính lười một lần rồi dùng chung (chỉ đọc) giữa các luồng, xem get_cached
         """
         
         self.version_number = version_number
@@ -80,6 +87,7 @@ class Version:
         for ec_block in ecb_array:
             total += ec_block.get_count() * (ec_block.get_data_codewords() + ec_codewords)
         self.total_codewords = total
+        self.cache = {}
 
     def get_version_number(self):
         return self.version_number
@@ -95,39 +103,117 @@ class Version:
         return 17 + 4 * self.version_number
 
     def get_ec_blocks_for_level(self, ec_level):
-        return self.ec_blocks[ec_level.value]  # Assuming ECLevel is an enum
+        # Các ECBlocks được khai báo theo thứ tự L, M, Q, H (khác với giá trị bit của ErrorCorrectionLevel)
+        return self.ec_blocks[ec_level.ordinal()]
 
     
 
+    def get_cached(self, key, build):
+        """
+        Output : giá trị đã lưu của `key`, hoặc kết quả của build() (được lưu lại) ở lần gọi đầu tiên
+
+        Khóa chung bảo đảm mỗi bảng chỉ được tính một lần kể cả khi nhiều luồng giải mã cùng lúc;
+        các lần đọc sau không cần khóa. Giá trị được dùng chung nên người gọi không được sửa.
+        """
+        value = self.cache.get(key)
+        if value is None:
+            with Version.CACHE_LOCK:
+                value = self.cache.get(key)
+                if value is None:
+                    value = build()
+                    self.cache[key] = value
+        return value
+
+    def get_function_pattern_array(self):
+        """
+        Output : ndarray bool (dimension, dimension) chỉ đọc, phần tử [y, x] là True nếu (x, y) là module chức năng
+        """
+        return self.get_cached("function_pattern_array", self.build_function_pattern_array)
+
     def build_function_pattern(self):
         """
-        Output : bit_matrix: BitMatrix
+        Output : bit_matrix: BitMatrix - một bản sao mới, người gọi được phép sửa
+        """
+        return BitMatrix.from_bool_array(self.get_function_pattern_array())
+
+    def build_function_pattern_array(self):
+        """
+        Output : ndarray bool (dimension, dimension)
+
+        Mỗi vùng chức năng (finder pattern kèm thông tin định dạng, alignment pattern, timing pattern,
+        thông tin phiên bản) được đánh dấu bằng một phép gán lát cắt.
         """
         dimension = self.get_dimension_for_version()
-        bit_matrix = BitMatrix(dimension)
-        bit_matrix.set_region(0, 0, 9, 9)
-        bit_matrix.set_region(dimension - 8, 0, 8, 9)
-        bit_matrix.set_region(0, dimension - 8, 9, 8)
+        pattern = np.zeros((dimension, dimension), dtype=bool)
+        # Finder pattern, separator và thông tin định dạng ở ba góc
+        pattern[0:9, 0:9] = True
+        pattern[0:9, dimension - 8:] = True
+        pattern[dimension - 8:, 0:9] = True
         max = len(self.alignment_pattern_centers)
         for x in range(0, max):
-            i = self.alignment_pattern_centers[x] - 2
+            top = self.alignment_pattern_centers[x] - 2
             for y in range(0, max):
                 if ((x != 0 or (y != 0 and y != max - 1)) and (x != max - 1 or y != 0)):
-                    bit_matrix.set_region(self.alignment_pattern_centers[y]- 2, i, 5, 5)
+                    left = self.alignment_pattern_centers[y] - 2
+                    pattern[top:top + 5, left:left + 5] = True
                 # else no o alignment patterns near the three finder patterns
-        
+
         # Vertical timing pattern
-        bit_matrix.set_region(6, 9, 1, dimension - 17)
+        pattern[9:dimension - 8, 6] = True
         # Horizontal timing pattern
-        bit_matrix.set_region(9, 6, dimension - 17, 1)
-        
+        pattern[6, 9:dimension - 8] = True
+
         if self.version_number > 6:
             # Version info, top right
-            bit_matrix.set_region(dimension - 11, 0, 3, 6)
+            pattern[0:6, dimension - 11:dimension - 8] = True
             # Version info, bottom left
-            bit_matrix.set_region(0, dimension - 11, 6, 3)
-        
-        return bit_matrix
+            pattern[dimension - 11:dimension - 8, 0:6] = True
+
+        pattern.flags.writeable = False
+        return pattern
+
+    def get_data_module_coordinates(self):
+        """
+        Output : (rows, cols) : (ndarray, ndarray) - tọa độ các module dữ liệu theo đúng thứ tự đọc codeword
+
+        Bảng được tính một lần cho mỗi phiên bản rồi dùng lại cho mọi lần giải mã:
+        8 phần tử liên tiếp là 8 bit (từ bit cao) của một codeword, các bit dư ở cuối ký hiệu bị bỏ đi.
+        """
+        return self.get_cached("data_module_coordinates", self.build_data_module_coordinates)
+
+    def build_data_module_coordinates(self):
+        """
+        Output : (rows, cols) : (ndarray, ndarray)
+
+        Duyệt zig-zag như BitMatrixParser: các cặp cột từ phải sang trái (bỏ qua cột timing 6),
+        xen kẽ đọc lên / đọc xuống, trong mỗi hàng đọc cột phải trước, bỏ qua các module chức năng.
+        """
+        dimension = self.get_dimension_for_version()
+        function_pattern = self.get_function_pattern_array()
+
+        pair_columns = []
+        j = dimension - 1
+        while j > 0:
+            if j == 6:
+                j -= 1
+            pair_columns.append(j)
+            j -= 2
+        pair_columns = np.array(pair_columns)
+
+        upward = (np.arange(len(pair_columns)) & 1) == 0
+        indices = np.arange(dimension)
+        pair_rows = np.where(upward[:, None], indices[::-1][None, :], indices[None, :])
+        shape = (len(pair_columns), dimension, 2)
+        rows = np.broadcast_to(pair_rows[:, :, None], shape).ravel()
+        cols = np.broadcast_to(pair_columns[:, None, None] - np.arange(2)[None, None, :], shape).ravel()
+
+        is_data = ~function_pattern[rows, cols]
+        bit_count = self.total_codewords * 8
+        rows = rows[is_data][:bit_count]
+        cols = cols[is_data][:bit_count]
+        rows.flags.writeable = False
+        cols.flags.writeable = False
+        return rows, cols
     
 def build_versions():
     """
@@ -377,15 +463,36 @@ def build_versions():
 
 
 class VersionManager:
-    VERSIONS = build_versions()
+    # Bảng 40 phiên bản chỉ được dựng ở lần dùng đầu tiên (xem get_versions), không phải khi import
+    VERSIONS = None
+    VERSIONS_LOCK = threading.Lock()
+
+    # Số bit sai tối đa được sửa khi giải mã thông tin phiên bản
+    MAX_CORRECTABLE_VERSION_BITS = 3
+    # Bảng tra thông tin phiên bản (xem build_version_info_lookup), dựng ở lần dùng đầu tiên
+    VERSION_INFO_LOOKUP = None
+
     def __init__(self):
         pass 
 
+    @staticmethod
+    def get_versions():
+        """
+        Output : Version [] - bảng phiên bản dùng chung, được dựng một lần kể cả khi nhiều luồng gọi cùng lúc
+        """
+        versions = VersionManager.VERSIONS
+        if versions is None:
+            with VersionManager.VERSIONS_LOCK:
+                if VersionManager.VERSIONS is None:
+                    VersionManager.VERSIONS = build_versions()
+                versions = VersionManager.VERSIONS
+        return versions
+
     @staticmethod
     def get_version_for_number(version_number):
         if version_number < 1 or version_number > 40:
             raise ValueError("Invalid version number")
-        return VersionManager.VERSIONS[version_number - 1]
+        return VersionManager.get_versions()[version_number - 1]
     
     @staticmethod
     def get_provisional_version_for_dimension(dimension): 
@@ -399,20 +506,52 @@ class VersionManager:
             return None
         
     @staticmethod
-    def decode_version_information(version_bits):
-        best_difference = float('inf')
-        best_version = 0
-        version_amount = len(Version.VERSION_DECODE_INFOR)
-        for i in range(0, version_amount):
-            target_version = Version.VERSION_DECODE_INFO[i]
-            if target_version == version_bits:
-                return VersionManager.getVersionForNumber(i+7)
-            bits_difference = FormatInformation.num_bits_differing(version_bits, target_version)
-            if bits_difference < best_difference:
-                best_version = i + 7
-                best_difference = bits_difference
-            
-        if best_difference <= 3:
-            return VersionManager.getVersionForNumber(best_version)
-        return None
+    def get_version_info_lookup():
+        """
+        Output : dict - bảng tra thông tin phiên bản, dựng lười một lần (xem build_version_info_lookup)
+        """
+        lookup = VersionManager.VERSION_INFO_LOOKUP
+        if lookup is None:
+            with VersionManager.VERSIONS_LOCK:
+                if VersionManager.VERSION_INFO_LOOKUP is None:
+                    VersionManager.VERSION_INFO_LOOKUP = VersionManager.build_version_info_lookup()
+                lookup = VersionManager.VERSION_INFO_LOOKUP
+        return lookup
+
+    @staticmethod
+    def build_version_info_lookup():
+        """
+        Output : dict - giá trị 18 bit -> (số phiên bản, số bit khác nhau với mã của phiên bản đó)
 
+        Bảng chứa mọi giá trị cách một mã trong Version.VERSION_DECODE_INFO không quá
+        MAX_CORRECTABLE_VERSION_BITS bit. Khoảng cách Hamming giữa hai mã bất kỳ là 8, nên các vùng này
+        không chồng lên nhau và kết quả tra bảng trùng với kết quả tìm mã gần nhất.
+        """
+        error_patterns = [(0, 0)]
+        for weight in range(1, VersionManager.MAX_CORRECTABLE_VERSION_BITS + 1):
+            for positions in itertools.combinations(range(18), weight):
+                error_patterns.append((sum(1 << position for position in positions), weight))
+
+        lookup = {}
+        for i, target_version in enumerate(Version.VERSION_DECODE_INFO):
+            for pattern, weight in error_patterns:
+                lookup[target_version ^ pattern] = (i + 7, weight)
+        return lookup
+
+    @staticmethod
+    def lookup_version_information(version_bits):
+        """
+        Output : (int, int) - (số phiên bản gần nhất, số bit khác nhau), hoặc None nếu không mã nào
+        cách version_bits trong phạm vi MAX_CORRECTABLE_VERSION_BITS bit
+        """
+        return VersionManager.get_version_info_lookup().get(version_bits)
+
+    @staticmethod
+    def decode_version_information(version_bits):
+        """
+        Output : Version khớp với 18 bit thông tin phiên bản đọc được (sai tối đa 3 bit), hoặc None
+        """
+        match = VersionManager.lookup_version_information(version_bits)
+        if match is None:
+            return None
+        return VersionManager.get_version_for_number(match[0])
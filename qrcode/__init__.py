@@ -2,6 +2,7 @@ from .BitArray import BitArray
 from .BinaryBitmap import BinaryBitmap
 from .BitMatrix import BitMatrix
 from .BitMatrixParser import BitMatrixParser
+from .BitMatrixRunIndex import BitMatrixRunIndex
 from .FormatInformation import FormatInformation
 from .QRCodeDecoderMetaData import QRCodeDecoderMetaData
 from .QRCodeReader import QRCodeReader